@@ -2,7 +2,7 @@ import os
 import re
 import threading
 import time
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import parse_qs, quote, urlencode
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
@@ -255,6 +255,7 @@ WS_STATE = {
     "last_event_id": "",
     "last_event_created_at": "",
     "last_event_payload": {},
+    "last_stream_id": "",
 }
 WS_THREAD_STARTED = False
 
@@ -306,6 +307,7 @@ def _on_ws_message(raw_msg: str) -> None:
     event_id = ""
     event_created_at = ""
     event_payload: dict = {}
+    stream_id = ""
 
     try:
         import json
@@ -316,6 +318,7 @@ def _on_ws_message(raw_msg: str) -> None:
             event_agent = str(parsed.get("agent") or "")
             event_id = str(parsed.get("id") or "")
             event_created_at = str(parsed.get("created_at") or "")
+            stream_id = str(parsed.get("stream_id") or "")
             payload = parsed.get("payload")
             if isinstance(payload, dict):
                 event_payload = payload
@@ -329,14 +332,20 @@ def _on_ws_message(raw_msg: str) -> None:
         last_event_created_at=event_created_at,
         last_event_payload=event_payload,
     )
+    if stream_id:
+        _update_ws_state(last_stream_id=stream_id)
     _bump_ws_revision()
 
 
 def _ws_subscriber_loop():
-    ws_url = _build_ws_url()
     headers = _ws_headers()
 
     while True:
+        ws_url = _build_ws_url()
+        with WS_LOCK:
+            resume_from = str(WS_STATE.get("last_stream_id") or "")
+        if resume_from:
+            ws_url += f"?resume_from={quote(resume_from)}"
         try:
             ws_app = websocket.WebSocketApp(
                 ws_url,
@@ -484,6 +493,135 @@ def api_get_json(path: str, *, timeout: float = 3.0):
     return resp.json()
 
 
+_CONDITIONAL_GET_CACHE: dict[str, tuple[str, object]] = {}
+_CONDITIONAL_GET_LOCK = threading.Lock()
+
+
+def api_get_json_conditional(path: str, etag: str = "", *, timeout: float = 3.0):
+    url = MISSION_CONTROL_API_URL.rstrip("/") + path
+    headers = _api_headers()
+    if etag:
+        headers["If-None-Match"] = etag
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and etag:
+        return None, etag
+    resp.raise_for_status()
+    return resp.json(), resp.headers.get("ETag") or ""
+
+
+def api_get_json_cached(path: str, *, timeout: float = 3.0):
+    with _CONDITIONAL_GET_LOCK:
+        cached = _CONDITIONAL_GET_CACHE.get(path)
+    payload, etag = api_get_json_conditional(path, cached[0] if cached else "", timeout=timeout)
+    if payload is None:
+        return cached[1]
+    if etag:
+        with _CONDITIONAL_GET_LOCK:
+            _CONDITIONAL_GET_CACHE[path] = (etag, payload)
+    return payload
+
+
+FEED_DELTA_LIMIT = 80
+BOARD_DELTA_COLUMN_LIMIT = 100
+BOARD_FULL_RELOAD_SECONDS = 300.0
+_EPOCH = datetime.fromtimestamp(0, tz=timezone.utc)
+_FEED_DELTA_STATE: dict = {"events": [], "since_ts": "", "since_id": "", "etag": ""}
+_BOARD_DELTA_STATE: dict = {"board": None, "since_ts": "", "since_id": "", "etag": "", "loaded_at": 0.0}
+_DELTA_STATE_LOCK = threading.Lock()
+
+
+def _row_sort_key(field: str):
+    def key(row: dict):
+        return _parse_iso(row.get(field)) or _EPOCH, str(row.get("id") or "")
+
+    return key
+
+
+def _delta_params(state: dict, **extra) -> str:
+    params = dict(extra)
+    if state.get("since_ts"):
+        params["since_ts"] = state["since_ts"]
+    if state.get("since_id"):
+        params["since_id"] = state["since_id"]
+    return urlencode(params)
+
+
+def _fetch_feed_json(limit: int = FEED_DELTA_LIMIT) -> list[dict]:
+    with _DELTA_STATE_LOCK:
+        state = dict(_FEED_DELTA_STATE)
+    payload, etag = api_get_json_conditional(
+        f"/v1/feed-lite/delta?{_delta_params(state, limit=limit)}",
+        state["etag"],
+    )
+    if payload is None:
+        return list(state["events"])
+
+    merged = {} if payload.get("reset") else {str(row.get("id")): row for row in state["events"]}
+    for row in payload.get("events") or []:
+        merged[str(row.get("id"))] = row
+    events = sorted(merged.values(), key=_row_sort_key("created_at"), reverse=True)[:limit]
+    with _DELTA_STATE_LOCK:
+        _FEED_DELTA_STATE.update(
+            events=events,
+            since_ts=payload.get("high_water_ts") or "",
+            since_id=payload.get("high_water_id") or "",
+            etag=etag,
+        )
+    return list(events)
+
+
+def _load_board_json() -> dict:
+    board = api_get_json("/v1/boards/default")
+    cards = [card for col in board.get("columns") or [] for card in col.get("cards") or []]
+    newest = max(cards, key=_row_sort_key("updated_at")) if cards else {}
+    with _DELTA_STATE_LOCK:
+        _BOARD_DELTA_STATE.update(
+            board=board,
+            since_ts=newest.get("updated_at") or _EPOCH.isoformat(),
+            since_id=newest.get("id") or "",
+            etag="",
+            loaded_at=time.time(),
+        )
+    return board
+
+
+def _fetch_board_json() -> dict:
+    with _DELTA_STATE_LOCK:
+        state = dict(_BOARD_DELTA_STATE)
+    board = state["board"]
+    if board is None or time.time() - state["loaded_at"] >= BOARD_FULL_RELOAD_SECONDS:
+        return _load_board_json()
+
+    payload, etag = api_get_json_conditional(
+        f"/v1/boards/default/delta?{_delta_params(state, limit=BOARD_DELTA_COLUMN_LIMIT)}",
+        state["etag"],
+    )
+    if payload is None:
+        return board
+    if payload.get("reset"):
+        return _load_board_json()
+
+    changed = {str(card.get("id")): card for card in payload.get("cards") or []}
+    totals = payload.get("totals") or {}
+    columns = []
+    for col in board.get("columns") or []:
+        title = col.get("title")
+        cards = [card for card in col.get("cards") or [] if str(card.get("id")) not in changed]
+        cards.extend(card for card in changed.values() if card.get("status") == title)
+        cards = sorted(cards, key=_row_sort_key("updated_at"), reverse=True)[:BOARD_DELTA_COLUMN_LIMIT]
+        count = int(totals[title]) if title in totals else int(col.get("count") or 0)
+        columns.append({**col, "count": count, "cards": cards})
+    board = {**board, "columns": columns}
+    with _DELTA_STATE_LOCK:
+        _BOARD_DELTA_STATE.update(
+            board=board,
+            since_ts=payload.get("high_water_ts") or state["since_ts"],
+            since_id=payload.get("high_water_id") or state["since_id"],
+            etag=etag,
+        )
+    return board
+
+
 def api_patch_json(path: str, body: dict, *, timeout: float = 5.0):
     url = MISSION_CONTROL_API_URL.rstrip("/") + path
     resp = requests.patch(url, headers=_api_headers(), json=body, timeout=timeout)
@@ -670,6 +808,23 @@ def _settings_summary_hint(total_tokens_7d: int, total_cost_7d: float, missing_c
     return "Cost data is available for the current 7d assessment window."
 
 
+def _usage_trend_sparkline(points: list[dict], days: int = 7) -> str:
+    today = datetime.now(timezone.utc).date()
+    totals = [0] * days
+    for point in points:
+        bucket = _parse_iso(point.get("bucket_start"))
+        if not bucket:
+            continue
+        offset = (today - bucket.astimezone(timezone.utc).date()).days
+        if 0 <= offset < days:
+            totals[days - 1 - offset] += int(point.get("total_tokens") or 0)
+    peak = max(totals)
+    if peak <= 0:
+        return ""
+    levels = "▁▂▃▄▅▆▇█"
+    return "".join(levels[min(int(value / peak * (len(levels) - 1) + 0.5), len(levels) - 1)] for value in totals)
+
+
 def _build_agents(
     board: dict,
     feed: list[dict],
@@ -2099,6 +2254,15 @@ def render_settings_modal(_, settings_ui):
 
     by_slug = {str(item.get("slug")): item for item in _get_agent_catalog() if item.get("slug")}
 
+    trend_by_agent: dict[str, list[dict]] = {}
+    try:
+        timeseries = api_get_json("/v1/usage/agents/timeseries?resolution=day&by_model=false", timeout=2.0)
+        for series in (timeseries or {}).get("series", []) if isinstance(timeseries, dict) else []:
+            if isinstance(series, dict) and series.get("agent"):
+                trend_by_agent[str(series.get("agent"))] = [p for p in series.get("points", []) if isinstance(p, dict)]
+    except Exception:
+        trend_by_agent = {}
+
     items = []
     for row in rows_sorted:
         slug = str(row.get("agent") or "-")
@@ -2117,6 +2281,9 @@ def render_settings_modal(_, settings_ui):
         agent_info = by_slug.get(slug) or {}
         enabled_text = "enabled" if bool(agent_info.get("enabled", True)) else "disabled"
 
+        trend = _usage_trend_sparkline(trend_by_agent.get(slug, []))
+        trend_text = f" · 7d trend: {trend}" if trend else ""
+
         cost_hint = ""
         if cost_7d <= 0 and (tokens_24h > 0 or tokens_7d > 0):
             cost_hint = " (cost likely not configured)"
@@ -2136,7 +2303,7 @@ def render_settings_modal(_, settings_ui):
                         ],
                     ),
                     html.Div(
-                        f"24h: {_format_token_compact(tokens_24h)} tokens · 7d: {_format_token_compact(tokens_7d)} tokens · 7d cost: ${cost_7d:.4f}{cost_hint}",
+                        f"24h: {_format_token_compact(tokens_24h)} tokens · 7d: {_format_token_compact(tokens_7d)} tokens · 7d cost: ${cost_7d:.4f}{cost_hint}{trend_text}",
                         className="settings-item-body",
                     ),
                     html.Div(f"关闭建议：{recommendation}", className="settings-item-hint"),
@@ -2471,10 +2638,10 @@ def render_skills_modal(skills_ui, global_search, agent_search, selected_detail_
         )
 
     try:
-        global_skills = api_get_json("/v1/skills/global")
-        agent_details = api_get_json("/v1/skills/agents")
-        inventory = api_get_json("/v1/skills/inventory")
-        report = api_get_json("/v1/skills/report")
+        global_skills = api_get_json_cached("/v1/skills/global")
+        agent_details = api_get_json_cached("/v1/skills/agents")
+        inventory = api_get_json_cached("/v1/skills/inventory")
+        report = api_get_json_cached("/v1/skills/report")
     except Exception as e:
         msg = f"Unable to load skills data: {e}"
         return (
@@ -2823,8 +2990,8 @@ def refresh_data(n_intervals, state):
     feed_filter = (state.get("feed_filter") or "all").lower()
 
     try:
-        board_json = api_get_json("/v1/boards/default")
-        feed_json = api_get_json("/v1/feed-lite?limit=80")
+        board_json = _fetch_board_json()
+        feed_json = _fetch_feed_json()
         agent_catalog = _get_agent_catalog(force_refresh=True)
         usage_by_agent = {}
         try:
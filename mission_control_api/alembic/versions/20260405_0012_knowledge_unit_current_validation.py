@@ -0,0 +1,72 @@
+"""add knowledge unit current validation projection
+
+Revision ID: 20260405_0012
+Revises: 20260404_0011
+Create Date: 2026-04-05
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260405_0012"
+down_revision: str | None = "20260404_0011"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_unit_current_validation",
+        sa.Column("unit_id", sa.Uuid(), nullable=False),
+        sa.Column("validation_id", sa.Uuid(), nullable=False),
+        sa.Column("validator", sa.Text(), nullable=False),
+        sa.Column("validation_status", sa.Text(), nullable=False),
+        sa.Column("validated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column("lifecycle_stage", sa.Text(), server_default="active", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["unit_id"], ["knowledge_units.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["validation_id"], ["knowledge_validations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("unit_id"),
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_knowledge_unit_current_validation_status ON knowledge_unit_current_validation(validation_status, unit_id)"
+    )
+    op.execute(
+        """
+        INSERT INTO knowledge_unit_current_validation (
+          unit_id,
+          validation_id,
+          validator,
+          validation_status,
+          validated_at,
+          expires_at,
+          confidence,
+          lifecycle_stage,
+          updated_at
+        )
+        SELECT DISTINCT ON (kv.unit_id)
+          kv.unit_id,
+          kv.id,
+          kv.validator,
+          kv.validation_status,
+          kv.validated_at,
+          kv.expires_at,
+          kv.confidence,
+          ku.lifecycle_stage,
+          now()
+        FROM knowledge_validations kv
+        JOIN knowledge_units ku ON ku.id = kv.unit_id
+        ORDER BY kv.unit_id, kv.validated_at DESC
+        ON CONFLICT (unit_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_knowledge_unit_current_validation_status", table_name="knowledge_unit_current_validation")
+    op.drop_table("knowledge_unit_current_validation")
@@ -0,0 +1,49 @@
+"""add full-text search column for knowledge units
+
+Revision ID: 20260405_0013
+Revises: 20260405_0012
+Create Date: 2026-04-05
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+
+revision: str = "20260405_0013"
+down_revision: str | None = "20260405_0012"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION knowledge_tags_to_text(tags text[])
+        RETURNS text
+        LANGUAGE sql
+        IMMUTABLE
+        PARALLEL SAFE
+        AS $$ SELECT coalesce(array_to_string(tags, ' '), '') $$
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE knowledge_units
+        ADD COLUMN IF NOT EXISTS search_tsv tsvector
+        GENERATED ALWAYS AS (
+          setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+          setweight(to_tsvector('simple', knowledge_tags_to_text(tags)), 'A') ||
+          setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_knowledge_units_search_tsv_gin ON knowledge_units USING gin (search_tsv)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_knowledge_units_search_tsv_gin", table_name="knowledge_units")
+    op.execute("ALTER TABLE knowledge_units DROP COLUMN IF EXISTS search_tsv")
+    op.execute("DROP FUNCTION IF EXISTS knowledge_tags_to_text(text[])")
@@ -0,0 +1,49 @@
+"""add knowledge ingestion jobs
+
+Revision ID: 20260406_0014
+Revises: 20260405_0013
+Create Date: 2026-04-06
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260406_0014"
+down_revision: str | None = "20260405_0013"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_ingestion_jobs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("job_type", sa.Text(), server_default="source_chunk", nullable=False),
+        sa.Column("source_id", sa.Uuid(), nullable=False),
+        sa.Column("status", sa.Text(), server_default="queued", nullable=False),
+        sa.Column("request", sa.JSON(), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column("stages", sa.JSON(), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("worker_id", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["source_id"], ["knowledge_sources.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_knowledge_ingestion_jobs_source_id", "knowledge_ingestion_jobs", ["source_id"], unique=False)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_knowledge_ingestion_jobs_status_created ON knowledge_ingestion_jobs(status, created_at)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_knowledge_ingestion_jobs_status_created", table_name="knowledge_ingestion_jobs")
+    op.drop_index("ix_knowledge_ingestion_jobs_source_id", table_name="knowledge_ingestion_jobs")
+    op.drop_table("knowledge_ingestion_jobs")
@@ -0,0 +1,34 @@
+"""add knowledge source file index
+
+Revision ID: 20260407_0015
+Revises: 20260406_0014
+Create Date: 2026-04-07
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260407_0015"
+down_revision: str | None = "20260406_0014"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_source_file_index",
+        sa.Column("storage_path", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("mtime_ns", sa.BigInteger(), nullable=False),
+        sa.Column("inode", sa.BigInteger(), nullable=False),
+        sa.Column("checksum_sha256", sa.Text(), nullable=False),
+        sa.Column("indexed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("storage_path"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_source_file_index")
@@ -0,0 +1,70 @@
+"""add agent usage offset index and per-model hourly buckets
+
+Revision ID: 20260408_0016
+Revises: 20260407_0015
+Create Date: 2026-04-08
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260408_0016"
+down_revision: str | None = "20260407_0015"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agent_usage_file_offsets",
+        sa.Column("agent", sa.Text(), nullable=False),
+        sa.Column("device", sa.BigInteger(), nullable=False),
+        sa.Column("inode", sa.BigInteger(), nullable=False),
+        sa.Column("file_path", sa.Text(), nullable=False),
+        sa.Column("source_type", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("mtime_ns", sa.BigInteger(), nullable=False),
+        sa.Column("offset_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("head_length", sa.Integer(), nullable=False),
+        sa.Column("head_sha256", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("agent", "device", "inode"),
+    )
+    op.create_table(
+        "agent_usage_hourly",
+        sa.Column("agent", sa.Text(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("model", sa.Text(), server_default="", nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("output_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("cache_read_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("cache_write_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("total_cost", sa.Float(), server_default="0", nullable=False),
+        sa.Column("missing_cost_entries", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("events", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("agent", "bucket_start", "model"),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_agent_usage_hourly_bucket_cover
+        ON agent_usage_hourly(bucket_start, agent, model)
+        INCLUDE (
+          input_tokens, output_tokens, cache_read_tokens, cache_write_tokens,
+          total_tokens, total_cost, missing_cost_entries, events
+        )
+        """
+    )
+    op.execute(
+        "ALTER TABLE agent_usage_hourly SET (autovacuum_vacuum_scale_factor = 0.0, autovacuum_vacuum_threshold = 500)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_agent_usage_hourly_bucket_cover", table_name="agent_usage_hourly")
+    op.drop_table("agent_usage_hourly")
+    op.drop_table("agent_usage_file_offsets")
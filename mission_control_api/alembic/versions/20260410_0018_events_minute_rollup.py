@@ -0,0 +1,82 @@
+"""add per-minute events rollup and agent heartbeat table
+
+Revision ID: 20260410_0018
+Revises: 20260408_0016
+Create Date: 2026-04-10
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260410_0018"
+down_revision: str | None = "20260408_0016"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "events_minute_rollup",
+        sa.Column("bucket_minute", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_type", sa.Text(), nullable=False),
+        sa.Column("agent", sa.Text(), server_default="", nullable=False),
+        sa.Column("status_class", sa.Text(), server_default="", nullable=False),
+        sa.Column("is_error", sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column("events", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_minute", "event_type", "agent", "status_class", "is_error"),
+    )
+    op.create_table(
+        "agent_heartbeats",
+        sa.Column("agent", sa.Text(), nullable=False),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("agent"),
+    )
+    op.execute(
+        """
+        INSERT INTO events_minute_rollup (bucket_minute, event_type, agent, status_class, is_error, events, updated_at)
+        SELECT
+          date_trunc('minute', created_at),
+          type,
+          coalesce(agent, ''),
+          coalesce(substr(status_code, 1, 1) || 'xx', ''),
+          (
+            (type = 'event.validation' AND accepted = 'false')
+            OR type LIKE '%.error'
+            OR coalesce(status_code::int >= 400, false)
+            OR coalesce(error_type, '') <> ''
+          ),
+          count(*),
+          max(created_at)
+        FROM (
+          SELECT
+            created_at,
+            type,
+            agent,
+            CASE WHEN payload::jsonb ->> 'status_code' ~ '^[1-5][0-9][0-9]$' THEN payload::jsonb ->> 'status_code' END AS status_code,
+            payload::jsonb ->> 'accepted' AS accepted,
+            payload::jsonb ->> 'error_type' AS error_type
+          FROM events
+          WHERE created_at >= now() - interval '1 day'
+        ) AS recent
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO agent_heartbeats (agent, last_seen_at, updated_at)
+        SELECT agent, max(created_at), now()
+        FROM events
+        WHERE type = 'agent.heartbeat' AND agent IS NOT NULL
+        GROUP BY agent
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_heartbeats")
+    op.drop_table("events_minute_rollup")
@@ -0,0 +1,92 @@
+"""add daily knowledge resolve counters
+
+Revision ID: 20260411_0019
+Revises: 20260410_0018
+Create Date: 2026-04-11
+"""
+
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260411_0019"
+down_revision: str | None = "20260410_0018"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_resolve_daily_counters",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("risk_level", sa.Text(), nullable=False),
+        sa.Column("agent_slug", sa.Text(), server_default="", nullable=False),
+        sa.Column("reason", sa.Text(), server_default="", nullable=False),
+        sa.Column("resolve_requests", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("requests_with_hits", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("requests_with_rejections", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("selected_units", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("rejected_units", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("rejections", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("day", "risk_level", "agent_slug", "reason"),
+    )
+    op.execute(
+        """
+        INSERT INTO knowledge_resolve_daily_counters (
+          day, risk_level, agent_slug, reason,
+          resolve_requests, requests_with_hits, requests_with_rejections, selected_units, rejected_units, rejections, updated_at
+        )
+        SELECT
+          (created_at AT TIME ZONE 'UTC')::date,
+          coalesce(nullif(lower(trim(requested_risk_level)), ''), 'normal'),
+          coalesce(agent_slug, ''),
+          '',
+          count(*),
+          count(*) FILTER (WHERE selected_count > 0),
+          count(*) FILTER (WHERE rejected_count > 0),
+          coalesce(sum(selected_count), 0),
+          coalesce(sum(rejected_count), 0),
+          0,
+          max(created_at)
+        FROM knowledge_resolve_audits
+        WHERE created_at >= now() - interval '91 days'
+        GROUP BY 1, 2, 3
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO knowledge_resolve_daily_counters (
+          day, risk_level, agent_slug, reason,
+          resolve_requests, requests_with_hits, requests_with_rejections, selected_units, rejected_units, rejections, updated_at
+        )
+        SELECT
+          (audits.created_at AT TIME ZONE 'UTC')::date,
+          coalesce(nullif(lower(trim(audits.requested_risk_level)), ''), 'normal'),
+          coalesce(audits.agent_slug, ''),
+          coalesce(nullif(trim(item ->> 'reason'), ''), 'unknown'),
+          0,
+          0,
+          0,
+          0,
+          0,
+          count(*),
+          max(audits.created_at)
+        FROM knowledge_resolve_audits AS audits
+        CROSS JOIN LATERAL jsonb_array_elements(
+          CASE
+            WHEN jsonb_typeof(audits.payload::jsonb -> 'rejected') = 'array' THEN audits.payload::jsonb -> 'rejected'
+            ELSE '[]'::jsonb
+          END
+        ) AS item
+        WHERE audits.created_at >= now() - interval '91 days'
+          AND jsonb_typeof(item) = 'object'
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("knowledge_resolve_daily_counters")
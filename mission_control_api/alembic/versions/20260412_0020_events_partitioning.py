@@ -0,0 +1,112 @@
+"""partition events by month on created_at
+
+Revision ID: 20260412_0020
+Revises: 20260411_0019
+Create Date: 2026-04-12
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+
+revision: str = "20260412_0020"
+down_revision: str | None = "20260411_0019"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE events RENAME TO events_legacy")
+    op.execute("ALTER TABLE events_legacy RENAME CONSTRAINT events_pkey TO events_legacy_pkey")
+    op.execute("ALTER INDEX idx_events_created_at_desc RENAME TO idx_events_legacy_created_at_desc")
+    op.execute("ALTER INDEX idx_events_type_created_at_desc RENAME TO idx_events_legacy_type_created_at_desc")
+    op.execute("ALTER TABLE events_legacy DROP CONSTRAINT events_legacy_pkey")
+    op.execute("ALTER TABLE events_legacy ADD CONSTRAINT events_legacy_pkey PRIMARY KEY (id, created_at)")
+    op.execute("CREATE TABLE events (LIKE events_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+    op.execute("ALTER TABLE events ADD CONSTRAINT events_pkey PRIMARY KEY (id, created_at)")
+    op.execute("CREATE INDEX idx_events_created_at_desc ON events (created_at DESC)")
+    op.execute("CREATE INDEX idx_events_type_created_at_desc ON events (type, created_at DESC)")
+    op.execute(
+        """
+        DO $$
+        DECLARE
+          boundary timestamp;
+          month_start timestamp;
+        BEGIN
+          SELECT date_trunc('month', greatest(now(), coalesce(max(created_at), now())) AT TIME ZONE 'UTC') + interval '1 month'
+            INTO boundary
+            FROM events_legacy;
+          EXECUTE format(
+            'ALTER TABLE events_legacy ADD CONSTRAINT events_legacy_created_at_bound CHECK (created_at < %L::timestamptz) NOT VALID',
+            boundary AT TIME ZONE 'UTC'
+          );
+          ALTER TABLE events_legacy VALIDATE CONSTRAINT events_legacy_created_at_bound;
+          EXECUTE format(
+            'ALTER TABLE events ATTACH PARTITION events_legacy FOR VALUES FROM (MINVALUE) TO (%L)',
+            boundary AT TIME ZONE 'UTC'
+          );
+          ALTER TABLE events_legacy DROP CONSTRAINT events_legacy_created_at_bound;
+          FOR offset_months IN 0..2 LOOP
+            month_start := boundary + make_interval(months => offset_months);
+            EXECUTE format(
+              'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+              'events_p' || to_char(month_start, 'YYYYMM'),
+              month_start AT TIME ZONE 'UTC',
+              (month_start + interval '1 month') AT TIME ZONE 'UTC'
+            );
+          END LOOP;
+        END $$
+        """
+    )
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DO $$
+        BEGIN
+          IF EXISTS (
+            SELECT 1
+              FROM pg_inherits i
+              JOIN pg_class c ON c.oid = i.inhrelid
+             WHERE i.inhparent = 'events'::regclass AND c.relname = 'events_legacy'
+          ) THEN
+            ALTER TABLE events DETACH PARTITION events_legacy;
+          ELSE
+            DROP TABLE IF EXISTS events_legacy;
+            CREATE TABLE events_legacy (LIKE events INCLUDING DEFAULTS);
+            ALTER TABLE events_legacy ADD CONSTRAINT events_legacy_pkey PRIMARY KEY (id, created_at);
+            CREATE INDEX idx_events_legacy_created_at_desc ON events_legacy (created_at DESC);
+            CREATE INDEX idx_events_legacy_type_created_at_desc ON events_legacy (type, created_at DESC);
+          END IF;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        DECLARE
+          detached record;
+        BEGIN
+          FOR detached IN
+            SELECT c.relname
+              FROM pg_class c
+             WHERE c.relkind = 'r'
+               AND c.relnamespace = current_schema()::regnamespace
+               AND left(c.relname, 8) = 'events_p'
+               AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)
+          LOOP
+            EXECUTE format('DROP TABLE %I', detached.relname);
+          END LOOP;
+        END $$
+        """
+    )
+    op.execute("INSERT INTO events_legacy SELECT * FROM events ON CONFLICT DO NOTHING")
+    op.execute("DROP TABLE events")
+    op.execute("ALTER TABLE events_legacy DROP CONSTRAINT events_legacy_pkey")
+    op.execute("ALTER TABLE events_legacy RENAME TO events")
+    op.execute("ALTER TABLE events ADD CONSTRAINT events_pkey PRIMARY KEY (id)")
+    op.execute("ALTER INDEX idx_events_legacy_created_at_desc RENAME TO idx_events_created_at_desc")
+    op.execute("ALTER INDEX idx_events_legacy_type_created_at_desc RENAME TO idx_events_type_created_at_desc")
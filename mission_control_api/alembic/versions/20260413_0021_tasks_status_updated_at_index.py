@@ -0,0 +1,24 @@
+"""add tasks (status, updated_at) index for the board query
+
+Revision ID: 20260413_0021
+Revises: 20260412_0020
+Create Date: 2026-04-13
+"""
+
+from typing import Sequence
+
+from alembic import op
+
+
+revision: str = "20260413_0021"
+down_revision: str | None = "20260412_0020"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_updated_at_desc ON tasks (status, updated_at DESC, id DESC)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_tasks_status_updated_at_desc")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 
 import yaml
@@ -7,6 +9,9 @@ import yaml
 from .config import Settings, _is_placeholder_token
 
 
+AGENT_REGISTRY_CHECK_INTERVAL_SECONDS = 1.0
+
+
 def _slug_label(slug: str) -> str:
     return slug.replace("-", " ").replace("_", " ").strip().title() or slug
 
@@ -88,4 +93,87 @@ def build_agent_catalog(settings: Settings) -> list[dict]:
             "order": idx,
         }
         for idx, slug in enumerate(fallback_slugs)
-    ]
\ No newline at end of file
+    ]
+
+
+def _path_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return int(stat.st_mtime_ns), int(stat.st_ino)
+
+
+class AgentRegistry:
+    def __init__(self, settings: Settings, *, check_interval_seconds: float = AGENT_REGISTRY_CHECK_INTERVAL_SECONDS) -> None:
+        self.settings = settings
+        self.check_interval_seconds = max(float(check_interval_seconds), 0.0)
+        self._manifest_path = Path(str(settings.agent_manifest_path or "").strip())
+        self._homes_root = Path(settings.agent_homes_dir)
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._manifest_signature: tuple[int, int] | None = None
+        self._homes_signature: tuple[int, int] | None = None
+        self._catalog: list[dict] = []
+        self._home_slugs: frozenset[str] = frozenset()
+        self._ordered_slugs: tuple[str, ...] = ()
+        self._labels: dict[str, str] = {}
+        self._loaded = False
+        self.reloads = {"manifest": 0, "homes": 0}
+        self.refresh(force=True)
+
+    def _scan_home_slugs(self) -> frozenset[str]:
+        try:
+            return frozenset(path.name for path in self._homes_root.iterdir() if path.is_dir())
+        except OSError:
+            return frozenset()
+
+    def refresh(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval_seconds:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval_seconds:
+                return
+            manifest_signature = _path_signature(self._manifest_path)
+            homes_signature = _path_signature(self._homes_root)
+            changed = False
+            if not self._loaded or manifest_signature != self._manifest_signature:
+                self._catalog = build_agent_catalog(self.settings)
+                self._manifest_signature = manifest_signature
+                self.reloads["manifest"] += 1
+                changed = True
+            if not self._loaded or homes_signature != self._homes_signature:
+                self._home_slugs = self._scan_home_slugs()
+                self._homes_signature = homes_signature
+                self.reloads["homes"] += 1
+                changed = True
+            if changed:
+                labels: dict[str, str] = {}
+                for item in self._catalog:
+                    slug = str(item.get("slug") or "").strip()
+                    if slug and slug not in labels:
+                        labels[slug] = str(item.get("label") or slug).strip() or slug
+                self._labels = labels
+                self._ordered_slugs = tuple(labels) + tuple(sorted(self._home_slugs - set(labels)))
+            self._loaded = True
+            self._checked_at = now
+
+    def catalog(self) -> list[dict]:
+        self.refresh()
+        return self._catalog
+
+    def known_slugs(self) -> frozenset[str]:
+        self.refresh()
+        return self._home_slugs
+
+    def ordered_slugs(self) -> tuple[str, ...]:
+        self.refresh()
+        return self._ordered_slugs
+
+    def label_map(self) -> dict[str, str]:
+        self.refresh()
+        return self._labels
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.known_slugs()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+
+AUDIT_SINK_OVERFLOW_POLICIES = {"drop", "block"}
+
+
+class AuditSink:
+    def __init__(
+        self,
+        writer: Callable[[list[dict]], Awaitable[None]],
+        *,
+        max_queue_size: int = 2000,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.5,
+        overflow: str = "drop",
+        block_timeout_seconds: float = 1.0,
+    ) -> None:
+        self._writer = writer
+        self.max_queue_size = max(int(max_queue_size), 1)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval_seconds = max(float(flush_interval_seconds), 0.01)
+        normalized_overflow = str(overflow or "drop").strip().lower()
+        self.overflow = normalized_overflow if normalized_overflow in AUDIT_SINK_OVERFLOW_POLICIES else "drop"
+        self.block_timeout_seconds = max(float(block_timeout_seconds), 0.0)
+        self._pending: deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        self.stats = {"enqueued": 0, "written": 0, "dropped": 0, "write_failures": 0, "batches": 0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._closing = False
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def submit(self, record: dict) -> bool:
+        if len(self._pending) >= self.max_queue_size and self.overflow == "block":
+            self._wakeup.set()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.block_timeout_seconds
+            while len(self._pending) >= self.max_queue_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._space.clear()
+                try:
+                    await asyncio.wait_for(self._space.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+        if len(self._pending) >= self.max_queue_size:
+            self.stats["dropped"] += 1
+            return False
+
+        self._pending.append(record)
+        self.stats["enqueued"] += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                self._space.set()
+                try:
+                    await self._writer(batch)
+                except Exception:
+                    self.stats["write_failures"] += 1
+                    self.stats["dropped"] += len(batch)
+                    continue
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def aclose(self) -> None:
+        self._closing = True
+        self._wakeup.set()
+        if self._worker is not None:
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.flush()
+
+
+class CounterAccumulator:
+    def __init__(
+        self,
+        writer: Callable[[list[dict]], Awaitable[None]],
+        *,
+        key_fields: tuple[str, ...],
+        sum_fields: tuple[str, ...],
+        max_fields: tuple[str, ...] = ("updated_at",),
+        flush_interval_seconds: float = 1.0,
+        max_pending_keys: int = 10000,
+    ) -> None:
+        self._writer = writer
+        self.key_fields = key_fields
+        self.sum_fields = sum_fields
+        self.max_fields = max_fields
+        self.flush_interval_seconds = max(float(flush_interval_seconds), 0.01)
+        self.max_pending_keys = max(int(max_pending_keys), 1)
+        self._pending: dict[tuple, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        self.stats = {"added": 0, "written": 0, "write_failures": 0, "flushes": 0, "lost": 0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        self._closing = False
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    def add(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.stats["added"] += 1
+            self._merge(row)
+
+    def _merge(self, row: dict) -> bool:
+        key = tuple(row[name] for name in self.key_fields)
+        current = self._pending.get(key)
+        if current is None:
+            if len(self._pending) >= self.max_pending_keys:
+                self.stats["lost"] += 1
+                return False
+            self._pending[key] = dict(row)
+            return True
+        for name in self.sum_fields:
+            current[name] += row[name]
+        for name in self.max_fields:
+            current[name] = max(current[name], row[name])
+        return True
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            rows = [self._pending[key] for key in sorted(self._pending)]
+            self._pending = {}
+            try:
+                await self._writer(rows)
+            except Exception:
+                self.stats["write_failures"] += 1
+                for row in rows:
+                    self._merge(row)
+                return
+            self.stats["written"] += len(rows)
+            self.stats["flushes"] += 1
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def aclose(self) -> None:
+        self._closing = True
+        self._wakeup.set()
+        if self._worker is not None:
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.flush()
+        self.stats["lost"] += len(self._pending)
+        self._pending = {}
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import math
+
+import httpx
+
+
+def normalize_embedding(values: object, *, expected_dimensions: int | None) -> list[float]:
+    if not isinstance(values, list):
+        raise ValueError("embedding response item is not a list")
+    normalized = [float(value) for value in values]
+    if not normalized:
+        raise ValueError("embedding response item is empty")
+    if expected_dimensions is not None and len(normalized) != expected_dimensions:
+        raise ValueError(f"embedding dimensions mismatch: expected {expected_dimensions}, got {len(normalized)}")
+    if any(not math.isfinite(value) for value in normalized):
+        raise ValueError("embedding contains non-finite values")
+    return normalized
+
+
+async def request_embeddings(
+    client: httpx.AsyncClient,
+    texts: list[str],
+    *,
+    config: dict,
+) -> tuple[list[list[float]], str, int]:
+    headers = {"Content-Type": "application/json"}
+    api_key = str(config.get("api_key") or "").strip()
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    payload = {
+        "model": config["model"],
+        "input": texts,
+    }
+    url = f"{config['base_url']}/embeddings"
+    response = await client.post(url, headers=headers, json=payload, timeout=config["timeout_seconds"])
+
+    if response.status_code >= 400:
+        detail = response.text.strip()
+        raise ValueError(f"embedding request failed: status={response.status_code} detail={detail[:400]}")
+
+    body = response.json()
+    data = body.get("data")
+    if not isinstance(data, list) or len(data) != len(texts):
+        raise ValueError("embedding response data length mismatch")
+
+    vectors: list[list[float]] = []
+    actual_dimensions: int | None = None
+    for item in data:
+        if not isinstance(item, dict):
+            raise ValueError("embedding response item is not an object")
+        vector = normalize_embedding(item.get("embedding"), expected_dimensions=config.get("dimensions"))
+        if actual_dimensions is None:
+            actual_dimensions = len(vector)
+        elif len(vector) != actual_dimensions:
+            raise ValueError("embedding response dimensions are inconsistent across items")
+        vectors.append(vector)
+
+    if actual_dimensions is None:
+        raise ValueError("embedding response returned no vectors")
+
+    model_name = str(body.get("model") or config["model"]).strip() or config["model"]
+    return vectors, model_name, actual_dimensions
+
+
+class EmbeddingClient:
+    def __init__(
+        self,
+        *,
+        max_batch_size: int = 64,
+        max_concurrency: int = 4,
+        coalesce_window_seconds: float = 0.005,
+        max_connections: int = 20,
+    ) -> None:
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.coalesce_window_seconds = max(float(coalesce_window_seconds), 0.0)
+        self._limits = httpx.Limits(
+            max_connections=max(int(max_connections), 1),
+            max_keepalive_connections=max(int(max_connections), 1),
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pending: dict[tuple, list[tuple[str, asyncio.Future]]] = {}
+        self._pending_configs: dict[tuple, dict] = {}
+        self._flush_handles: dict[tuple, asyncio.TimerHandle] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self._limits)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _request_batch(self, texts: list[str], *, config: dict) -> tuple[list[list[float]], str, int]:
+        client = self._http_client()
+        async with self._semaphore:
+            return await request_embeddings(client, texts, config=config)
+
+    async def embed_many(self, texts: list[str], *, config: dict) -> tuple[list[list[float]], str, int]:
+        if not texts:
+            raise ValueError("embedding input is empty")
+        batches = [texts[start:start + self.max_batch_size] for start in range(0, len(texts), self.max_batch_size)]
+        results = await asyncio.gather(*(self._request_batch(batch, config=config) for batch in batches))
+
+        vectors: list[list[float]] = []
+        model_name = results[0][1]
+        dimensions = results[0][2]
+        for batch_vectors, batch_model, batch_dimensions in results:
+            if batch_model != model_name:
+                raise ValueError(f"embedding model changed across batches: {model_name} -> {batch_model}")
+            if batch_dimensions != dimensions:
+                raise ValueError("embedding response dimensions are inconsistent across batches")
+            vectors.extend(batch_vectors)
+        return vectors, model_name, dimensions
+
+    async def embed_query(self, text: str, *, config: dict) -> tuple[list[float], str, int]:
+        if self.coalesce_window_seconds <= 0:
+            vectors, model_name, dimensions = await self.embed_many([text], config=config)
+            return vectors[0], model_name, dimensions
+
+        loop = asyncio.get_running_loop()
+        key = (config["model"], config["base_url"], config.get("dimensions"), config.get("api_key"))
+        future: asyncio.Future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((text, future))
+        self._pending_configs[key] = config
+        if len(pending) >= self.max_batch_size:
+            self._schedule_flush(key)
+        elif key not in self._flush_handles:
+            self._flush_handles[key] = loop.call_later(self.coalesce_window_seconds, self._schedule_flush, key)
+        return await future
+
+    def _schedule_flush(self, key: tuple) -> None:
+        handle = self._flush_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending.pop(key, [])
+        config = self._pending_configs.pop(key, None)
+        if pending and config is not None:
+            task = asyncio.get_running_loop().create_task(self._flush(pending, config=config))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, pending: list[tuple[str, asyncio.Future]], *, config: dict) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in pending))
+        try:
+            vectors, model_name, dimensions = await self.embed_many(unique_texts, config=config)
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in pending:
+            if not future.done():
+                future.set_result((list(by_text[text]), model_name, dimensions))
+
+    async def aclose(self) -> None:
+        for key in list(self._pending):
+            self._schedule_flush(key)
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+
+from redis.asyncio import Redis
+
+
+def parse_stream_id(value: str | None) -> tuple[int, int] | None:
+    raw = str(value or "").strip()
+    if not raw:
+        return None
+    millis, _, sequence = raw.partition("-")
+    try:
+        return int(millis), int(sequence or 0)
+    except ValueError:
+        return None
+
+
+def parse_filter_values(value: str | None) -> frozenset[str]:
+    return frozenset(part.strip() for part in str(value or "").split(",") if part.strip())
+
+
+def _matches(patterns: frozenset[str], value: str) -> bool:
+    if not patterns:
+        return True
+    if value in patterns:
+        return True
+    return any(pattern.endswith("*") and value.startswith(pattern[:-1]) for pattern in patterns)
+
+
+def decode_stream_entry(entry_id, fields: dict) -> tuple[str, str, str, str] | None:
+    raw = fields.get("event")
+    if not raw:
+        return None
+    stream_id = str(entry_id)
+    try:
+        event = json.loads(raw)
+    except (TypeError, ValueError):
+        return stream_id, "", "", raw
+    if not isinstance(event, dict):
+        return stream_id, "", "", raw
+    event["stream_id"] = stream_id
+    return stream_id, str(event.get("type") or ""), str(event.get("agent") or ""), json.dumps(event, ensure_ascii=False)
+
+
+class EventSubscription:
+    def __init__(self, *, types: frozenset[str], agents: frozenset[str], queue_size: int) -> None:
+        self.types = types
+        self.agents = agents
+        self.queue_size = max(int(queue_size), 1)
+        self.missed = 0
+        self.last_stream_id: str | None = None
+        self._items: deque[tuple[str, str]] = deque()
+        self._ready = asyncio.Event()
+
+    def accepts(self, event_type: str, agent: str) -> bool:
+        return _matches(self.types, event_type) and _matches(self.agents, agent)
+
+    def offer(self, stream_id: str, message: str) -> None:
+        if len(self._items) >= self.queue_size:
+            self._items.popleft()
+            self.missed += 1
+        self._items.append((stream_id, message))
+        self._ready.set()
+
+    async def next(self, timeout: float) -> tuple[str, str] | None:
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._items.popleft()
+
+    def take_gap(self) -> dict | None:
+        if not self.missed:
+            return None
+        gap = {"type": "stream.gap", "missed": self.missed, "resume_from": self.last_stream_id}
+        self.missed = 0
+        return gap
+
+
+class EventHub:
+    def __init__(
+        self,
+        redis: Redis,
+        stream_key: str,
+        *,
+        client_queue_size: int = 256,
+        read_count: int = 200,
+        block_ms: int = 5000,
+        replay_limit: int = 1000,
+    ) -> None:
+        self.redis = redis
+        self.stream_key = stream_key
+        self.client_queue_size = max(int(client_queue_size), 1)
+        self.read_count = max(int(read_count), 1)
+        self.block_ms = max(int(block_ms), 100)
+        self.replay_limit = max(int(replay_limit), 0)
+        self.last_stream_id: str | None = None
+        self._subscribers: set[EventSubscription] = set()
+        self._active = asyncio.Event()
+        self._reader: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def start(self) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    def subscribe(self, *, types: frozenset[str] = frozenset(), agents: frozenset[str] = frozenset()) -> EventSubscription:
+        subscription = EventSubscription(types=types, agents=agents, queue_size=self.client_queue_size)
+        if not self._subscribers:
+            self.last_stream_id = None
+        self._subscribers.add(subscription)
+        self._active.set()
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        self._subscribers.discard(subscription)
+        if not self._subscribers:
+            self._active.clear()
+
+    async def replay(self, subscription: EventSubscription, resume_from: str) -> list[tuple[str, str]]:
+        if parse_stream_id(resume_from) is None or not self.replay_limit:
+            return []
+        entries = await self.redis.xrange(self.stream_key, min=f"({resume_from}", max="+", count=self.replay_limit + 1)
+        if len(entries) > self.replay_limit:
+            entries = list(reversed(await self.redis.xrevrange(self.stream_key, max="+", min=f"({resume_from}", count=self.replay_limit)))
+            subscription.missed += 1
+        replayed: list[tuple[str, str]] = []
+        for entry_id, fields in entries:
+            decoded = decode_stream_entry(entry_id, fields)
+            if decoded is None:
+                continue
+            stream_id, event_type, agent, message = decoded
+            if subscription.accepts(event_type, agent):
+                replayed.append((stream_id, message))
+        return replayed
+
+    def _dispatch(self, stream_id: str, event_type: str, agent: str, message: str) -> None:
+        for subscription in tuple(self._subscribers):
+            if subscription.accepts(event_type, agent):
+                subscription.offer(stream_id, message)
+
+    async def _latest_stream_id(self) -> str:
+        latest = await self.redis.xrevrange(self.stream_key, count=1)
+        return str(latest[0][0]) if latest else "0-0"
+
+    async def _run(self) -> None:
+        while True:
+            await self._active.wait()
+            try:
+                if self.last_stream_id is None:
+                    self.last_stream_id = await self._latest_stream_id()
+                result = await self.redis.xread(
+                    {self.stream_key: self.last_stream_id},
+                    block=self.block_ms,
+                    count=self.read_count,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(1.0)
+                continue
+            for _, entries in result or []:
+                for entry_id, fields in entries:
+                    decoded = decode_stream_entry(entry_id, fields)
+                    if decoded is None:
+                        continue
+                    stream_id, event_type, agent, message = decoded
+                    self.last_stream_id = stream_id
+                    self._dispatch(stream_id, event_type, agent, message)
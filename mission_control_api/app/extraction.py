@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from pathlib import Path
+
+
+KNOWLEDGE_TEXT_EXTENSIONS = {"txt", "md", "rst", "csv", "json", "yaml", "yml", "log"}
+KNOWLEDGE_DOCUMENT_EXTENSIONS = {"pdf", "docx", "pptx", "xlsx"}
+KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "pdf"}
+KNOWLEDGE_PDF_TEXT_MIN_CHARS = 32
+KNOWLEDGE_PDF_OCR_DPI = 150
+EXTRACTION_PRELOAD_MODULES = ["pypdf", "docx", "pptx", "openpyxl", "PIL.Image", "PIL.ImageOps", "pytesseract", "pdf2image"]
+
+
+def sha256sum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _no_ocr_meta(ocr_languages: str) -> dict:
+    return {
+        "ocr_used": False,
+        "ocr_fallback_used": False,
+        "ocr_languages": ocr_languages,
+        "ocr_pages_processed": 0,
+        "ocr_pages_truncated": 0,
+    }
+
+
+def _extract_plain_text(path: Path) -> tuple[str, str, list[str]]:
+    return path.read_text(encoding="utf-8", errors="replace"), "plain_text", []
+
+
+def _ocr_image_to_text(image, *, ocr_languages: str) -> str:
+    import pytesseract
+    from PIL import ImageOps
+
+    normalized = ImageOps.exif_transpose(image)
+    grayscale = ImageOps.grayscale(normalized)
+    return str(pytesseract.image_to_string(grayscale, lang=ocr_languages) or "").strip()
+
+
+def _extract_image_ocr_text(path: Path, *, ocr_languages: str) -> tuple[str, str, list[str], dict]:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        text = _ocr_image_to_text(image, ocr_languages=ocr_languages)
+    if not text:
+        raise ValueError("image OCR produced no text")
+    return text, "tesseract_ocr", [], {
+        "ocr_used": True,
+        "ocr_fallback_used": False,
+        "ocr_languages": ocr_languages,
+        "ocr_pages_processed": 1,
+        "ocr_pages_truncated": 0,
+    }
+
+
+def extract_pdf_text_layer(path: Path) -> tuple[str, list[str], int]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(path))
+    parts: list[str] = []
+    warnings: list[str] = []
+
+    for index, page in enumerate(reader.pages, start=1):
+        page_text = (page.extract_text() or "").strip()
+        if page_text:
+            parts.append(page_text)
+        else:
+            warnings.append(f"page_{index}_no_text")
+
+    return "\n\n".join(parts).strip(), warnings, len(reader.pages)
+
+
+def ocr_pdf_page(path: Path, page_number: int, *, ocr_languages: str) -> str:
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(str(path), dpi=KNOWLEDGE_PDF_OCR_DPI, first_page=page_number, last_page=page_number)
+    return "\n\n".join(_ocr_image_to_text(image, ocr_languages=ocr_languages) for image in images).strip()
+
+
+def pdf_text_layer_result(text: str, warnings: list[str], *, ocr_languages: str) -> tuple[str, str, list[str], dict]:
+    return text, "pypdf", warnings, _no_ocr_meta(ocr_languages)
+
+
+def pdf_ocr_result(
+    page_texts: list[str],
+    *,
+    page_total: int,
+    text_layer_warnings: list[str],
+    ocr_languages: str,
+) -> tuple[str, str, list[str], dict]:
+    parts: list[str] = []
+    warnings = list(text_layer_warnings)
+    warnings.append("pdf_text_layer_insufficient_fallback_to_ocr")
+
+    for index, page_text in enumerate(page_texts, start=1):
+        if page_text:
+            parts.append(page_text)
+        else:
+            warnings.append(f"ocr_page_{index}_no_text")
+
+    pages_truncated = max(page_total - len(page_texts), 0)
+    if pages_truncated > 0:
+        warnings.append("ocr_pdf_page_limit_applied")
+
+    text = "\n\n".join(parts).strip()
+    if not text:
+        raise ValueError("scanned pdf OCR produced no text")
+    return text, "pypdf+tesseract_ocr", warnings, {
+        "ocr_used": True,
+        "ocr_fallback_used": True,
+        "ocr_languages": ocr_languages,
+        "ocr_pages_processed": len(page_texts),
+        "ocr_pages_truncated": pages_truncated,
+    }
+
+
+def _extract_pdf_text(path: Path, *, ocr_enabled: bool, ocr_languages: str, max_pdf_pages: int) -> tuple[str, str, list[str], dict]:
+    text, warnings, page_total = extract_pdf_text_layer(path)
+    if len(text) >= KNOWLEDGE_PDF_TEXT_MIN_CHARS:
+        return pdf_text_layer_result(text, warnings, ocr_languages=ocr_languages)
+
+    if not ocr_enabled:
+        raise ValueError("pdf text layer is insufficient and OCR is disabled for this request")
+
+    page_texts = [
+        ocr_pdf_page(path, page_number, ocr_languages=ocr_languages)
+        for page_number in range(1, min(page_total, max_pdf_pages) + 1)
+    ]
+    return pdf_ocr_result(page_texts, page_total=page_total, text_layer_warnings=warnings, ocr_languages=ocr_languages)
+
+
+def _extract_docx_text(path: Path) -> tuple[str, str, list[str]]:
+    from docx import Document
+
+    doc = Document(str(path))
+    parts: list[str] = []
+
+    for paragraph in doc.paragraphs:
+        text = str(paragraph.text or "").strip()
+        if text:
+            parts.append(text)
+
+    for table in doc.tables:
+        for row in table.rows:
+            cells = [str(cell.text or "").strip() for cell in row.cells]
+            line = " | ".join(cell for cell in cells if cell)
+            if line:
+                parts.append(line)
+
+    text = "\n".join(parts).strip()
+    if not text:
+        raise ValueError("docx has no extractable text")
+    return text, "python-docx", []
+
+
+def _extract_pptx_text(path: Path) -> tuple[str, str, list[str]]:
+    from pptx import Presentation
+
+    presentation = Presentation(str(path))
+    parts: list[str] = []
+
+    for slide_index, slide in enumerate(presentation.slides, start=1):
+        slide_parts: list[str] = []
+        for shape in slide.shapes:
+            text = str(getattr(shape, "text", "") or "").strip()
+            if text:
+                slide_parts.append(text)
+        if slide_parts:
+            parts.append(f"[slide {slide_index}]\n" + "\n".join(slide_parts))
+
+    text = "\n\n".join(parts).strip()
+    if not text:
+        raise ValueError("pptx has no extractable text")
+    return text, "python-pptx", []
+
+
+def _extract_xlsx_text(path: Path) -> tuple[str, str, list[str]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filename=str(path), read_only=True, data_only=True)
+    parts: list[str] = []
+    warnings: list[str] = []
+
+    for sheet in workbook.worksheets:
+        sheet_lines: list[str] = []
+        for row in sheet.iter_rows(values_only=True):
+            values = [str(value).strip() for value in row if value not in (None, "")]
+            if values:
+                sheet_lines.append("\t".join(values))
+        if sheet_lines:
+            parts.append(f"[sheet {sheet.title}]\n" + "\n".join(sheet_lines))
+        else:
+            warnings.append(f"sheet_{sheet.title}_empty")
+
+    text = "\n\n".join(parts).strip()
+    if not text:
+        raise ValueError("xlsx has no extractable text")
+    return text, "openpyxl", warnings
+
+
+def extract_source_text(
+    path: Path,
+    *,
+    ocr_enabled: bool,
+    ocr_languages: str,
+    max_pdf_pages: int,
+) -> tuple[str, str, list[str], dict]:
+    ext = path.suffix.lower().lstrip(".")
+    if ext in KNOWLEDGE_TEXT_EXTENSIONS:
+        text, parser, warnings = _extract_plain_text(path)
+        return text, parser, warnings, _no_ocr_meta(ocr_languages)
+    if ext == "pdf":
+        return _extract_pdf_text(
+            path,
+            ocr_enabled=ocr_enabled,
+            ocr_languages=ocr_languages,
+            max_pdf_pages=max_pdf_pages,
+        )
+    if ext == "docx":
+        text, parser, warnings = _extract_docx_text(path)
+        return text, parser, warnings, _no_ocr_meta(ocr_languages)
+    if ext == "pptx":
+        text, parser, warnings = _extract_pptx_text(path)
+        return text, parser, warnings, _no_ocr_meta(ocr_languages)
+    if ext == "xlsx":
+        text, parser, warnings = _extract_xlsx_text(path)
+        return text, parser, warnings, _no_ocr_meta(ocr_languages)
+    if ext in {"png", "jpg", "jpeg", "webp"}:
+        if not ocr_enabled:
+            raise ValueError(f"{ext} requires OCR but OCR is disabled for this request")
+        return _extract_image_ocr_text(path, ocr_languages=ocr_languages)
+    if ext in KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS:
+        raise ValueError(f"unsupported OCR candidate extension for current implementation: {ext}")
+    raise ValueError(f"unsupported source extension for chunking: {ext}")
+
+
+def _run_extraction_job(conn, func, args: tuple, kwargs: dict, memory_limit_bytes: int | None) -> None:
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    if memory_limit_bytes:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+    try:
+        result = func(*args, **kwargs)
+    except MemoryError:
+        conn.send((False, ValueError("extraction exceeded memory limit")))
+    except BaseException as exc:
+        try:
+            conn.send((False, exc))
+        except Exception:
+            conn.send((False, ValueError(f"{type(exc).__name__}: {exc}")))
+    else:
+        conn.send((True, result))
+    finally:
+        conn.close()
+
+
+class ExtractionExecutor:
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        timeout_seconds: float = 300.0,
+        memory_limit_mb: int = 1024,
+    ) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.timeout_seconds = float(timeout_seconds) if timeout_seconds and timeout_seconds > 0 else None
+        self.memory_limit_bytes = int(memory_limit_mb) * 1024 * 1024 if memory_limit_mb and memory_limit_mb > 0 else None
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload([__name__, *EXTRACTION_PRELOAD_MODULES])
+        self._semaphore: asyncio.Semaphore | None = None
+        self._processes: set = set()
+
+    async def run(self, func, *args, **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        async with self._semaphore:
+            parent_conn, child_conn = self._context.Pipe(duplex=False)
+            process = self._context.Process(
+                target=_run_extraction_job,
+                args=(child_conn, func, args, kwargs, self.memory_limit_bytes),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._processes.add(process)
+            try:
+                return await asyncio.wait_for(self._receive(parent_conn, process), timeout=self.timeout_seconds)
+            except asyncio.TimeoutError as exc:
+                raise ValueError(f"extraction timed out after {self.timeout_seconds:g}s") from exc
+            finally:
+                parent_conn.close()
+                self._processes.discard(process)
+                await asyncio.shield(self._stop(process))
+
+    async def _receive(self, conn, process):
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        fd = conn.fileno()
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+        try:
+            await readable
+        finally:
+            loop.remove_reader(fd)
+        try:
+            ok, payload = conn.recv()
+        except EOFError:
+            await asyncio.to_thread(process.join, 5.0)
+            raise ValueError(
+                f"extraction worker exited with code {process.exitcode}"
+                + (" (memory limit may have been exceeded)" if self.memory_limit_bytes else "")
+            ) from None
+        if not ok:
+            raise payload
+        return payload
+
+    async def _stop(self, process) -> None:
+        if process.is_alive():
+            process.terminate()
+        await asyncio.to_thread(process.join, 5.0)
+        if process.is_alive():
+            process.kill()
+            await asyncio.to_thread(process.join, 5.0)
+
+    async def sha256sum(self, path: Path) -> str:
+        return await asyncio.wait_for(asyncio.to_thread(sha256sum, path), timeout=self.timeout_seconds)
+
+    async def extract_source_text(
+        self,
+        path: Path,
+        *,
+        ocr_enabled: bool,
+        ocr_languages: str,
+        max_pdf_pages: int,
+    ) -> tuple[str, str, list[str], dict]:
+        if path.suffix.lower().lstrip(".") != "pdf":
+            return await self.run(
+                extract_source_text,
+                path,
+                ocr_enabled=ocr_enabled,
+                ocr_languages=ocr_languages,
+                max_pdf_pages=max_pdf_pages,
+            )
+
+        text, warnings, page_total = await self.run(extract_pdf_text_layer, path)
+        if len(text) >= KNOWLEDGE_PDF_TEXT_MIN_CHARS:
+            return pdf_text_layer_result(text, warnings, ocr_languages=ocr_languages)
+        if not ocr_enabled:
+            raise ValueError("pdf text layer is insufficient and OCR is disabled for this request")
+
+        page_tasks = [
+            asyncio.create_task(self.run(ocr_pdf_page, path, page_number, ocr_languages=ocr_languages))
+            for page_number in range(1, min(page_total, max_pdf_pages) + 1)
+        ]
+        try:
+            page_texts = await asyncio.gather(*page_tasks)
+        except BaseException:
+            for task in page_tasks:
+                task.cancel()
+            await asyncio.gather(*page_tasks, return_exceptions=True)
+            raise
+        return pdf_ocr_result(
+            list(page_texts),
+            page_total=page_total,
+            text_layer_warnings=warnings,
+            ocr_languages=ocr_languages,
+        )
+
+    def shutdown(self) -> None:
+        for process in list(self._processes):
+            if process.is_alive():
+                process.kill()
+        self._processes.clear()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+
+ProbeResult = tuple[bool, int | None, str]
+ProbeTarget = tuple[str, str, str, Callable[[], Awaitable[ProbeResult]]]
+
+
+class HealthProber:
+    def __init__(
+        self,
+        targets: Callable[[], list[ProbeTarget]],
+        *,
+        interval_seconds: float = 5.0,
+        history_size: int = 20,
+        on_change: Callable[[dict], Awaitable[None]] | None = None,
+    ) -> None:
+        self._targets = targets
+        self.interval_seconds = max(float(interval_seconds), 0.5)
+        self.history_size = max(int(history_size), 1)
+        self._on_change = on_change
+        self.signals: dict[str, dict] = {}
+        self.generated_at: datetime | None = None
+        self.last_duration_ms: int | None = None
+        self._lock = asyncio.Lock()
+        self._worker: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+    async def snapshot(self) -> tuple[datetime, list[dict]]:
+        if self.generated_at is None:
+            await self.probe_once()
+        return self.generated_at or datetime.now(timezone.utc), list(self.signals.values())
+
+    async def probe_once(self) -> list[dict]:
+        async with self._lock:
+            started = time.perf_counter()
+            targets = self._targets()
+            results = await asyncio.gather(*(probe() for _, _, _, probe in targets), return_exceptions=True)
+            checked_at = datetime.now(timezone.utc)
+
+            signals: dict[str, dict] = {}
+            changes: list[dict] = []
+            for (name, source, target, _), result in zip(targets, results):
+                if isinstance(result, BaseException):
+                    ok, latency_ms, detail = False, None, f"{result.__class__.__name__}: {result}"
+                else:
+                    ok, latency_ms, detail = result
+                previous = self.signals.get(name)
+                history = previous["latency_history_ms"] if previous else deque(maxlen=self.history_size)
+                history.append(latency_ms)
+                changed_at = checked_at
+                if previous is not None and previous["ok"] == ok:
+                    changed_at = previous["changed_at"]
+                signals[name] = {
+                    "name": name,
+                    "source": source,
+                    "target": target,
+                    "ok": ok,
+                    "latency_ms": latency_ms,
+                    "detail": detail,
+                    "checked_at": checked_at,
+                    "changed_at": changed_at,
+                    "latency_history_ms": history,
+                }
+                if previous is not None and previous["ok"] != ok:
+                    changes.append({**signals[name], "previous_ok": previous["ok"]})
+
+            self.signals = signals
+            self.generated_at = checked_at
+            self.last_duration_ms = int((time.perf_counter() - started) * 1000)
+
+        if self._on_change is not None:
+            for change in changes:
+                try:
+                    await self._on_change(change)
+                except Exception:
+                    pass
+        return changes
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.probe_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            await asyncio.sleep(max(self.interval_seconds - (time.perf_counter() - started), 0.0))
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import base64
 import json
 import hashlib
-import math
 import mimetypes
+import os
+import random
 import re
 import time
 import urllib.parse
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from urllib.parse import urlparse
@@ -15,23 +18,37 @@ from uuid import UUID, uuid4
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 import httpx
 import asyncio
+from pydantic import BaseModel
 from redis.asyncio import Redis
 
-from .agent_catalog import build_agent_catalog
+from .agent_catalog import AgentRegistry
+from .audit_sink import AuditSink, CounterAccumulator
 from .config import Settings, load_settings
 from .db import create_engine, create_session_factory
+from .embedding_client import EmbeddingClient, normalize_embedding
+from .event_hub import EventHub, parse_filter_values, parse_stream_id
+from .extraction import KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS, ExtractionExecutor
+from .health_prober import HealthProber
 from .models import (
+    agent_heartbeats,
     agent_skill_mappings,
+    agent_usage_file_offsets,
+    agent_usage_hourly,
     comments,
     events,
+    events_minute_rollup,
     knowledge_feedback_events,
+    knowledge_ingestion_jobs,
     knowledge_unit_lifecycle_events,
     knowledge_resolve_ranking_profiles,
     knowledge_resolve_audits,
+    knowledge_resolve_daily_counters,
+    knowledge_source_file_index,
     knowledge_sources,
+    knowledge_unit_current_validation,
     knowledge_unit_embeddings,
     knowledge_units,
     knowledge_validation_policy_bundles,
@@ -51,24 +68,32 @@ from .schemas import (
     AgentSkillRuntimeConfigOut,
     AgentSkillRuntimeConfigPatchIn,
     AgentSkillRuntimeConfigPatchOut,
+    AgentUsageSeriesOut,
+    AgentUsageSeriesPointOut,
     AgentUsageSnapshotOut,
+    AgentUsageTimeseriesOut,
     BoardColumn,
+    BoardDeltaOut,
     BoardOut,
     CommentCreate,
     CommentOut,
     EventIn,
     EventLiteOut,
     EventOut,
+    FeedDeltaOut,
     ContainerHealthSummaryOut,
     Health,
     KnowledgeFeedbackIn,
     KnowledgeFeedbackOut,
     KnowledgeFeedbackSummaryOut,
+    KnowledgeIngestionJobOut,
     KnowledgeLifecycleActionIn,
     KnowledgeLifecycleEventOut,
+    KnowledgeQueryEmbeddingCacheStatsOut,
     KnowledgeResolveRankingProfileOut,
     KnowledgeResolveRankingProfileUpsertIn,
     KnowledgeResolveAuditOut,
+    KnowledgeResolveAuditSinkStatsOut,
     KnowledgeResolveMetricsOut,
     KnowledgeResolveRejectSummaryOut,
     KnowledgeResolveRiskMetricsOut,
@@ -116,9 +141,17 @@ from .schemas import (
     TaskOut,
     WorkspaceSkillGroup,
 )
+from .skills_catalog import FileMemo, SkillsCatalog
+from .source_scan import iter_source_files, next_batch, stat_signature
 
 
 ALLOWED_TASK_STATUSES = {"INBOX", "ASSIGNED", "IN PROGRESS", "REVIEW", "DONE"}
+BOARD_STATUSES = ("INBOX", "ASSIGNED", "IN PROGRESS", "REVIEW", "DONE")
+BOARD_COLUMN_DEFAULT_LIMIT = 100
+BOARD_COLUMN_MAX_LIMIT = 500
+BOARD_DELTA_MAX_LIMIT = 500
+FEED_LITE_MAX_LIMIT = 500
+DELTA_OVERLAP_SECONDS = 2.0
 TASK_STATUS_TRANSITIONS = {
     "INBOX": {"ASSIGNED"},
     "ASSIGNED": {"IN PROGRESS", "REVIEW"},
@@ -127,11 +160,60 @@ TASK_STATUS_TRANSITIONS = {
     "DONE": set(),
 }
 
-USAGE_CACHE_TTL_SECONDS = 15.0
-_AGENT_USAGE_CACHE: dict[str, object] = {
-    "days": None,
+USAGE_BUCKET_SECONDS = 3600
+USAGE_INDEX_HEAD_BYTES = 1024
+USAGE_INDEX_LOCK_KEY = 7301
+USAGE_INDEX_PRUNE_AFTER_DAYS = 30
+USAGE_MODEL_NAME_MAX_CHARS = 200
+WS_EVENTS_PING_SECONDS = 25.0
+CHAT_PROXY_TIMEOUT_SECONDS = 3600.0
+CHAT_PROXY_KEEPALIVE_EXPIRY_SECONDS = 30.0
+CHAT_PROXY_HOP_BY_HOP_HEADERS = {"transfer-encoding", "connection", "keep-alive"}
+CHAT_HTML_CACHE_MAX_ENTRIES = 64
+HEALTH_PROBE_COMPOSE_TIMEOUT_SECONDS = 2.0
+HEALTH_PROBE_PORT_TARGETS = (
+    ("mission-control-api", "mission-control-api", 9090),
+    ("mission-control-ui", "mission-control-ui", 9090),
+    ("mission-control-gateway", "mission-control-gateway", 80),
+)
+HEALTH_PROBE_HTTP_TARGETS = (
+    ("mission-control-api.health", "http://mission-control-api:9090/health"),
+    ("mission-control-gateway.root", "http://mission-control-gateway/"),
+    ("mission-control-ui.root", "http://mission-control-ui:9090/"),
+)
+CHAT_HTML_AVATAR_RE = re.compile(r'window\.__OPENCLAW_ASSISTANT_AVATAR__=("|\')/avatar/[^"\']*("|\')')
+EVENTS_PARTITION_LOCK_KEY = 7302
+EVENTS_PARTITION_PREFIX = "events_p"
+EVENTS_RETENTION_MODES = {"detach", "drop"}
+OBSERVABILITY_SUMMARY_MAX_WINDOW_MINUTES = 60
+EVENTS_ROLLUP_MIN_RETENTION_MINUTES = OBSERVABILITY_SUMMARY_MAX_WINDOW_MINUTES + 5
+EVENTS_ROLLUP_FLUSH_INTERVAL_SECONDS = 1.0
+EVENTS_PARTITION_BOUND_RE = re.compile(r"FROM \((?:MINVALUE|'([^']+)')\) TO \((?:MAXVALUE|'([^']+)')\)")
+USAGE_TIMESERIES_RESOLUTIONS = {"hour": 31, "day": 366}
+USAGE_BUCKET_COUNTERS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+    "total_tokens",
+    "total_cost",
+    "missing_cost_entries",
+    "events",
+)
+QUERY_EMBEDDING_CACHE_REDIS_PREFIX = "mc:knowledge:query-embedding:"
+_QUERY_EMBEDDING_CACHE: OrderedDict[str, tuple[float, list[float], str, int]] = OrderedDict()
+_QUERY_EMBEDDING_CACHE_STATS: dict[str, int] = {
+    "memory_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "evictions": 0,
+}
+_CHAT_HTML_CACHE: OrderedDict[tuple, tuple[str, str | None, bytes]] = OrderedDict()
+_POLICY_SNAPSHOT_CACHE: dict[str, object] = {
+    "version": 0,
+    "loaded_version": None,
     "generated_at": 0.0,
-    "data": [],
+    "snapshot": None,
 }
 
 ALLOWED_AGENT_CONTROL_ACTIONS = {"start", "stop", "restart"}
@@ -140,13 +222,45 @@ KNOWLEDGE_RISK_ORDER = {"low": 0, "normal": 1, "high": 2, "critical": 3}
 KNOWLEDGE_LIFECYCLE_STAGES = {"active", "preferred", "deprecated", "inactive", "archived", "superseded"}
 KNOWLEDGE_LIFECYCLE_ACTIONS = {"promote", "demote", "invalidate", "reactivate", "archive", "supersede"}
 KNOWLEDGE_POLICY_ROLLOUT_MODES = {"full", "percentage"}
-KNOWLEDGE_TEXT_EXTENSIONS = {"txt", "md", "rst", "csv", "json", "yaml", "yml", "log"}
-KNOWLEDGE_DOCUMENT_EXTENSIONS = {"pdf", "docx", "pptx", "xlsx"}
-KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "pdf"}
 KNOWLEDGE_OCR_LANGUAGES = "eng+chi_sim"
 KNOWLEDGE_OCR_MAX_PDF_PAGES = 5
-KNOWLEDGE_PDF_TEXT_MIN_CHARS = 32
 KNOWLEDGE_EMBEDDING_PROTOCOLS = {"openai-embeddings", "openai-completions"}
+KNOWLEDGE_LEXICAL_RANK_NORMALIZATION = 32
+KNOWLEDGE_LEXICAL_MAX_CANDIDATES = 500
+KNOWLEDGE_INGESTION_STAGES = ("extract", "chunk", "embed", "persist")
+KNOWLEDGE_INGESTION_JOB_STATUSES = {"queued", "running", "cancelling", "cancelled", "succeeded", "failed"}
+KNOWLEDGE_INGESTION_MAX_ATTEMPTS = 3
+KNOWLEDGE_BULK_WRITE_BATCH_SIZE = 500
+KNOWLEDGE_CONTENT_CHUNK_ANCHOR_MODULUS = 4
+RESOLVE_COUNTER_COLUMNS = (
+    "resolve_requests",
+    "requests_with_hits",
+    "requests_with_rejections",
+    "selected_units",
+    "rejected_units",
+    "rejections",
+)
+RESOLVE_EXPIRED_REJECTION_REASONS = ("validation_expired", "validation_too_old")
+RESOLVE_AUDIT_COMPACT_DROPPED_KEYS = {"policy", "selected", "rejected"}
+KNOWLEDGE_SCAN_BATCH_SIZE = 200
+KNOWLEDGE_UNIT_BULK_COLUMNS = (
+    "id",
+    "source_id",
+    "unit_key",
+    "title",
+    "content",
+    "content_sha256",
+    "tags",
+    "agent_scope",
+    "risk_level",
+    "status",
+    "lifecycle_stage",
+    "superseded_by_unit_id",
+    "retired_at",
+    "meta",
+    "created_at",
+    "updated_at",
+)
 DEFAULT_VALIDATION_POLICIES: dict[str, dict] = {
     "low": {
         "strict_mode": False,
@@ -248,14 +362,6 @@ def _guess_mime_type(path: Path) -> str | None:
     return guessed
 
 
-def _sha256sum(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def _knowledge_source_row_to_out(row) -> KnowledgeSourceOut:
     return KnowledgeSourceOut(
         id=row.id,
@@ -274,6 +380,25 @@ def _knowledge_source_row_to_out(row) -> KnowledgeSourceOut:
     )
 
 
+def _knowledge_ingestion_job_row_to_out(row) -> KnowledgeIngestionJobOut:
+    return KnowledgeIngestionJobOut(
+        id=row.id,
+        job_type=row.job_type,
+        source_id=row.source_id,
+        status=row.status,
+        request=row.request or {},
+        stages=row.stages or {},
+        result=row.result,
+        error=row.error,
+        attempts=int(row.attempts or 0),
+        worker_id=row.worker_id,
+        created_at=row.created_at,
+        started_at=row.started_at,
+        finished_at=row.finished_at,
+        updated_at=row.updated_at,
+    )
+
+
 def _knowledge_unit_row_to_out(row) -> KnowledgeUnitOut:
     return KnowledgeUnitOut(
         id=row.id,
@@ -432,6 +557,33 @@ def _knowledge_lifecycle_event_row_to_out(row) -> KnowledgeLifecycleEventOut:
     )
 
 
+def _compact_resolve_audit_payload(payload: dict, *, full_detail: bool) -> dict:
+    rejected = payload.get("rejected") or []
+    reason_counts: dict[str, int] = {}
+    exemplars: list[dict] = []
+    for item in rejected:
+        if not isinstance(item, dict):
+            continue
+        reason = str(item.get("reason") or "unknown").strip() or "unknown"
+        if reason not in reason_counts:
+            exemplars.append(item)
+        reason_counts[reason] = reason_counts.get(reason, 0) + 1
+
+    if full_detail:
+        return {**payload, "rejected_reasons": reason_counts, "audit_detail": "full"}
+
+    compact = {key: value for key, value in payload.items() if key not in RESOLVE_AUDIT_COMPACT_DROPPED_KEYS}
+    compact["selected"] = [
+        {key: value for key, value in item.items() if key != "score_breakdown"}
+        for item in payload.get("selected") or []
+        if isinstance(item, dict)
+    ]
+    compact["rejected"] = exemplars
+    compact["rejected_reasons"] = reason_counts
+    compact["audit_detail"] = "compact"
+    return compact
+
+
 def _knowledge_resolve_audit_row_to_out(row) -> KnowledgeResolveAuditOut:
     return KnowledgeResolveAuditOut(
         id=row.id,
@@ -455,12 +607,11 @@ def _normalize_task_pattern(value: str | None) -> str | None:
     return pattern or None
 
 
-def _task_pattern_matches(pattern: str | None, task: str) -> bool:
+def _compile_task_pattern(pattern: str | None) -> re.Pattern | None:
     normalized = _normalize_task_pattern(pattern)
     if not normalized:
-        return True
-    escaped = re.escape(normalized).replace(r"\*", ".*")
-    return re.search(escaped, task, flags=re.IGNORECASE) is not None
+        return None
+    return re.compile(re.escape(normalized).replace(r"\*", ".*"), flags=re.IGNORECASE)
 
 
 def _rollout_bucket(task: str, agent_slug: str | None, source_type: str | None) -> int:
@@ -485,14 +636,37 @@ def _tokenize_text(value: str) -> set[str]:
     return {token for token in re.findall(r"[a-zA-Z0-9_\-]{2,}", str(value or "").lower())}
 
 
-def _compute_lexical_overlap(task: str, title: str, content: str, tags: list[str]) -> float:
-    query_tokens = _tokenize_text(task)
-    if not query_tokens:
-        return 0.0
-    doc_tokens = _tokenize_text(title) | _tokenize_text(content) | {str(tag).lower() for tag in (tags or [])}
-    if not doc_tokens:
-        return 0.0
-    return float(len(query_tokens & doc_tokens)) / float(len(query_tokens))
+def _lexical_tsquery_text(task: str) -> str:
+    terms = {
+        part
+        for token in _tokenize_text(task)
+        for part in re.split(r"[-_]+", token)
+        if len(part) >= 2
+    }
+    return " | ".join(sorted(terms))
+
+
+def _lexical_tsquery(query_text: str):
+    return sa.func.to_tsquery(sa.literal_column("'simple'::regconfig"), query_text)
+
+
+def _lexical_rank_expression(query_text: str):
+    return sa.func.ts_rank_cd(
+        knowledge_units.c.search_tsv,
+        _lexical_tsquery(query_text),
+        KNOWLEDGE_LEXICAL_RANK_NORMALIZATION,
+    )
+
+
+async def _load_lexical_ranks(session, unit_ids: list[UUID], query_text: str) -> dict[str, float]:
+    if not unit_ids or not query_text:
+        return {}
+    stmt = sa.select(
+        knowledge_units.c.id,
+        _lexical_rank_expression(query_text).label("lexical_rank"),
+    ).where(knowledge_units.c.id.in_(list(dict.fromkeys(unit_ids))))
+    rows = (await session.execute(stmt)).all()
+    return {str(row.id): float(row.lexical_rank or 0.0) for row in rows}
 
 
 def _lifecycle_score_adjustment(stage: str | None) -> float:
@@ -639,6 +813,7 @@ async def _record_policy_change_event(
     after_state: dict | None,
     now: datetime,
 ) -> None:
+    _bump_policy_snapshot_version()
     await session.execute(
         knowledge_validation_policy_change_events.insert().values(
             id=uuid4(),
@@ -793,7 +968,7 @@ async def _rollback_policy_entity(
     raise HTTPException(status_code=422, detail=f"unsupported rollback entity_type: {entity_type}")
 
 
-async def _select_policy_bundle(session, *, task: str, agent_slug: str | None, source_type: str | None) -> tuple[dict, dict | None]:
+async def _load_policy_snapshot(session) -> dict:
     default_bundle = await _ensure_default_policy_bundle(session)
     rollout_rows = (
         await session.execute(
@@ -828,20 +1003,109 @@ async def _select_policy_bundle(session, *, task: str, agent_slug: str | None, s
         )
     ).mappings().all()
 
-    bucket = _rollout_bucket(task, agent_slug, source_type)
+    rule_rows = (
+        await session.execute(
+            sa.select(
+                knowledge_validation_policy_rules.c.id,
+                knowledge_validation_policy_rules.c.bundle_id,
+                knowledge_validation_policy_rules.c.rule_key,
+                knowledge_validation_policy_rules.c.risk_level,
+                knowledge_validation_policy_rules.c.task_pattern,
+                knowledge_validation_policy_rules.c.agent_slug,
+                knowledge_validation_policy_rules.c.source_type,
+                knowledge_validation_policy_rules.c.priority,
+                knowledge_validation_policy_rules.c.enabled,
+                knowledge_validation_policy_rules.c.strict_mode,
+                knowledge_validation_policy_rules.c.require_validation,
+                knowledge_validation_policy_rules.c.require_approved,
+                knowledge_validation_policy_rules.c.require_not_expired,
+                knowledge_validation_policy_rules.c.min_confidence,
+                knowledge_validation_policy_rules.c.max_validation_age_days,
+                knowledge_validation_policy_rules.c.description,
+                knowledge_validation_policy_rules.c.created_at,
+                knowledge_validation_policy_rules.c.updated_at,
+            )
+            .where(knowledge_validation_policy_rules.c.enabled == sa.true())
+            .order_by(
+                knowledge_validation_policy_rules.c.priority.desc(),
+                knowledge_validation_policy_rules.c.updated_at.desc(),
+                knowledge_validation_policy_rules.c.created_at.desc(),
+            )
+        )
+    ).mappings().all()
+
+    policy_rows = (
+        await session.execute(
+            sa.select(
+                knowledge_validation_policies.c.risk_level,
+                knowledge_validation_policies.c.strict_mode,
+                knowledge_validation_policies.c.require_validation,
+                knowledge_validation_policies.c.require_approved,
+                knowledge_validation_policies.c.require_not_expired,
+                knowledge_validation_policies.c.min_confidence,
+                knowledge_validation_policies.c.max_validation_age_days,
+            )
+        )
+    ).mappings().all()
+
+    rollouts: list[dict] = []
     for row in rollout_rows:
         if not bool(row["bundle_enabled"]):
             continue
+        mode = str(row["rollout_mode"] or "full").strip().lower()
+        if mode not in KNOWLEDGE_POLICY_ROLLOUT_MODES:
+            continue
+        rollouts.append({**dict(row), "rollout_mode": mode, "task_regex": _compile_task_pattern(row["task_pattern"])})
+
+    rules_by_bundle_risk: dict[tuple[str, str], list[dict]] = {}
+    for row in rule_rows:
+        key = (str(row["bundle_id"]), str(row["risk_level"]))
+        rules_by_bundle_risk.setdefault(key, []).append(
+            {**dict(row), "task_regex": _compile_task_pattern(row["task_pattern"])}
+        )
+
+    risk_policies = {
+        str(row["risk_level"]): {key: value for key, value in dict(row).items() if key != "risk_level"}
+        for row in policy_rows
+    }
+    return {
+        "default_bundle": default_bundle,
+        "rollouts": rollouts,
+        "rules_by_bundle_risk": rules_by_bundle_risk,
+        "risk_policies": risk_policies,
+    }
+
+
+def _bump_policy_snapshot_version() -> int:
+    _POLICY_SNAPSHOT_CACHE["version"] = int(_POLICY_SNAPSHOT_CACHE["version"]) + 1
+    return int(_POLICY_SNAPSHOT_CACHE["version"])
+
+
+async def _get_policy_snapshot(session, *, cache_ttl_seconds: float) -> dict:
+    version = int(_POLICY_SNAPSHOT_CACHE["version"])
+    cached = _POLICY_SNAPSHOT_CACHE.get("snapshot")
+    age = time.time() - float(_POLICY_SNAPSHOT_CACHE.get("generated_at") or 0.0)
+    if cached is not None and _POLICY_SNAPSHOT_CACHE.get("loaded_version") == version and age < cache_ttl_seconds:
+        return cached
+
+    snapshot = await _load_policy_snapshot(session)
+    if int(_POLICY_SNAPSHOT_CACHE["version"]) == version:
+        _POLICY_SNAPSHOT_CACHE["snapshot"] = snapshot
+        _POLICY_SNAPSHOT_CACHE["loaded_version"] = version
+        _POLICY_SNAPSHOT_CACHE["generated_at"] = time.time()
+    return snapshot
+
+
+def _select_policy_bundle(snapshot: dict, *, task: str, agent_slug: str | None, source_type: str | None) -> tuple[dict, dict | None]:
+    bucket = _rollout_bucket(task, agent_slug, source_type)
+    for row in snapshot["rollouts"]:
         if row["target_agent_slug"] and row["target_agent_slug"] != agent_slug:
             continue
         if row["target_source_type"] and row["target_source_type"] != source_type:
             continue
-        if not _task_pattern_matches(row["task_pattern"], task):
-            continue
-        mode = str(row["rollout_mode"] or "full").strip().lower()
-        if mode not in KNOWLEDGE_POLICY_ROLLOUT_MODES:
+        if row["task_regex"] is not None and row["task_regex"].search(task) is None:
             continue
-        if mode == "percentage":
+        if row["rollout_mode"] == "percentage":
             percentage = int(row["rollout_percentage"] or 0)
             if percentage <= 0 or bucket >= percentage:
                 continue
@@ -852,9 +1116,9 @@ async def _select_policy_bundle(session, *, task: str, agent_slug: str | None, s
             "is_default": bool(row["is_default"]),
             "enabled": bool(row["bundle_enabled"]),
         }
-        return bundle, dict(row)
+        return bundle, {key: value for key, value in row.items() if key != "task_regex"}
 
-    return default_bundle, None
+    return snapshot["default_bundle"], None
 
 
 async def _resolve_validation_policy(
@@ -864,57 +1128,26 @@ async def _resolve_validation_policy(
     agent_slug: str | None,
     source_type: str | None,
     risk_level: str,
+    cache_ttl_seconds: float = 60.0,
 ) -> tuple[dict, dict]:
     normalized_risk = str(risk_level or "normal").strip().lower() or "normal"
-    bundle, rollout = await _select_policy_bundle(
-        session,
+    snapshot = await _get_policy_snapshot(session, cache_ttl_seconds=cache_ttl_seconds)
+    bundle, rollout = _select_policy_bundle(
+        snapshot,
         task=task,
         agent_slug=agent_slug,
         source_type=source_type,
     )
 
-    rule_rows = (
-        await session.execute(
-            sa.select(
-                knowledge_validation_policy_rules.c.id,
-                knowledge_validation_policy_rules.c.bundle_id,
-                knowledge_validation_policy_rules.c.rule_key,
-                knowledge_validation_policy_rules.c.risk_level,
-                knowledge_validation_policy_rules.c.task_pattern,
-                knowledge_validation_policy_rules.c.agent_slug,
-                knowledge_validation_policy_rules.c.source_type,
-                knowledge_validation_policy_rules.c.priority,
-                knowledge_validation_policy_rules.c.enabled,
-                knowledge_validation_policy_rules.c.strict_mode,
-                knowledge_validation_policy_rules.c.require_validation,
-                knowledge_validation_policy_rules.c.require_approved,
-                knowledge_validation_policy_rules.c.require_not_expired,
-                knowledge_validation_policy_rules.c.min_confidence,
-                knowledge_validation_policy_rules.c.max_validation_age_days,
-                knowledge_validation_policy_rules.c.description,
-                knowledge_validation_policy_rules.c.created_at,
-                knowledge_validation_policy_rules.c.updated_at,
-            )
-            .where(knowledge_validation_policy_rules.c.bundle_id == bundle["id"])
-            .where(knowledge_validation_policy_rules.c.risk_level == normalized_risk)
-            .where(knowledge_validation_policy_rules.c.enabled == sa.true())
-            .order_by(
-                knowledge_validation_policy_rules.c.priority.desc(),
-                knowledge_validation_policy_rules.c.updated_at.desc(),
-                knowledge_validation_policy_rules.c.created_at.desc(),
-            )
-        )
-    ).mappings().all()
-
     matching_rules: list[dict] = []
-    for row in rule_rows:
+    for row in snapshot["rules_by_bundle_risk"].get((str(bundle["id"]), normalized_risk), []):
         if row["agent_slug"] and row["agent_slug"] != agent_slug:
             continue
         if row["source_type"] and row["source_type"] != source_type:
             continue
-        if not _task_pattern_matches(row["task_pattern"], task):
+        if row["task_regex"] is not None and row["task_regex"].search(task) is None:
             continue
-        matching_rules.append(dict(row))
+        matching_rules.append(row)
 
     matching_rules.sort(
         key=lambda item: (
@@ -946,19 +1179,8 @@ async def _resolve_validation_policy(
         }
         return policy, metadata
 
-    policy_row = (
-        await session.execute(
-            sa.select(
-                knowledge_validation_policies.c.strict_mode,
-                knowledge_validation_policies.c.require_validation,
-                knowledge_validation_policies.c.require_approved,
-                knowledge_validation_policies.c.require_not_expired,
-                knowledge_validation_policies.c.min_confidence,
-                knowledge_validation_policies.c.max_validation_age_days,
-            ).where(knowledge_validation_policies.c.risk_level == normalized_risk)
-        )
-    ).first()
-    policy = dict(policy_row._mapping) if policy_row else _default_validation_policy(normalized_risk)
+    risk_policy = snapshot["risk_policies"].get(normalized_risk)
+    policy = dict(risk_policy) if risk_policy else _default_validation_policy(normalized_risk)
     metadata = {
         "policy_source": "risk_level_default",
         "bundle_id": str(bundle["id"]),
@@ -984,6 +1206,123 @@ async def _record_lifecycle_event(session, *, unit_id: UUID, action: str, actor:
     )
 
 
+async def _upsert_current_validation(session, *, validation_row, now: datetime) -> None:
+    lifecycle_stage = (
+        sa.select(knowledge_units.c.lifecycle_stage)
+        .where(knowledge_units.c.id == validation_row.unit_id)
+        .scalar_subquery()
+    )
+    stmt = pg_insert(knowledge_unit_current_validation).values(
+        unit_id=validation_row.unit_id,
+        validation_id=validation_row.id,
+        validator=validation_row.validator,
+        validation_status=validation_row.validation_status,
+        validated_at=validation_row.validated_at,
+        expires_at=validation_row.expires_at,
+        confidence=validation_row.confidence,
+        lifecycle_stage=lifecycle_stage,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[knowledge_unit_current_validation.c.unit_id],
+        set_={
+            "validation_id": stmt.excluded.validation_id,
+            "validator": stmt.excluded.validator,
+            "validation_status": stmt.excluded.validation_status,
+            "validated_at": stmt.excluded.validated_at,
+            "expires_at": stmt.excluded.expires_at,
+            "confidence": stmt.excluded.confidence,
+            "lifecycle_stage": stmt.excluded.lifecycle_stage,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=knowledge_unit_current_validation.c.validated_at <= stmt.excluded.validated_at,
+    )
+    await session.execute(stmt)
+
+
+async def _sync_current_validation_lifecycle(session, *, unit_id: UUID, lifecycle_stage: str, now: datetime) -> None:
+    await session.execute(
+        knowledge_unit_current_validation.update()
+        .where(knowledge_unit_current_validation.c.unit_id == unit_id)
+        .values(lifecycle_stage=lifecycle_stage, updated_at=now)
+    )
+
+
+async def _plan_incremental_chunks(
+    session,
+    *,
+    source_id: UUID,
+    chunk_list: list[str],
+) -> tuple[list[tuple[int, str, str]], int, list[UUID]]:
+    existing_rows = (
+        await session.execute(
+            sa.select(
+                knowledge_units.c.id,
+                knowledge_units.c.unit_key,
+                knowledge_units.c.content_sha256,
+                knowledge_units.c.status,
+            ).where(knowledge_units.c.source_id == source_id)
+        )
+    ).all()
+    reserved_keys = {str(row.unit_key) for row in existing_rows}
+    active_by_sha: dict[str, list[UUID]] = {}
+    for row in existing_rows:
+        if row.status == "active" and row.content_sha256:
+            active_by_sha.setdefault(str(row.content_sha256), []).append(row.id)
+
+    unchanged = 0
+    pending: list[tuple[int, str, str]] = []
+    for index, chunk in enumerate(chunk_list, start=1):
+        content_sha256 = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+        matches = active_by_sha.get(content_sha256)
+        if matches:
+            matches.pop()
+            unchanged += 1
+            continue
+        base_key = f"source:{source_id}:sha:{content_sha256[:16]}"
+        unit_key = base_key
+        occurrence = 1
+        while unit_key in reserved_keys:
+            occurrence += 1
+            unit_key = f"{base_key}:{occurrence}"
+        reserved_keys.add(unit_key)
+        pending.append((index, chunk, unit_key))
+
+    vanished_unit_ids = [unit_id for unit_ids in active_by_sha.values() for unit_id in unit_ids]
+    return pending, unchanged, vanished_unit_ids
+
+
+async def _retire_knowledge_units(
+    session,
+    *,
+    unit_ids: list[UUID],
+    actor: str,
+    payload: dict,
+    now: datetime,
+) -> None:
+    if not unit_ids:
+        return
+    id_filter = sa.any_(sa.bindparam("unit_ids", unit_ids, type_=sa.ARRAY(sa.Uuid)))
+    await session.execute(
+        knowledge_units.update()
+        .where(knowledge_units.c.id == id_filter)
+        .values(status="inactive", lifecycle_stage="archived", retired_at=now, updated_at=now)
+    )
+    await session.execute(
+        knowledge_unit_current_validation.update()
+        .where(knowledge_unit_current_validation.c.unit_id == id_filter)
+        .values(lifecycle_stage="archived", updated_at=now)
+    )
+    await session.execute(
+        knowledge_unit_lifecycle_events.insert().values(
+            [
+                {"id": uuid4(), "unit_id": unit_id, "action": "archive", "actor": actor, "payload": payload, "created_at": now}
+                for unit_id in unit_ids
+            ]
+        )
+    )
+
+
 def _split_text_chunks(content: str, *, chunk_chars: int, overlap: int, max_chunks: int) -> list[str]:
     text = str(content or "").strip()
     if not text:
@@ -1008,6 +1347,44 @@ def _split_text_chunks(content: str, *, chunk_chars: int, overlap: int, max_chun
     return [chunk for chunk in chunks if chunk]
 
 
+def _split_text_chunks_by_content(content: str, *, chunk_chars: int, max_chunks: int) -> list[str]:
+    text = str(content or "").strip()
+    if not text:
+        return []
+
+    size = min(max(int(chunk_chars or 1200), 200), 8000)
+    segments: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) > size:
+            segments.extend(
+                _split_text_chunks(paragraph, chunk_chars=size, overlap=0, max_chunks=len(paragraph) // 100 + 1)
+            )
+        else:
+            segments.append(paragraph)
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_chars = 0
+    for segment in segments:
+        if len(chunks) >= max_chunks:
+            break
+        if current and current_chars + len(segment) + 2 > size:
+            chunks.append("\n\n".join(current))
+            current, current_chars = [], 0
+        current_chars += len(segment) + (2 if current else 0)
+        current.append(segment)
+        segment_hash = int(hashlib.sha256(segment.encode("utf-8")).hexdigest()[:8], 16)
+        if current_chars >= size // 2 and segment_hash % KNOWLEDGE_CONTENT_CHUNK_ANCHOR_MODULUS == 0:
+            chunks.append("\n\n".join(current))
+            current, current_chars = [], 0
+    if current and len(chunks) < max_chunks:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
 def _risk_rank(level: str | None) -> int:
     return KNOWLEDGE_RISK_ORDER.get(str(level or "normal").strip().lower(), KNOWLEDGE_RISK_ORDER["normal"])
 
@@ -1067,70 +1444,94 @@ def _vector_cast_type(dimensions: int) -> str:
     return f"vector({normalized})"
 
 
-def _normalize_embedding(values: object, *, expected_dimensions: int | None) -> list[float]:
-    if not isinstance(values, list):
-        raise ValueError("embedding response item is not a list")
-    normalized = [float(value) for value in values]
-    if not normalized:
-        raise ValueError("embedding response item is empty")
-    if expected_dimensions is not None and len(normalized) != expected_dimensions:
-        raise ValueError(f"embedding dimensions mismatch: expected {expected_dimensions}, got {len(normalized)}")
-    if any(not math.isfinite(value) for value in normalized):
-        raise ValueError("embedding contains non-finite values")
-    return normalized
-
-
-async def _request_knowledge_embeddings(
-    texts: list[str],
-    *,
-    config: dict,
-) -> tuple[list[list[float]], str, int]:
-    headers = {"Content-Type": "application/json"}
-    api_key = str(config.get("api_key") or "").strip()
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
-    payload = {
-        "model": config["model"],
-        "input": texts,
-    }
-    url = f"{config['base_url']}/embeddings"
-
-    async with httpx.AsyncClient(timeout=config["timeout_seconds"]) as client:
-        response = await client.post(url, headers=headers, json=payload)
+def _query_embedding_cache_key(text: str, *, config: dict) -> str:
+    normalized = " ".join(str(text or "").split())
+    digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    dimensions = config.get("dimensions")
+    return f"{config['model']}|{int(dimensions) if dimensions is not None else 'auto'}|{digest}"
 
-    if response.status_code >= 400:
-        detail = response.text.strip()
-        raise ValueError(f"embedding request failed: status={response.status_code} detail={detail[:400]}")
 
-    body = response.json()
-    data = body.get("data")
-    if not isinstance(data, list) or len(data) != len(texts):
-        raise ValueError("embedding response data length mismatch")
-
-    vectors: list[list[float]] = []
-    actual_dimensions: int | None = None
-    for item in data:
-        if not isinstance(item, dict):
-            raise ValueError("embedding response item is not an object")
-        vector = _normalize_embedding(item.get("embedding"), expected_dimensions=config.get("dimensions"))
-        if actual_dimensions is None:
-            actual_dimensions = len(vector)
-        elif len(vector) != actual_dimensions:
-            raise ValueError("embedding response dimensions are inconsistent across items")
-        vectors.append(vector)
+def _store_query_embedding(key: str, entry: tuple[float, list[float], str, int], *, capacity: int) -> None:
+    _QUERY_EMBEDDING_CACHE[key] = entry
+    _QUERY_EMBEDDING_CACHE.move_to_end(key)
+    while len(_QUERY_EMBEDDING_CACHE) > capacity:
+        _QUERY_EMBEDDING_CACHE.popitem(last=False)
+        _QUERY_EMBEDDING_CACHE_STATS["evictions"] += 1
 
-    if actual_dimensions is None:
-        raise ValueError("embedding response returned no vectors")
 
-    model_name = str(body.get("model") or config["model"]).strip() or config["model"]
-    return vectors, model_name, actual_dimensions
+async def _request_query_embedding(
+    text: str,
+    *,
+    config: dict,
+    embedding_client: EmbeddingClient,
+    redis: Redis | None,
+    capacity: int,
+    ttl_seconds: float,
+) -> tuple[list[float], str, int]:
+    if capacity <= 0 or ttl_seconds <= 0:
+        return await embedding_client.embed_query(text, config=config)
+
+    key = _query_embedding_cache_key(text, config=config)
+    now_ts = time.time()
+    cached = _QUERY_EMBEDDING_CACHE.get(key)
+    if cached is not None:
+        if cached[0] > now_ts:
+            _QUERY_EMBEDDING_CACHE.move_to_end(key)
+            _QUERY_EMBEDDING_CACHE_STATS["memory_hits"] += 1
+            return list(cached[1]), cached[2], cached[3]
+        _QUERY_EMBEDDING_CACHE.pop(key, None)
+
+    if redis is not None:
+        try:
+            raw = await redis.get(QUERY_EMBEDDING_CACHE_REDIS_PREFIX + key)
+        except Exception:
+            raw = None
+        if raw:
+            try:
+                payload = json.loads(raw)
+                vector = normalize_embedding(payload.get("vector"), expected_dimensions=config.get("dimensions"))
+                model_name = str(payload.get("model") or config["model"])
+                entry = (now_ts + ttl_seconds, vector, model_name, len(vector))
+            except (ValueError, TypeError, AttributeError):
+                entry = None
+            if entry is not None:
+                _store_query_embedding(key, entry, capacity=capacity)
+                _QUERY_EMBEDDING_CACHE_STATS["redis_hits"] += 1
+                return list(entry[1]), entry[2], entry[3]
+
+    _QUERY_EMBEDDING_CACHE_STATS["misses"] += 1
+    vector, model_name, dimensions = await embedding_client.embed_query(text, config=config)
+    _store_query_embedding(key, (now_ts + ttl_seconds, vector, model_name, dimensions), capacity=capacity)
+    if redis is not None:
+        try:
+            await redis.set(
+                QUERY_EMBEDDING_CACHE_REDIS_PREFIX + key,
+                json.dumps({"vector": vector, "model": model_name}),
+                ex=max(int(ttl_seconds), 1),
+            )
+        except Exception:
+            pass
+    return list(vector), model_name, dimensions
 
 
 def _similarity_from_cosine_distance(distance: float) -> float:
     return max(min(1.0 - float(distance), 1.0), -1.0)
 
 
+async def _load_latest_validations(session, unit_ids: list[UUID]) -> dict[str, dict]:
+    if not unit_ids:
+        return {}
+    stmt = sa.select(
+        knowledge_unit_current_validation.c.unit_id,
+        knowledge_unit_current_validation.c.validation_status,
+        knowledge_unit_current_validation.c.expires_at,
+        knowledge_unit_current_validation.c.confidence,
+        knowledge_unit_current_validation.c.validated_at,
+    ).where(knowledge_unit_current_validation.c.unit_id.in_(list(dict.fromkeys(unit_ids))))
+    rows = (await session.execute(stmt)).mappings().all()
+    return {str(row["unit_id"]): dict(row) for row in rows}
+
+
 async def _search_knowledge_units_by_embedding(
     session,
     *,
@@ -1174,15 +1575,40 @@ async def _search_knowledge_units_by_embedding(
           kue.embedding_model,
           kue.embedding_dimensions,
           ((kue.embedding::""" + cast_type + """) <=> CAST(:query_embedding AS """ + cast_type + """)) AS distance
+        """
+    ]
+    if require_approved_validation:
+        sql_parts.append(
+            """
+            , kcv.validation_status AS latest_validation_status
+            , kcv.expires_at AS latest_validation_expires_at
+            , kcv.confidence AS latest_validation_confidence
+            , kcv.validated_at AS latest_validation_validated_at
+            """
+        )
+    sql_parts.append(
+        """
         FROM knowledge_unit_embeddings kue
         JOIN knowledge_units ku ON ku.id = kue.unit_id
                 LEFT JOIN knowledge_sources ks ON ks.id = ku.source_id
+        """
+    )
+    if require_approved_validation:
+        sql_parts.append(
+            """
+            JOIN knowledge_unit_current_validation kcv
+              ON kcv.unit_id = ku.id
+             AND kcv.validation_status = 'approved'
+            """
+        )
+    sql_parts.append(
+        """
         WHERE ku.status = 'active'
           AND kue.embedding_model = :embedding_model
           AND kue.embedding_dimensions = :embedding_dimensions
           AND ku.risk_level = ANY(:allowed_levels)
         """
-    ]
+    )
     params: dict[str, object] = {
         "query_embedding": _vector_literal(query_embedding),
         "embedding_model": embedding_model,
@@ -1205,23 +1631,6 @@ async def _search_knowledge_units_by_embedding(
         )
         params["agent_slug"] = agent_slug
 
-    if require_approved_validation:
-        sql_parts.append(
-            """
-            AND EXISTS (
-              SELECT 1
-              FROM (
-                SELECT kv.validation_status
-                FROM knowledge_validations kv
-                WHERE kv.unit_id = ku.id
-                ORDER BY kv.validated_at DESC
-                LIMIT 1
-              ) latest_validation
-              WHERE latest_validation.validation_status = 'approved'
-            )
-            """
-        )
-
     if tags:
         sql_parts.append("AND ku.tags && CAST(:tags AS text[])")
         params["tags"] = tags
@@ -1242,292 +1651,448 @@ def _coerce_row_mapping(row: object) -> dict:
     raise TypeError("unsupported row type")
 
 
-async def _upsert_knowledge_unit_embedding(
-    session,
-    *,
-    unit_id: UUID,
-    embedding_model: str,
-    embedding_dimensions: int,
-    content_sha256: str,
-    embedding_values: list[float],
-    meta: dict,
-    now: datetime,
-) -> None:
-    await session.execute(
-        sa.text(
-            """
-            INSERT INTO knowledge_unit_embeddings (
-              id,
-              unit_id,
-              embedding_model,
-              embedding_dimensions,
-              content_sha256,
-              embedding,
-              meta,
-              created_at,
-              updated_at
-            )
-            VALUES (
-              :id,
-              :unit_id,
-              :embedding_model,
-              :embedding_dimensions,
-              :content_sha256,
-              CAST(:embedding AS vector),
-              CAST(:meta AS jsonb),
-              :created_at,
-              :updated_at
-            )
-            ON CONFLICT (unit_id, embedding_model)
-            DO UPDATE SET
-              embedding_dimensions = EXCLUDED.embedding_dimensions,
-              content_sha256 = EXCLUDED.content_sha256,
-              embedding = EXCLUDED.embedding,
-              meta = EXCLUDED.meta,
-              updated_at = EXCLUDED.updated_at
-            """
-        ),
-        {
-            "id": uuid4(),
-            "unit_id": unit_id,
-            "embedding_model": embedding_model,
-            "embedding_dimensions": embedding_dimensions,
-            "content_sha256": content_sha256,
-            "embedding": _vector_literal(embedding_values),
-            "meta": json.dumps(meta, ensure_ascii=True),
-            "created_at": now,
-            "updated_at": now,
-        },
+async def _load_existing_unit_keys(session, unit_keys: list[str]) -> set[str]:
+    if not unit_keys:
+        return set()
+    rows = await session.execute(
+        sa.select(knowledge_units.c.unit_key).where(
+            knowledge_units.c.unit_key == sa.any_(sa.bindparam("unit_keys", unit_keys, type_=sa.ARRAY(sa.Text)))
+        )
     )
+    return {str(row.unit_key) for row in rows}
+
+
+async def _copy_knowledge_units(session, rows: list[dict]) -> bool:
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    copy_records = getattr(raw_connection.driver_connection, "copy_records_to_table", None)
+    if copy_records is None:
+        return False
+    await copy_records(
+        "knowledge_units",
+        columns=list(KNOWLEDGE_UNIT_BULK_COLUMNS),
+        records=[
+            tuple(json.dumps(row[column], ensure_ascii=False) if column == "meta" else row[column] for column in KNOWLEDGE_UNIT_BULK_COLUMNS)
+            for row in rows
+        ],
+    )
+    return True
 
 
-def _extract_plain_text(path: Path) -> tuple[str, str, list[str]]:
-    return path.read_text(encoding="utf-8", errors="replace"), "plain_text", []
-
-
-def _ocr_image_to_text(image, *, ocr_languages: str) -> str:
-    import pytesseract
-    from PIL import ImageOps
-
-    normalized = ImageOps.exif_transpose(image)
-    grayscale = ImageOps.grayscale(normalized)
-    return str(pytesseract.image_to_string(grayscale, lang=ocr_languages) or "").strip()
-
-
-def _extract_image_ocr_text(path: Path, *, ocr_languages: str) -> tuple[str, str, list[str], dict]:
-    from PIL import Image
+async def _insert_knowledge_units(session, rows: list[dict], *, copy_min_rows: int = 0) -> str:
+    if not rows:
+        return "none"
+    if copy_min_rows > 0 and len(rows) >= copy_min_rows and await _copy_knowledge_units(session, rows):
+        return "copy"
+    for start in range(0, len(rows), KNOWLEDGE_BULK_WRITE_BATCH_SIZE):
+        await session.execute(knowledge_units.insert().values(rows[start:start + KNOWLEDGE_BULK_WRITE_BATCH_SIZE]))
+    return "multi_values"
 
-    with Image.open(path) as image:
-        text = _ocr_image_to_text(image, ocr_languages=ocr_languages)
-    if not text:
-        raise ValueError("image OCR produced no text")
-    return text, "tesseract_ocr", [], {
-        "ocr_used": True,
-        "ocr_fallback_used": False,
-        "ocr_languages": ocr_languages,
-        "ocr_pages_processed": 1,
-        "ocr_pages_truncated": 0,
-    }
 
+async def _upsert_knowledge_unit_embeddings(session, rows: list[dict], *, now: datetime) -> None:
+    for start in range(0, len(rows), KNOWLEDGE_BULK_WRITE_BATCH_SIZE):
+        batch = rows[start:start + KNOWLEDGE_BULK_WRITE_BATCH_SIZE]
+        await session.execute(
+            sa.text(
+                """
+                INSERT INTO knowledge_unit_embeddings (
+                  id,
+                  unit_id,
+                  embedding_model,
+                  embedding_dimensions,
+                  content_sha256,
+                  embedding,
+                  meta,
+                  created_at,
+                  updated_at
+                )
+                SELECT
+                  item.id,
+                  item.unit_id,
+                  item.embedding_model,
+                  item.embedding_dimensions,
+                  item.content_sha256,
+                  CAST(item.embedding AS vector),
+                  CAST(item.meta AS jsonb),
+                  :now,
+                  :now
+                FROM unnest(
+                  CAST(:ids AS uuid[]),
+                  CAST(:unit_ids AS uuid[]),
+                  CAST(:embedding_models AS text[]),
+                  CAST(:embedding_dimensions AS integer[]),
+                  CAST(:content_sha256s AS text[]),
+                  CAST(:embeddings AS text[]),
+                  CAST(:metas AS text[])
+                ) AS item(id, unit_id, embedding_model, embedding_dimensions, content_sha256, embedding, meta)
+                ON CONFLICT (unit_id, embedding_model)
+                DO UPDATE SET
+                  embedding_dimensions = EXCLUDED.embedding_dimensions,
+                  content_sha256 = EXCLUDED.content_sha256,
+                  embedding = EXCLUDED.embedding,
+                  meta = EXCLUDED.meta,
+                  updated_at = EXCLUDED.updated_at
+                """
+            ),
+            {
+                "ids": [uuid4() for _ in batch],
+                "unit_ids": [row["unit_id"] for row in batch],
+                "embedding_models": [row["embedding_model"] for row in batch],
+                "embedding_dimensions": [int(row["embedding_dimensions"]) for row in batch],
+                "content_sha256s": [row["content_sha256"] for row in batch],
+                "embeddings": [_vector_literal(row["embedding_values"]) for row in batch],
+                "metas": [json.dumps(row["meta"], ensure_ascii=True) for row in batch],
+                "now": now,
+            },
+        )
 
-def _extract_pdf_ocr_text(path: Path, *, ocr_languages: str, max_pdf_pages: int) -> tuple[str, str, list[str], dict]:
-    from pdf2image import convert_from_path
-    from pypdf import PdfReader
 
-    page_total = len(PdfReader(str(path)).pages)
-    pages_to_process = min(page_total, max_pdf_pages)
-    images = convert_from_path(str(path), dpi=150, first_page=1, last_page=pages_to_process)
-    parts: list[str] = []
-    warnings: list[str] = []
+async def _cancel_on_disconnect(request: Request, coro, *, poll_interval_seconds: float = 1.0):
+    task = asyncio.create_task(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval_seconds)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise HTTPException(status_code=499, detail="client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _chunk_knowledge_source(
+    session,
+    *,
+    settings: Settings,
+    embedding_client: EmbeddingClient,
+    extraction_executor: ExtractionExecutor,
+    embedding_config: dict | None,
+    source_id: UUID,
+    body: KnowledgeSourceChunkIn,
+    on_stage=None,
+) -> KnowledgeSourceChunkOut:
+    async def report_stage(stage: str, status: str, **detail) -> None:
+        if on_stage is not None:
+            await on_stage(stage, status, detail)
+
+    source_row = (
+        await session.execute(
+            sa.select(
+                knowledge_sources.c.id,
+                knowledge_sources.c.storage_path,
+                knowledge_sources.c.title,
+                knowledge_sources.c.source_type,
+                knowledge_sources.c.checksum_sha256,
+                knowledge_sources.c.meta,
+            ).where(knowledge_sources.c.id == source_id)
+        )
+    ).first()
+    if not source_row:
+        raise HTTPException(status_code=404, detail="knowledge source not found")
+
+    root = Path(settings.knowledge_raw_sources_dir).resolve()
+    source_path = _safe_resolve_under(root, source_row.storage_path)
+    if not source_path.exists() or not source_path.is_file():
+        raise HTTPException(status_code=422, detail="knowledge source file not found")
+
+    source_checksum: str | None = None
+    source_changed: bool | None = None
+    if body.incremental:
+        source_checksum = await extraction_executor.sha256sum(source_path)
+        chunked_checksum = (source_row.meta or {}).get("chunked_checksum_sha256")
+        source_changed = source_checksum != (chunked_checksum or source_row.checksum_sha256)
+        if chunked_checksum == source_checksum and not body.force:
+            unchanged_units = (
+                await session.execute(
+                    sa.select(sa.func.count())
+                    .select_from(knowledge_units)
+                    .where(knowledge_units.c.source_id == source_id, knowledge_units.c.status == "active")
+                )
+            ).scalar_one()
+            for stage in KNOWLEDGE_INGESTION_STAGES:
+                await report_stage(stage, "skipped", reason="source_unchanged")
+            return KnowledgeSourceChunkOut(
+                source_id=source_id,
+                scanned_chars=0,
+                chunks_total=int(unchanged_units),
+                created=0,
+                skipped_existing=0,
+                unchanged=int(unchanged_units),
+                incremental=True,
+                source_changed=False,
+                dry_run=body.dry_run,
+            )
 
-    for index, image in enumerate(images, start=1):
-        page_text = _ocr_image_to_text(image, ocr_languages=ocr_languages)
-        if page_text:
-            parts.append(page_text)
-        else:
-            warnings.append(f"ocr_page_{index}_no_text")
+    ocr_languages = _normalize_ocr_languages(body.ocr_languages)
+    max_pdf_pages = _normalize_max_pdf_pages(body.max_pdf_pages)
 
-    pages_truncated = max(page_total - pages_to_process, 0)
-    if pages_truncated > 0:
-        warnings.append("ocr_pdf_page_limit_applied")
+    await report_stage("extract", "running")
+    try:
+        raw_text, extraction_method, extraction_warnings, extraction_meta = await extraction_executor.extract_source_text(
+            source_path,
+            ocr_enabled=body.ocr_enabled,
+            ocr_languages=ocr_languages,
+            max_pdf_pages=max_pdf_pages,
+        )
+    except Exception as exc:
+        now = datetime.utcnow()
+        source_meta = dict(source_row.meta or {})
+        source_meta.update(
+            {
+                "parse_status": "failed",
+                "parse_error": str(exc),
+                "ocr_enabled": bool(body.ocr_enabled),
+                "ocr_languages": ocr_languages,
+                "max_pdf_pages": max_pdf_pages,
+                "ocr_used": source_path.suffix.lower().lstrip(".") in KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS,
+                "ocr_fallback_used": False,
+            }
+        )
+        await session.execute(
+            knowledge_sources.update()
+            .where(knowledge_sources.c.id == source_id)
+            .values(
+                meta=source_meta,
+                updated_at=now,
+            )
+        )
+        await session.commit()
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    await report_stage("extract", "succeeded", parser=extraction_method, text_chars=len(raw_text))
 
-    text = "\n\n".join(parts).strip()
-    if not text:
-        raise ValueError("scanned pdf OCR produced no text")
-    return text, "pypdf+tesseract_ocr", warnings, {
-        "ocr_used": True,
-        "ocr_fallback_used": True,
-        "ocr_languages": ocr_languages,
-        "ocr_pages_processed": pages_to_process,
-        "ocr_pages_truncated": pages_truncated,
-    }
+    await report_stage("chunk", "running")
+    max_chunks = min(max(int(body.max_chunks or 200), 1), 1000)
+    if body.incremental:
+        chunk_list = _split_text_chunks_by_content(raw_text, chunk_chars=body.chunk_chars, max_chunks=max_chunks)
+    else:
+        chunk_list = _split_text_chunks(
+            raw_text,
+            chunk_chars=body.chunk_chars,
+            overlap=body.chunk_overlap,
+            max_chunks=max_chunks,
+        )
+    now = datetime.utcnow()
+    created = 0
+    skipped_existing = 0
+    unchanged = 0
+    vanished_unit_ids: list[UUID] = []
+    items: list[KnowledgeUnitOut] = []
+    embedding_failed_count = 0
+    embedding_status = "disabled"
+    embedding_error: str | None = None
+    embedding_model_name: str | None = None
+    embedding_dimensions: int | None = None
+
+    if body.incremental:
+        pending_chunks, unchanged, vanished_unit_ids = await _plan_incremental_chunks(
+            session,
+            source_id=source_id,
+            chunk_list=chunk_list,
+        )
+        if len(chunk_list) >= max_chunks and vanished_unit_ids:
+            extraction_warnings = [*extraction_warnings, "incremental_retire_skipped_chunk_limit"]
+            vanished_unit_ids = []
+    else:
+        pending_chunks = [
+            (index, chunk, f"source:{source_id}:chunk:{index:04d}") for index, chunk in enumerate(chunk_list, start=1)
+        ]
+    existing_unit_keys = await _load_existing_unit_keys(session, [unit_key for _, _, unit_key in pending_chunks])
+    for index, chunk, unit_key in pending_chunks:
+        if unit_key in existing_unit_keys:
+            skipped_existing += 1
+            continue
 
+        unit_out = KnowledgeUnitOut(
+            id=uuid4(),
+            source_id=source_id,
+            unit_key=unit_key,
+            title=f"{source_row.title} #{index}",
+            content=chunk,
+            content_sha256=hashlib.sha256(chunk.encode("utf-8")).hexdigest(),
+            tags=list({*body.tags, "auto-chunk"}),
+            agent_scope=body.agent_scope,
+            risk_level=(body.risk_level or "normal").strip().lower() or "normal",
+            status="active",
+            lifecycle_stage="active",
+            meta={
+                "generated_by": "source_chunker",
+                "chunk_index": index,
+                "source_storage_path": source_row.storage_path,
+                "owner": body.owner,
+            },
+            created_at=now,
+            updated_at=now,
+        )
+        if body.incremental:
+            unit_out.meta["source_checksum_sha256"] = source_checksum
+        items.append(unit_out)
+        created += 1
+    await report_stage(
+        "chunk",
+        "succeeded",
+        chunks_total=len(chunk_list),
+        new_units=created,
+        skipped_existing=skipped_existing,
+        unchanged=unchanged if body.incremental else None,
+        vanished=len(vanished_unit_ids) if body.incremental else None,
+    )
 
-def _extract_pdf_text(path: Path, *, ocr_enabled: bool, ocr_languages: str, max_pdf_pages: int) -> tuple[str, str, list[str], dict]:
-    from pypdf import PdfReader
+    await report_stage("embed", "running", units=len(items))
+    embedding_vectors: list[list[float]] = []
+    if body.dry_run:
+        embedding_status = "skipped_dry_run"
+    elif not embedding_config:
+        embedding_status = "disabled"
+    elif not items:
+        embedding_status = "skipped_no_new_units"
+        embedding_model_name = str(embedding_config["model"])
+        if embedding_config.get("dimensions") is not None:
+            embedding_dimensions = int(embedding_config["dimensions"])
+    else:
+        try:
+            embedding_vectors, embedding_model_name, embedding_dimensions = await embedding_client.embed_many(
+                [item.content for item in items],
+                config=embedding_config,
+            )
+            embedding_status = "success"
+        except Exception as exc:
+            embedding_status = "failed"
+            embedding_error = str(exc)
+            embedding_failed_count = len(items)
+            embedding_model_name = str(embedding_config["model"])
+    await report_stage(
+        "embed",
+        "failed" if embedding_status == "failed" else "succeeded" if embedding_status == "success" else "skipped",
+        embedding_status=embedding_status,
+        vectors=len(embedding_vectors),
+        error=embedding_error,
+    )
 
-    reader = PdfReader(str(path))
-    parts: list[str] = []
-    warnings: list[str] = []
+    await report_stage("persist", "running", units=len(items))
+    persist_started = time.perf_counter()
+    unit_rows: list[dict] = []
+    embedding_rows: list[dict] = []
+    for index, unit_out in enumerate(items):
+        unit_meta = dict(unit_out.meta or {})
+        unit_meta.update(
+            {
+                "embedding_enabled": bool(embedding_config),
+                "embedding_status": embedding_status,
+            }
+        )
+        if embedding_model_name:
+            unit_meta["embedding_model"] = embedding_model_name
+        if embedding_dimensions is not None:
+            unit_meta["embedding_dimensions"] = embedding_dimensions
+        if embedding_error:
+            unit_meta["embedding_error"] = embedding_error
+        if embedding_vectors:
+            unit_meta["embedding_updated_at"] = now.isoformat() + "Z"
+        unit_out.meta = unit_meta
+
+        unit_rows.append({column: getattr(unit_out, column) for column in KNOWLEDGE_UNIT_BULK_COLUMNS})
+        if embedding_vectors:
+            embedding_rows.append(
+                {
+                    "unit_id": unit_out.id,
+                    "embedding_model": str(embedding_model_name or embedding_config["model"]),
+                    "embedding_dimensions": int(embedding_dimensions or len(embedding_vectors[index])),
+                    "content_sha256": unit_out.content_sha256 or "",
+                    "embedding_values": embedding_vectors[index],
+                    "meta": {
+                        "source_id": str(source_id),
+                        "unit_key": unit_out.unit_key,
+                        "generated_by": "knowledge_chunk_embedding",
+                    },
+                }
+            )
 
-    for index, page in enumerate(reader.pages, start=1):
-        page_text = (page.extract_text() or "").strip()
-        if page_text:
-            parts.append(page_text)
-        else:
-            warnings.append(f"page_{index}_no_text")
+    unit_write_mode = "skipped_dry_run"
+    if not body.dry_run:
+        unit_write_mode = await _insert_knowledge_units(
+            session,
+            unit_rows,
+            copy_min_rows=int(settings.knowledge_chunk_copy_min_rows),
+        )
+        await _upsert_knowledge_unit_embeddings(session, embedding_rows, now=now)
+        await _retire_knowledge_units(
+            session,
+            unit_ids=vanished_unit_ids,
+            actor="source_rechunk",
+            payload={"reason": "chunk_removed_from_source", "source_id": str(source_id), "source_checksum_sha256": source_checksum},
+            now=now,
+        )
 
-    text = "\n\n".join(parts).strip()
-    if len(text) >= KNOWLEDGE_PDF_TEXT_MIN_CHARS:
-        return text, "pypdf", warnings, {
-            "ocr_used": False,
-            "ocr_fallback_used": False,
+    source_meta_update = dict(source_row.meta or {})
+    source_meta_update.update(
+        {
+            "parse_status": "success",
+            "parse_error": None,
+            "parser": extraction_method,
+            "text_chars": len(raw_text),
+            "extraction_warnings": extraction_warnings,
+            "ocr_enabled": bool(body.ocr_enabled),
             "ocr_languages": ocr_languages,
-            "ocr_pages_processed": 0,
-            "ocr_pages_truncated": 0,
+            "max_pdf_pages": max_pdf_pages,
+            "embedding_enabled": bool(embedding_config),
+            "embedding_status": embedding_status,
+            "embedding_model": embedding_model_name,
+            "embedding_dimensions": embedding_dimensions,
+            "embedding_created_count": len(embedding_vectors),
+            "embedding_failed_count": embedding_failed_count,
+            "embedding_updated_at": now.isoformat() + "Z" if embedding_vectors else None,
+            "embedding_error": embedding_error,
+            **extraction_meta,
         }
-
-    if not ocr_enabled:
-        raise ValueError("pdf text layer is insufficient and OCR is disabled for this request")
-
-    ocr_text, parser, ocr_warnings, ocr_meta = _extract_pdf_ocr_text(
-        path,
-        ocr_languages=ocr_languages,
-        max_pdf_pages=max_pdf_pages,
     )
-    combined_warnings = list(warnings)
-    combined_warnings.append("pdf_text_layer_insufficient_fallback_to_ocr")
-    combined_warnings.extend(ocr_warnings)
-    return ocr_text, parser, combined_warnings, ocr_meta
-
-
-def _extract_docx_text(path: Path) -> tuple[str, str, list[str]]:
-    from docx import Document
-
-    doc = Document(str(path))
-    parts: list[str] = []
-
-    for paragraph in doc.paragraphs:
-        text = str(paragraph.text or "").strip()
-        if text:
-            parts.append(text)
-
-    for table in doc.tables:
-        for row in table.rows:
-            cells = [str(cell.text or "").strip() for cell in row.cells]
-            line = " | ".join(cell for cell in cells if cell)
-            if line:
-                parts.append(line)
-
-    text = "\n".join(parts).strip()
-    if not text:
-        raise ValueError("docx has no extractable text")
-    return text, "python-docx", []
-
-
-def _extract_pptx_text(path: Path) -> tuple[str, str, list[str]]:
-    from pptx import Presentation
-
-    presentation = Presentation(str(path))
-    parts: list[str] = []
-
-    for slide_index, slide in enumerate(presentation.slides, start=1):
-        slide_parts: list[str] = []
-        for shape in slide.shapes:
-            text = str(getattr(shape, "text", "") or "").strip()
-            if text:
-                slide_parts.append(text)
-        if slide_parts:
-            parts.append(f"[slide {slide_index}]\n" + "\n".join(slide_parts))
-
-    text = "\n\n".join(parts).strip()
-    if not text:
-        raise ValueError("pptx has no extractable text")
-    return text, "python-pptx", []
-
-
-def _extract_xlsx_text(path: Path) -> tuple[str, str, list[str]]:
-    from openpyxl import load_workbook
-
-    workbook = load_workbook(filename=str(path), read_only=True, data_only=True)
-    parts: list[str] = []
-    warnings: list[str] = []
-
-    for sheet in workbook.worksheets:
-        sheet_lines: list[str] = []
-        for row in sheet.iter_rows(values_only=True):
-            values = [str(value).strip() for value in row if value not in (None, "")]
-            if values:
-                sheet_lines.append("\t".join(values))
-        if sheet_lines:
-            parts.append(f"[sheet {sheet.title}]\n" + "\n".join(sheet_lines))
-        else:
-            warnings.append(f"sheet_{sheet.title}_empty")
-
-    text = "\n\n".join(parts).strip()
-    if not text:
-        raise ValueError("xlsx has no extractable text")
-    return text, "openpyxl", warnings
+    source_values: dict[str, object] = {"meta": source_meta_update, "updated_at": now}
+    if body.incremental:
+        source_meta_update.update(
+            {
+                "incremental_unchanged_count": unchanged,
+                "incremental_created_count": created,
+                "incremental_retired_count": len(vanished_unit_ids),
+                "incremental_updated_at": now.isoformat() + "Z",
+            }
+        )
+        if embedding_status != "failed":
+            source_meta_update["chunked_checksum_sha256"] = source_checksum
+        source_values["checksum_sha256"] = source_checksum
+    await session.execute(
+        knowledge_sources.update()
+        .where(knowledge_sources.c.id == source_id)
+        .values(**source_values)
+    )
 
+    if not body.dry_run:
+        await session.commit()
+    persist_seconds = time.perf_counter() - persist_started
+    persisted_rows = 0 if body.dry_run else len(unit_rows) + len(embedding_rows)
+    await report_stage(
+        "persist",
+        "skipped" if body.dry_run else "succeeded",
+        units=0 if body.dry_run else len(unit_rows),
+        embeddings=0 if body.dry_run else len(embedding_rows),
+        write_mode=unit_write_mode,
+        rows_per_second=round(persisted_rows / persist_seconds, 1) if persisted_rows and persist_seconds > 0 else None,
+    )
 
-def _extract_source_text(
-    path: Path,
-    *,
-    ocr_enabled: bool,
-    ocr_languages: str,
-    max_pdf_pages: int,
-) -> tuple[str, str, list[str], dict]:
-    ext = path.suffix.lower().lstrip(".")
-    if ext in KNOWLEDGE_TEXT_EXTENSIONS:
-        text, parser, warnings = _extract_plain_text(path)
-        return text, parser, warnings, {
-            "ocr_used": False,
-            "ocr_fallback_used": False,
-            "ocr_languages": ocr_languages,
-            "ocr_pages_processed": 0,
-            "ocr_pages_truncated": 0,
-        }
-    if ext == "pdf":
-        return _extract_pdf_text(
-            path,
-            ocr_enabled=ocr_enabled,
-            ocr_languages=ocr_languages,
-            max_pdf_pages=max_pdf_pages,
-        )
-    if ext == "docx":
-        text, parser, warnings = _extract_docx_text(path)
-        return text, parser, warnings, {
-            "ocr_used": False,
-            "ocr_fallback_used": False,
-            "ocr_languages": ocr_languages,
-            "ocr_pages_processed": 0,
-            "ocr_pages_truncated": 0,
-        }
-    if ext == "pptx":
-        text, parser, warnings = _extract_pptx_text(path)
-        return text, parser, warnings, {
-            "ocr_used": False,
-            "ocr_fallback_used": False,
-            "ocr_languages": ocr_languages,
-            "ocr_pages_processed": 0,
-            "ocr_pages_truncated": 0,
-        }
-    if ext == "xlsx":
-        text, parser, warnings = _extract_xlsx_text(path)
-        return text, parser, warnings, {
-            "ocr_used": False,
-            "ocr_fallback_used": False,
-            "ocr_languages": ocr_languages,
-            "ocr_pages_processed": 0,
-            "ocr_pages_truncated": 0,
-        }
-    if ext in {"png", "jpg", "jpeg", "webp"}:
-        if not ocr_enabled:
-            raise ValueError(f"{ext} requires OCR but OCR is disabled for this request")
-        return _extract_image_ocr_text(path, ocr_languages=ocr_languages)
-    if ext in KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS:
-        raise ValueError(f"unsupported OCR candidate extension for current implementation: {ext}")
-    raise ValueError(f"unsupported source extension for chunking: {ext}")
+    return KnowledgeSourceChunkOut(
+        source_id=source_id,
+        scanned_chars=len(raw_text),
+        chunks_total=len(chunk_list),
+        created=created,
+        skipped_existing=skipped_existing,
+        unchanged=unchanged,
+        retired=len(vanished_unit_ids),
+        incremental=body.incremental,
+        source_changed=source_changed,
+        dry_run=body.dry_run,
+        items=items[: min(len(items), 200)],
+    )
 
 
 def _rewrite_avatar_paths(obj, agent: str):
@@ -1593,6 +2158,58 @@ def _build_chat_inject_script(
     return "".join(parts)
 
 
+def _inject_chat_html(text: str, inject_script: str, *, dom_avatar_rewrite: bool) -> str:
+    if 'window.__OPENCLAW_CONTROL_UI_BASE_PATH__="";' in text:
+        text = text.replace('window.__OPENCLAW_CONTROL_UI_BASE_PATH__="";', inject_script)
+    else:
+        injected = f"<script>{inject_script}</script>"
+        if '<script type="module"' in text:
+            text = text.replace('<script type="module"', f"{injected}<script type=\"module\"", 1)
+        elif "</head>" in text:
+            text = text.replace("</head>", f"{injected}</head>", 1)
+        elif "<body>" in text:
+            text = text.replace("<body>", f"<body>{injected}", 1)
+        else:
+            text = f"{injected}{text}"
+    if dom_avatar_rewrite:
+        text = CHAT_HTML_AVATAR_RE.sub('window.__OPENCLAW_ASSISTANT_AVATAR__=""', text)
+    return text
+
+
+def _parse_etag_values(header: str | None) -> set[str]:
+    values = set()
+    for part in str(header or "").split(","):
+        value = part.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        if value:
+            values.add(value)
+    return values
+
+
+def _chat_html_cache_get(key: tuple) -> tuple[str, str | None, bytes] | None:
+    entry = _CHAT_HTML_CACHE.get(key)
+    if entry is not None:
+        _CHAT_HTML_CACHE.move_to_end(key)
+    return entry
+
+
+def _chat_html_cache_put(key: tuple, upstream_etag: str | None, body: bytes) -> tuple[str, str | None, bytes]:
+    entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', upstream_etag, body)
+    _CHAT_HTML_CACHE[key] = entry
+    _CHAT_HTML_CACHE.move_to_end(key)
+    while len(_CHAT_HTML_CACHE) > CHAT_HTML_CACHE_MAX_ENTRIES:
+        _CHAT_HTML_CACHE.popitem(last=False)
+    return entry
+
+
+def _chat_html_revalidation_etag(agent: str, flags: tuple, client_etags: set[str]) -> tuple[str, str] | None:
+    for key, (etag, upstream_etag, _) in reversed(_CHAT_HTML_CACHE.items()):
+        if key[0] == agent and key[2:] == flags and upstream_etag and etag in client_etags:
+            return etag, upstream_etag
+    return None
+
+
 def _normalize_control_ui_origin(origin: str | None) -> str | None:
     if not origin:
         return None
@@ -1747,9 +2364,12 @@ def _parse_skill_frontmatter(skill_file: Path, fallback_slug: str) -> tuple[str,
     return name, description
 
 
-def _skill_item_from_file(skill_file: Path, *, scope: str) -> SkillItem:
+def _skill_item_from_file(skill_file: Path, *, scope: str, memo: FileMemo | None = None) -> SkillItem:
     slug = skill_file.parent.name
-    name, description = _parse_skill_frontmatter(skill_file, slug)
+    if memo is not None:
+        name, description = memo.load(skill_file, lambda path: _parse_skill_frontmatter(path, slug))
+    else:
+        name, description = _parse_skill_frontmatter(skill_file, slug)
     return SkillItem(
         slug=slug,
         name=name,
@@ -1759,18 +2379,22 @@ def _skill_item_from_file(skill_file: Path, *, scope: str) -> SkillItem:
     )
 
 
-def _scan_global_skills(settings: Settings) -> list[SkillItem]:
+def _scan_global_skills(settings: Settings, memo: FileMemo | None = None) -> list[SkillItem]:
     root = Path(settings.global_skills_dir)
     if not root.exists() or not root.is_dir():
         return []
 
     out: list[SkillItem] = []
     for skill_file in sorted(root.glob("*/SKILL.md")):
-        out.append(_skill_item_from_file(skill_file, scope="global"))
+        out.append(_skill_item_from_file(skill_file, scope="global", memo=memo))
     return out
 
 
-def _scan_workspace_skills(settings: Settings, agent_slug: str | None = None) -> list[WorkspaceSkillGroup]:
+def _scan_workspace_skills(
+    settings: Settings,
+    agent_slug: str | None = None,
+    memo: FileMemo | None = None,
+) -> list[WorkspaceSkillGroup]:
     root = Path(settings.agent_homes_dir)
     if not root.exists() or not root.is_dir():
         return []
@@ -1787,7 +2411,7 @@ def _scan_workspace_skills(settings: Settings, agent_slug: str | None = None) ->
         skill_items: list[SkillItem] = []
         if skills_dir.exists() and skills_dir.is_dir():
             for skill_file in sorted(skills_dir.glob("*/SKILL.md")):
-                skill_items.append(_skill_item_from_file(skill_file, scope="workspace"))
+                skill_items.append(_skill_item_from_file(skill_file, scope="workspace", memo=memo))
 
         groups.append(WorkspaceSkillGroup(agent_slug=slug, skills=skill_items))
     return groups
@@ -1855,10 +2479,12 @@ def _resolve_runtime_dir(settings: Settings, agent_slug: str, raw_path: str) ->
     return candidate.resolve(strict=False)
 
 
-def _load_agent_runtime_payload(settings: Settings, agent_slug: str) -> tuple[dict, bool, str | None]:
+def _load_agent_runtime_payload(settings: Settings, agent_slug: str, memo: FileMemo | None = None) -> tuple[dict, bool, str | None]:
     config_path = _agent_config_path(settings, agent_slug)
     if not config_path.exists() or not config_path.is_file():
         return {}, False, None
+    if memo is not None:
+        return memo.load(config_path, lambda _: _load_agent_runtime_payload(settings, agent_slug))
 
     try:
         payload = json.loads(config_path.read_text(encoding="utf-8"))
@@ -1891,17 +2517,17 @@ def _runtime_config_from_payload(settings: Settings, agent_slug: str, payload: d
     )
 
 
-def _scan_skill_directory_root(root: Path, *, scope: str) -> list[SkillItem]:
+def _scan_skill_directory_root(root: Path, *, scope: str, memo: FileMemo | None = None) -> list[SkillItem]:
     if not root.exists() or not root.is_dir():
         return []
 
     out: list[SkillItem] = []
     direct_skill_file = root / "SKILL.md"
     if direct_skill_file.exists() and direct_skill_file.is_file():
-        out.append(_skill_item_from_file(direct_skill_file, scope=scope))
+        out.append(_skill_item_from_file(direct_skill_file, scope=scope, memo=memo))
 
     for skill_file in sorted(root.glob("*/SKILL.md")):
-        out.append(_skill_item_from_file(skill_file, scope=scope))
+        out.append(_skill_item_from_file(skill_file, scope=scope, memo=memo))
 
     deduped: list[SkillItem] = []
     seen: set[tuple[str, str]] = set()
@@ -1920,6 +2546,7 @@ def _scan_runtime_skill_items(
     runtime_config: AgentSkillRuntimeConfigOut,
     *,
     parse_error: str | None = None,
+    memo: FileMemo | None = None,
 ) -> tuple[list[SkillItem], list[SkillsDriftItem]]:
     drifts: list[SkillsDriftItem] = []
 
@@ -1962,7 +2589,7 @@ def _scan_runtime_skill_items(
             )
             continue
 
-        discovered = _scan_skill_directory_root(resolved, scope="runtime")
+        discovered = _scan_skill_directory_root(resolved, scope="runtime", memo=memo)
         if not discovered:
             drifts.append(
                 SkillsDriftItem(
@@ -1988,51 +2615,12 @@ def _scan_runtime_skill_items(
     return deduped, drifts
 
 
-def _scan_agent_slugs(settings: Settings) -> list[str]:
-    root = Path(settings.agent_homes_dir)
-    if not root.exists() or not root.is_dir():
-        return []
-    return sorted(path.name for path in root.iterdir() if path.is_dir())
-
-
-def _known_agent_slugs(settings: Settings) -> set[str]:
-    root = Path(settings.agent_homes_dir)
-    if not root.exists() or not root.is_dir():
-        return set()
-    return {path.name for path in root.iterdir() if path.is_dir()}
-
-
-def _agent_label_map(settings: Settings) -> dict[str, str]:
-    labels: dict[str, str] = {}
-    for item in build_agent_catalog(settings):
-        slug = str(item.get("slug") or "").strip()
-        if slug:
-            labels[slug] = str(item.get("label") or slug).strip() or slug
-    return labels
-
-
-def _ordered_agent_slugs(settings: Settings, extra_slugs: list[str] | None = None) -> list[str]:
-    ordered: list[str] = []
-    seen: set[str] = set()
-
-    for item in build_agent_catalog(settings):
-        slug = str(item.get("slug") or "").strip()
-        if slug and slug not in seen:
-            seen.add(slug)
-            ordered.append(slug)
-
-    for slug in _scan_agent_slugs(settings):
-        if slug not in seen:
-            seen.add(slug)
-            ordered.append(slug)
-
-    for slug in extra_slugs or []:
-        normalized = str(slug or "").strip()
-        if normalized and normalized not in seen:
-            seen.add(normalized)
-            ordered.append(normalized)
-
-    return ordered
+async def _iter_upstream_body(resp: httpx.Response):
+    try:
+        async for chunk in resp.aiter_raw():
+            yield chunk
+    finally:
+        await resp.aclose()
 
 
 async def _fetch_skill_mapping_rows(session, *, agent_slug: str | None = None) -> list[AgentSkillMappingOut]:
@@ -2066,23 +2654,34 @@ def _mapping_by_skill(rows: list[AgentSkillMappingOut]) -> dict[str, list[str]]:
     return grouped
 
 
-def _build_agent_skills_detail(
+def _load_agent_runtime_skills(
     settings: Settings,
-    *,
     agent_slug: str,
-    label_map: dict[str, str],
-    global_by_slug: dict[str, SkillItem],
-    workspace_by_agent: dict[str, list[SkillItem]],
-    mapping_by_agent: dict[str, list[str]],
-) -> AgentSkillsDetailOut:
-    payload, config_exists, parse_error = _load_agent_runtime_payload(settings, agent_slug)
+    memo: FileMemo | None = None,
+) -> tuple[AgentSkillRuntimeConfigOut, list[SkillItem], list[SkillsDriftItem]]:
+    payload, config_exists, parse_error = _load_agent_runtime_payload(settings, agent_slug, memo=memo)
     runtime_config = _runtime_config_from_payload(settings, agent_slug, payload, config_exists=config_exists)
     runtime_skills, runtime_drifts = _scan_runtime_skill_items(
         settings,
         agent_slug,
         runtime_config,
         parse_error=parse_error,
+        memo=memo,
     )
+    return runtime_config, runtime_skills, runtime_drifts
+
+
+def _build_agent_skills_detail(
+    settings: Settings,
+    *,
+    agent_slug: str,
+    label_map: dict[str, str],
+    global_by_slug: dict[str, SkillItem],
+    workspace_by_agent: dict[str, list[SkillItem]],
+    mapping_by_agent: dict[str, list[str]],
+    runtime: tuple[AgentSkillRuntimeConfigOut, list[SkillItem], list[SkillsDriftItem]] | None = None,
+) -> AgentSkillsDetailOut:
+    runtime_config, runtime_skills, runtime_drifts = runtime or _load_agent_runtime_skills(settings, agent_slug)
 
     workspace_skills = list(workspace_by_agent.get(agent_slug) or [])
     mapped_slugs = list(mapping_by_agent.get(agent_slug) or [])
@@ -2289,9 +2888,58 @@ def _build_skills_report(
     )
 
 
+def _build_skills_catalog_snapshot(settings: Settings, memo: FileMemo, agent_registry: AgentRegistry) -> dict:
+    agent_registry.refresh(force=True)
+    label_map = dict(agent_registry.label_map())
+    agent_slugs = list(agent_registry.ordered_slugs())
+
+    global_skills = _scan_global_skills(settings, memo=memo)
+    workspace_groups = _scan_workspace_skills(settings, memo=memo)
+    runtime_by_agent = {slug: _load_agent_runtime_skills(settings, slug, memo=memo) for slug in agent_slugs}
+
+    homes_root = Path(settings.agent_homes_dir)
+    home_slugs = sorted(path.name for path in homes_root.iterdir() if path.is_dir()) if homes_root.is_dir() else []
+    watch_roots = {settings.global_skills_dir}
+    watch_files = {settings.agent_manifest_path, str(homes_root)}
+    for slug in home_slugs:
+        skills_dir = homes_root / slug / "skills"
+        watch_roots.add(str(skills_dir))
+        watch_files.add(str(skills_dir))
+    for slug, (runtime_config, _, _) in runtime_by_agent.items():
+        watch_files.add(str(_agent_config_path(settings, slug)))
+        for raw_path in runtime_config.extra_dirs:
+            watch_roots.add(str(_resolve_runtime_dir(settings, slug, raw_path)))
+
+    return {
+        "agent_slugs": agent_slugs,
+        "label_map": label_map,
+        "global_skills": global_skills,
+        "workspace_groups": workspace_groups,
+        "runtime_by_agent": runtime_by_agent,
+        "watch_roots": sorted(watch_roots),
+        "watch_files": sorted(watch_files),
+    }
+
+
+def _skills_catalog_etag(kind: str, catalog_digest: str, mapping_rows: list[AgentSkillMappingOut] | None = None) -> str:
+    mapping_digest = ""
+    if mapping_rows is not None:
+        raw = "|".join(f"{row.agent_slug}:{row.skill_slug}" for row in mapping_rows)
+        mapping_digest = "-" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+    return f'"skills-{kind}-{catalog_digest}{mapping_digest}"'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    response.headers["ETag"] = etag
+    if etag in _parse_etag_values(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
 async def _load_skills_snapshot(
     settings: Settings,
     session,
+    catalog: dict,
     *,
     agent_slug: str | None = None,
 ) -> tuple[
@@ -2303,18 +2951,27 @@ async def _load_skills_snapshot(
     dict[str, AgentSkillsDetailOut],
 ]:
     mapping_rows = await _fetch_skill_mapping_rows(session, agent_slug=agent_slug)
-    global_skills = _scan_global_skills(settings)
-    workspace_groups = _scan_workspace_skills(settings, agent_slug=agent_slug)
+    global_skills = list(catalog.get("global_skills") or [])
+    workspace_groups = [
+        group
+        for group in catalog.get("workspace_groups") or []
+        if not agent_slug or group.agent_slug == agent_slug
+    ]
     workspace_by_agent = {group.agent_slug: list(group.skills) for group in workspace_groups}
     global_by_slug = {item.slug: item for item in global_skills}
     mapping_groups = _mapping_by_agent(mapping_rows)
-    label_map = _agent_label_map(settings)
+    label_map = dict(catalog.get("label_map") or {})
+    runtime_by_agent = catalog.get("runtime_by_agent") or {}
 
-    extra_slugs = list(mapping_groups.keys()) + [group.agent_slug for group in workspace_groups]
     if agent_slug:
         ordered_agents = [agent_slug]
     else:
-        ordered_agents = _ordered_agent_slugs(settings, extra_slugs=extra_slugs)
+        ordered_agents = list(catalog.get("agent_slugs") or [])
+        seen = set(ordered_agents)
+        for slug in list(mapping_groups.keys()) + [group.agent_slug for group in workspace_groups]:
+            if slug and slug not in seen:
+                seen.add(slug)
+                ordered_agents.append(slug)
 
     details_by_agent = {
         slug: _build_agent_skills_detail(
@@ -2324,6 +2981,7 @@ async def _load_skills_snapshot(
             global_by_slug=global_by_slug,
             workspace_by_agent=workspace_by_agent,
             mapping_by_agent=mapping_groups,
+            runtime=runtime_by_agent.get(slug),
         )
         for slug in ordered_agents
     }
@@ -2376,7 +3034,68 @@ async def _forward_agent_control(
     )
 
 
-def _validate_handoff_payload(payload: dict, known_agents: set[str]) -> list[str]:
+def _encode_board_cursor(updated_at: datetime, task_id: UUID) -> str:
+    raw = f"{updated_at.isoformat()}|{task_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_board_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_updated_at, raw_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(raw_updated_at), UUID(raw_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="invalid board cursor")
+
+
+def _board_task_columns() -> tuple:
+    return (
+        tasks.c.id,
+        tasks.c.title,
+        tasks.c.status,
+        tasks.c.assignee,
+        tasks.c.tags,
+        tasks.c.created_at,
+        tasks.c.updated_at,
+    )
+
+
+def _feed_lite_columns() -> tuple:
+    return (
+        events.c.id,
+        events.c.type,
+        events.c.agent,
+        events.c.task_id,
+        events.c.created_at,
+        sa.func.jsonb_extract_path_text(events.c.payload, "method").label("method"),
+        sa.func.jsonb_extract_path_text(events.c.payload, "path").label("path"),
+        sa.cast(sa.func.nullif(sa.func.jsonb_extract_path_text(events.c.payload, "status_code"), ""), sa.Integer).label("status_code"),
+        sa.func.jsonb_extract_path_text(events.c.payload, "error_type").label("error_type"),
+        sa.func.jsonb_extract_path_text(events.c.payload, "test_id").label("test_id"),
+        sa.cast(sa.func.nullif(sa.func.jsonb_extract_path_text(events.c.payload, "round"), ""), sa.Integer).label("round"),
+    )
+
+
+def _delta_high_water(
+    marks: list[tuple[datetime, UUID]],
+    since_ts: datetime | None,
+    since_id: UUID | None,
+) -> tuple[datetime | None, UUID | None]:
+    candidates = list(marks)
+    if since_ts is not None:
+        candidates.append((since_ts, since_id or UUID(int=0)))
+    if not candidates:
+        return None, None
+    high_water_ts, high_water_id = max(candidates)
+    return high_water_ts, (None if high_water_id == UUID(int=0) else high_water_id)
+
+
+def _content_etag(kind: str, model: BaseModel) -> str:
+    digest = hashlib.sha256(model.model_dump_json().encode("utf-8")).hexdigest()[:20]
+    return f'"{kind}-{digest}"'
+
+
+def _validate_handoff_payload(payload: dict, known_agents: frozenset[str]) -> list[str]:
     errors: list[str] = []
 
     target_agent = str(payload.get("to") or "").strip()
@@ -2445,6 +3164,14 @@ async def _probe_http(url: str, *, timeout_seconds: float = 1.5) -> tuple[bool,
         return False, None, f"{exc.__class__.__name__}: {exc}"
 
 
+def _usage_model_name(*candidates) -> str:
+    for candidate in candidates:
+        name = str(candidate or "").strip()
+        if name:
+            return name[:USAGE_MODEL_NAME_MAX_CHARS]
+    return ""
+
+
 def _line_usage_from_session_event(line_obj: dict) -> tuple[datetime | None, dict | None]:
     message = line_obj.get("message") if isinstance(line_obj.get("message"), dict) else {}
     payload = line_obj.get("payload") if isinstance(line_obj.get("payload"), dict) else {}
@@ -2469,6 +3196,7 @@ def _line_usage_from_session_event(line_obj: dict) -> tuple[datetime | None, dic
                 (usage.get("cost") or {}).get("total") if isinstance(usage.get("cost"), dict) else usage.get("total_cost")
             ),
         },
+        "model": _usage_model_name(message.get("model"), line_obj.get("model"), payload.get("model")),
     }
 
     if mapped_usage["totalTokens"] <= 0:
@@ -2501,9 +3229,9 @@ def _line_usage_from_session_event(line_obj: dict) -> tuple[datetime | None, dic
 
 
 def _line_usage_from_cron_event(line_obj: dict) -> tuple[datetime | None, dict | None]:
+    payload = line_obj.get("payload") if isinstance(line_obj.get("payload"), dict) else {}
     usage = line_obj.get("usage")
     if not isinstance(usage, dict):
-        payload = line_obj.get("payload") if isinstance(line_obj.get("payload"), dict) else {}
         usage = payload.get("usage")
     if not isinstance(usage, dict):
         return None, None
@@ -2525,6 +3253,7 @@ def _line_usage_from_cron_event(line_obj: dict) -> tuple[datetime | None, dict |
         "cost": {
             "total": float(usage.get("total_cost") or 0.0),
         },
+        "model": _usage_model_name(line_obj.get("model"), payload.get("model")),
     }
     return event_ts, mapped_usage
 
@@ -2543,11 +3272,15 @@ def _safe_float(value) -> float:
         return 0.0
 
 
-def _accumulate_usage(aggregate: dict, usage: dict, *, window_key: str) -> None:
-    aggregate[f"input_tokens_{window_key}"] += _safe_int(usage.get("input"))
-    aggregate[f"output_tokens_{window_key}"] += _safe_int(usage.get("output"))
-    aggregate[f"cache_read_tokens_{window_key}"] += _safe_int(usage.get("cacheRead"))
-    aggregate[f"cache_write_tokens_{window_key}"] += _safe_int(usage.get("cacheWrite"))
+def _usage_bucket_epoch(epoch: float) -> int:
+    return int(epoch // USAGE_BUCKET_SECONDS) * USAGE_BUCKET_SECONDS
+
+
+def _accumulate_usage_bucket(bucket: dict, usage: dict) -> None:
+    bucket["input_tokens"] += _safe_int(usage.get("input"))
+    bucket["output_tokens"] += _safe_int(usage.get("output"))
+    bucket["cache_read_tokens"] += _safe_int(usage.get("cacheRead"))
+    bucket["cache_write_tokens"] += _safe_int(usage.get("cacheWrite"))
 
     total_tokens = _safe_int(usage.get("totalTokens"))
     if total_tokens <= 0:
@@ -2557,14 +3290,15 @@ def _accumulate_usage(aggregate: dict, usage: dict, *, window_key: str) -> None:
             + _safe_int(usage.get("cacheRead"))
             + _safe_int(usage.get("cacheWrite"))
         )
-    aggregate[f"total_tokens_{window_key}"] += total_tokens
+    bucket["total_tokens"] += total_tokens
+    bucket["events"] += 1
 
     usage_cost = usage.get("cost") if isinstance(usage.get("cost"), dict) else {}
     if isinstance(usage_cost, dict):
         total_cost = _safe_float(usage_cost.get("total"))
-        aggregate[f"total_cost_{window_key}"] += total_cost
+        bucket["total_cost"] += total_cost
         if total_cost <= 0 and total_tokens > 0:
-            aggregate["missing_cost_entries_window"] += 1
+            bucket["missing_cost_entries"] += 1
 
 
 def _iter_agent_usage_lines(agent_dir: Path):
@@ -2600,95 +3334,591 @@ def _iter_agent_usage_lines(agent_dir: Path):
                     yield file_path, "cron"
 
 
-def _collect_agent_usage_snapshot(settings: Settings, days: int) -> list[AgentUsageSnapshotOut]:
-    root = Path(settings.agent_homes_dir)
-    if not root.exists() or not root.is_dir():
-        return []
+def _scan_agent_usage_files(
+    agent_dir: Path,
+    known: dict[tuple[int, int], dict],
+) -> tuple[dict[tuple[int, str], dict], list[dict], set[tuple[int, int]]]:
+    buckets: dict[tuple[int, str], dict] = {}
+    offset_rows: list[dict] = []
+    seen: set[tuple[int, int]] = set()
 
-    window_seconds = max(1, min(days, 90)) * 24 * 60 * 60
-    window_start_epoch = time.time() - window_seconds
-    day_24h_epoch = time.time() - 24 * 60 * 60
+    for file_path, source_type in _iter_agent_usage_lines(agent_dir):
+        try:
+            stat = file_path.stat()
+        except OSError:
+            continue
+        key = (int(stat.st_dev), int(stat.st_ino))
+        if key in seen:
+            continue
+        seen.add(key)
 
-    out: list[AgentUsageSnapshotOut] = []
+        state = known.get(key)
+        if state and state["size_bytes"] == stat.st_size and state["mtime_ns"] == stat.st_mtime_ns:
+            continue
 
-    for agent_dir in sorted(path for path in root.iterdir() if path.is_dir()):
-        aggregate = {
-            "agent": agent_dir.name,
-            "input_tokens_24h": 0,
-            "output_tokens_24h": 0,
-            "cache_read_tokens_24h": 0,
-            "cache_write_tokens_24h": 0,
-            "total_tokens_24h": 0,
-            "total_cost_24h": 0.0,
-            "input_tokens_window": 0,
-            "output_tokens_window": 0,
-            "cache_read_tokens_window": 0,
-            "cache_write_tokens_window": 0,
-            "total_tokens_window": 0,
-            "total_cost_window": 0.0,
-            "missing_cost_entries_window": 0,
-            "days": max(1, min(days, 90)),
-        }
+        try:
+            with file_path.open("rb") as handle:
+                offset = 0
+                if state and stat.st_size >= state["offset_bytes"]:
+                    head = handle.read(state["head_length"])
+                    if hashlib.sha256(head).hexdigest() == state["head_sha256"]:
+                        offset = int(state["offset_bytes"])
+                handle.seek(offset)
+                position = offset
+                for raw_line in handle:
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    position += len(raw_line)
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if not isinstance(obj, dict):
+                        continue
+
+                    if source_type == "session":
+                        event_dt, usage = _line_usage_from_session_event(obj)
+                    else:
+                        event_dt, usage = _line_usage_from_cron_event(obj)
+                    if usage is None:
+                        continue
+
+                    event_epoch = event_dt.timestamp() if event_dt is not None else stat.st_mtime
+                    bucket = buckets.setdefault(
+                        (_usage_bucket_epoch(event_epoch), str(usage.get("model") or "")),
+                        {name: 0.0 if name == "total_cost" else 0 for name in USAGE_BUCKET_COUNTERS},
+                    )
+                    _accumulate_usage_bucket(bucket, usage)
 
-        for file_path, source_type in _iter_agent_usage_lines(agent_dir):
-            try:
-                with file_path.open("r", encoding="utf-8") as handle:
-                    for raw_line in handle:
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-                        try:
-                            obj = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-
-                        if source_type == "session":
-                            event_dt, usage = _line_usage_from_session_event(obj)
-                        else:
-                            event_dt, usage = _line_usage_from_cron_event(obj)
-
-                        if usage is None:
-                            continue
-
-                        include_24h = False
-                        include_window = True
-                        if event_dt is not None:
-                            event_epoch = event_dt.timestamp()
-                            include_window = event_epoch >= window_start_epoch
-                            include_24h = event_epoch >= day_24h_epoch
-
-                        if include_window:
-                            _accumulate_usage(aggregate, usage, window_key="window")
-                        if include_24h:
-                            _accumulate_usage(aggregate, usage, window_key="24h")
-            except OSError:
-                continue
+                head_length = min(position, USAGE_INDEX_HEAD_BYTES)
+                handle.seek(0)
+                head_sha256 = hashlib.sha256(handle.read(head_length)).hexdigest()
+        except OSError:
+            continue
 
-        out.append(AgentUsageSnapshotOut(**aggregate))
+        offset_rows.append(
+            {
+                "device": key[0],
+                "inode": key[1],
+                "file_path": str(file_path),
+                "source_type": source_type,
+                "size_bytes": int(stat.st_size),
+                "mtime_ns": int(stat.st_mtime_ns),
+                "offset_bytes": position,
+                "head_length": head_length,
+                "head_sha256": head_sha256,
+            }
+        )
 
-    return out
+    return buckets, offset_rows, seen
+
+
+def _list_agent_dirs(settings: Settings) -> list[Path]:
+    root = Path(settings.agent_homes_dir)
+    if not root.exists() or not root.is_dir():
+        return []
+    return sorted(path for path in root.iterdir() if path.is_dir())
+
+
+def _month_floor(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def _parse_events_partition_bound(bound: str | None) -> tuple[datetime | None, datetime | None] | None:
+    match = EVENTS_PARTITION_BOUND_RE.search(str(bound or ""))
+    if not match:
+        return None
+    lower, upper = (
+        datetime.fromisoformat(value).astimezone(timezone.utc).replace(tzinfo=None) if value else None
+        for value in match.groups()
+    )
+    return lower, upper
+
+
+async def _maintain_events_partitions(
+    session,
+    *,
+    now: datetime,
+    premake_months: int,
+    retention_days: int,
+    retention_mode: str,
+) -> dict[str, list[str]]:
+    result: dict[str, list[str]] = {"created": [], "retired": []}
+    locked = (await session.execute(sa.select(sa.func.pg_try_advisory_xact_lock(EVENTS_PARTITION_LOCK_KEY)))).scalar_one()
+    if not locked:
+        return result
+    await session.execute(sa.text("SET LOCAL lock_timeout = '5s'"))
+
+    rows = (
+        await session.execute(
+            sa.text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'events'::regclass"
+            )
+        )
+    ).all()
+    default_partition: str | None = None
+    partitions: dict[str, tuple[datetime | None, datetime | None]] = {}
+    for row in rows:
+        if str(row.bound or "").strip().upper() == "DEFAULT":
+            default_partition = row.relname
+            continue
+        bounds = _parse_events_partition_bound(row.bound)
+        if bounds is not None:
+            partitions[row.relname] = bounds
+
+    month = _month_floor(now)
+    for offset in range(max(int(premake_months), 0) + 1):
+        start = _add_months(month, offset)
+        end = _add_months(start, 1)
+        if any(
+            (lower is None or lower <= start) and (upper is None or upper >= end)
+            for lower, upper in partitions.values()
+        ):
+            continue
+        name = f"{EVENTS_PARTITION_PREFIX}{start:%Y%m}"
+        bounds = {"start": start.replace(tzinfo=timezone.utc), "end": end.replace(tzinfo=timezone.utc)}
+        await session.execute(sa.text(f"CREATE TABLE {name} (LIKE events INCLUDING DEFAULTS)"))
+        if default_partition:
+            await session.execute(
+                sa.text(
+                    f"WITH moved AS (DELETE FROM {default_partition} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+        await session.execute(
+            sa.text(
+                f"ALTER TABLE events ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            )
+        )
+        partitions[name] = (start, end)
+        result["created"].append(name)
+
+    if retention_days > 0:
+        cutoff = now - timedelta(days=retention_days)
+        expired = sorted(
+            (upper, name)
+            for name, (_, upper) in partitions.items()
+            if upper is not None and upper <= cutoff
+        )
+        for _, name in expired:
+            if retention_mode == "drop":
+                await session.execute(sa.text(f"DROP TABLE {name}"))
+            else:
+                await session.execute(sa.text(f"ALTER TABLE events DETACH PARTITION {name}"))
+            result["retired"].append(name)
+        if retention_mode == "drop" and default_partition:
+            await session.execute(
+                sa.text(f"DELETE FROM {default_partition} WHERE created_at < :cutoff"),
+                {"cutoff": cutoff.replace(tzinfo=timezone.utc)},
+            )
 
+    await session.commit()
+    return result
+
+
+async def _prune_events_minute_rollup(session, *, now: datetime, retention_minutes: int) -> int:
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    cutoff = now.replace(second=0, microsecond=0) - timedelta(
+        minutes=max(int(retention_minutes), EVENTS_ROLLUP_MIN_RETENTION_MINUTES)
+    )
+    result = await session.execute(events_minute_rollup.delete().where(events_minute_rollup.c.bucket_minute < cutoff))
+    await session.commit()
+    return int(result.rowcount or 0)
+
+
+async def _sync_agent_usage_index(session, *, agent_dir: Path) -> bool:
+    agent = agent_dir.name
+    locked = (
+        await session.execute(
+            sa.select(sa.func.pg_try_advisory_xact_lock(USAGE_INDEX_LOCK_KEY, sa.func.hashtext(agent)))
+        )
+    ).scalar_one()
+    if not locked:
+        return False
+
+    known = {
+        (int(row.device), int(row.inode)): dict(row._mapping)
+        for row in (
+            await session.execute(
+                sa.select(
+                    agent_usage_file_offsets.c.device,
+                    agent_usage_file_offsets.c.inode,
+                    agent_usage_file_offsets.c.size_bytes,
+                    agent_usage_file_offsets.c.mtime_ns,
+                    agent_usage_file_offsets.c.offset_bytes,
+                    agent_usage_file_offsets.c.head_length,
+                    agent_usage_file_offsets.c.head_sha256,
+                ).where(agent_usage_file_offsets.c.agent == agent)
+            )
+        ).all()
+    }
+    buckets, offset_rows, seen = await asyncio.to_thread(_scan_agent_usage_files, agent_dir, known)
+    now = datetime.utcnow()
+
+    if buckets:
+        bucket_insert = pg_insert(agent_usage_hourly).values(
+            [
+                {
+                    "agent": agent,
+                    "bucket_start": datetime.utcfromtimestamp(bucket_epoch),
+                    "model": model,
+                    **counters,
+                    "updated_at": now,
+                }
+                for (bucket_epoch, model), counters in sorted(buckets.items())
+            ]
+        )
+        await session.execute(
+            bucket_insert.on_conflict_do_update(
+                index_elements=[agent_usage_hourly.c.agent, agent_usage_hourly.c.bucket_start, agent_usage_hourly.c.model],
+                set_={
+                    **{
+                        name: agent_usage_hourly.c[name] + bucket_insert.excluded[name]
+                        for name in USAGE_BUCKET_COUNTERS
+                    },
+                    "updated_at": bucket_insert.excluded.updated_at,
+                },
+            )
+        )
+
+    if offset_rows:
+        offset_insert = pg_insert(agent_usage_file_offsets).values(
+            [{"agent": agent, **row, "updated_at": now} for row in offset_rows]
+        )
+        await session.execute(
+            offset_insert.on_conflict_do_update(
+                index_elements=[
+                    agent_usage_file_offsets.c.agent,
+                    agent_usage_file_offsets.c.device,
+                    agent_usage_file_offsets.c.inode,
+                ],
+                set_={
+                    name: offset_insert.excluded[name]
+                    for name in (
+                        "file_path",
+                        "source_type",
+                        "size_bytes",
+                        "mtime_ns",
+                        "offset_bytes",
+                        "head_length",
+                        "head_sha256",
+                        "updated_at",
+                    )
+                },
+            )
+        )
+
+    vanished = [key for key in known if key not in seen]
+    if vanished:
+        await session.execute(
+            agent_usage_file_offsets.delete().where(
+                agent_usage_file_offsets.c.agent == agent,
+                agent_usage_file_offsets.c.updated_at < now - timedelta(days=USAGE_INDEX_PRUNE_AFTER_DAYS),
+                sa.tuple_(agent_usage_file_offsets.c.device, agent_usage_file_offsets.c.inode).in_(vanished),
+            )
+        )
+
+    await session.commit()
+    return True
+
+
+async def _load_agent_usage_snapshot(session, settings: Settings, days: int) -> list[AgentUsageSnapshotOut]:
+    agent_dirs = _list_agent_dirs(settings)
+    if not agent_dirs:
+        return []
 
-def _get_agent_usage_snapshot(settings: Settings, days: int) -> list[AgentUsageSnapshotOut]:
     clamped_days = max(1, min(int(days), 90))
-    now_ts = time.time()
+    now_epoch = time.time()
+    window_start = datetime.utcfromtimestamp(_usage_bucket_epoch(now_epoch - clamped_days * 24 * 60 * 60))
+    day_start = datetime.utcfromtimestamp(_usage_bucket_epoch(now_epoch - 24 * 60 * 60))
 
-    cached_days = _AGENT_USAGE_CACHE.get("days")
-    cached_at = _safe_float(_AGENT_USAGE_CACHE.get("generated_at"))
-    cached_data = _AGENT_USAGE_CACHE.get("data")
+    def windowed(name: str, since: datetime | None, label: str):
+        column = agent_usage_hourly.c[name]
+        if since is not None:
+            column = sa.case((agent_usage_hourly.c.bucket_start >= since, column), else_=0)
+        return sa.func.coalesce(sa.func.sum(column), 0).label(label)
 
-    if (
-        cached_days == clamped_days
-        and isinstance(cached_data, list)
-        and now_ts - cached_at <= USAGE_CACHE_TTL_SECONDS
-    ):
-        return cached_data  # type: ignore[return-value]
+    rows = (
+        await session.execute(
+            sa.select(
+                agent_usage_hourly.c.agent,
+                windowed("input_tokens", day_start, "input_tokens_24h"),
+                windowed("output_tokens", day_start, "output_tokens_24h"),
+                windowed("cache_read_tokens", day_start, "cache_read_tokens_24h"),
+                windowed("cache_write_tokens", day_start, "cache_write_tokens_24h"),
+                windowed("total_tokens", day_start, "total_tokens_24h"),
+                windowed("total_cost", day_start, "total_cost_24h"),
+                windowed("input_tokens", None, "input_tokens_window"),
+                windowed("output_tokens", None, "output_tokens_window"),
+                windowed("cache_read_tokens", None, "cache_read_tokens_window"),
+                windowed("cache_write_tokens", None, "cache_write_tokens_window"),
+                windowed("total_tokens", None, "total_tokens_window"),
+                windowed("total_cost", None, "total_cost_window"),
+                windowed("missing_cost_entries", None, "missing_cost_entries_window"),
+            )
+            .where(agent_usage_hourly.c.bucket_start >= window_start)
+            .group_by(agent_usage_hourly.c.agent)
+        )
+    ).all()
+    by_agent = {row.agent: row._mapping for row in rows}
 
-    fresh = _collect_agent_usage_snapshot(settings, clamped_days)
-    _AGENT_USAGE_CACHE["days"] = clamped_days
-    _AGENT_USAGE_CACHE["generated_at"] = now_ts
-    _AGENT_USAGE_CACHE["data"] = fresh
-    return fresh
+    out: list[AgentUsageSnapshotOut] = []
+    for agent_dir in agent_dirs:
+        totals = by_agent.get(agent_dir.name)
+        values = {key: value for key, value in totals.items() if key != "agent"} if totals else {}
+        out.append(AgentUsageSnapshotOut(agent=agent_dir.name, days=clamped_days, **values))
+    return out
+
+
+def _event_rollup_dimensions(event_type: str, payload: dict | None) -> tuple[str, bool]:
+    payload = payload if isinstance(payload, dict) else {}
+    status_code = _safe_int(payload.get("status_code")) if str(payload.get("status_code") or "").strip().isdigit() else 0
+    status_class = f"{status_code // 100}xx" if 100 <= status_code <= 599 else ""
+    accepted = payload.get("accepted")
+    is_error = (
+        (event_type == "event.validation" and (accepted is False or str(accepted).strip().lower() == "false"))
+        or event_type.endswith(".error")
+        or status_code >= 400
+        or bool(str(payload.get("error_type") or "").strip())
+    )
+    return status_class, is_error
+
+
+def _resolve_counter_filters(window_days: int, risk_level: str | None, agent_slug: str | None) -> list:
+    counters = knowledge_resolve_daily_counters
+    filters = [counters.c.day >= (datetime.utcnow() - timedelta(days=window_days)).date()]
+    if risk_level:
+        filters.append(counters.c.risk_level == risk_level.strip().lower())
+    if agent_slug is not None and agent_slug.strip():
+        filters.append(counters.c.agent_slug == agent_slug.strip())
+    return filters
+
+
+def _resolve_counter_rows(
+    *,
+    risk_level: str,
+    agent_slug: str | None,
+    selected_count: int,
+    rejected_payload: list[dict],
+    created_at: datetime,
+) -> list[dict]:
+    reason_counts: dict[str, int] = {}
+    for item in rejected_payload:
+        if not isinstance(item, dict):
+            continue
+        reason = str(item.get("reason") or "unknown").strip() or "unknown"
+        reason_counts[reason] = reason_counts.get(reason, 0) + 1
+
+    day = created_at.date()
+    agent = str(agent_slug or "").strip()
+    rows = [
+        {
+            "day": day,
+            "risk_level": risk_level,
+            "agent_slug": agent,
+            "reason": "",
+            "resolve_requests": 1,
+            "requests_with_hits": 1 if selected_count > 0 else 0,
+            "requests_with_rejections": 1 if rejected_payload else 0,
+            "selected_units": selected_count,
+            "rejected_units": len(rejected_payload),
+            "rejections": 0,
+            "updated_at": created_at,
+        }
+    ]
+    for reason, count in sorted(reason_counts.items()):
+        rows.append(
+            {
+                "day": day,
+                "risk_level": risk_level,
+                "agent_slug": agent,
+                "reason": reason,
+                "resolve_requests": 0,
+                "requests_with_hits": 0,
+                "requests_with_rejections": 0,
+                "selected_units": 0,
+                "rejected_units": 0,
+                "rejections": count,
+                "updated_at": created_at,
+            }
+        )
+    return rows
+
+
+async def _write_resolve_counters(session, rows: list[dict]) -> None:
+    aggregated: dict[tuple, dict] = {}
+    for row in rows:
+        key = (row["day"], row["risk_level"], row["agent_slug"], row["reason"])
+        current = aggregated.get(key)
+        if current is None:
+            aggregated[key] = dict(row)
+            continue
+        for name in RESOLVE_COUNTER_COLUMNS:
+            current[name] += row[name]
+        current["updated_at"] = max(current["updated_at"], row["updated_at"])
+    if not aggregated:
+        return
+
+    counter_insert = pg_insert(knowledge_resolve_daily_counters).values(
+        [aggregated[key] for key in sorted(aggregated)]
+    )
+    await session.execute(
+        counter_insert.on_conflict_do_update(
+            index_elements=[
+                knowledge_resolve_daily_counters.c.day,
+                knowledge_resolve_daily_counters.c.risk_level,
+                knowledge_resolve_daily_counters.c.agent_slug,
+                knowledge_resolve_daily_counters.c.reason,
+            ],
+            set_={
+                **{
+                    name: knowledge_resolve_daily_counters.c[name] + counter_insert.excluded[name]
+                    for name in RESOLVE_COUNTER_COLUMNS
+                },
+                "updated_at": sa.func.greatest(
+                    knowledge_resolve_daily_counters.c.updated_at,
+                    counter_insert.excluded.updated_at,
+                ),
+            },
+        )
+    )
+
+
+def _event_rollup_row(
+    *,
+    event_type: str,
+    agent: str | None,
+    payload: dict | None,
+    created_at: datetime,
+) -> dict:
+    status_class, is_error = _event_rollup_dimensions(event_type, payload)
+    return {
+        "bucket_minute": created_at.replace(second=0, microsecond=0),
+        "event_type": event_type,
+        "agent": agent or "",
+        "status_class": status_class,
+        "is_error": is_error,
+        "events": 1,
+        "updated_at": created_at,
+    }
+
+
+async def _write_event_rollups(session, rows: list[dict]) -> None:
+    rollup_insert = pg_insert(events_minute_rollup).values(rows)
+    await session.execute(
+        rollup_insert.on_conflict_do_update(
+            index_elements=[
+                events_minute_rollup.c.bucket_minute,
+                events_minute_rollup.c.event_type,
+                events_minute_rollup.c.agent,
+                events_minute_rollup.c.status_class,
+                events_minute_rollup.c.is_error,
+            ],
+            set_={
+                "events": events_minute_rollup.c.events + rollup_insert.excluded.events,
+                "updated_at": sa.func.greatest(events_minute_rollup.c.updated_at, rollup_insert.excluded.updated_at),
+            },
+        )
+    )
+
+
+async def _write_agent_heartbeats(session, rows: list[dict]) -> None:
+    heartbeat_insert = pg_insert(agent_heartbeats).values(rows)
+    await session.execute(
+        heartbeat_insert.on_conflict_do_update(
+            index_elements=[agent_heartbeats.c.agent],
+            set_={
+                "last_seen_at": sa.func.greatest(agent_heartbeats.c.last_seen_at, heartbeat_insert.excluded.last_seen_at),
+                "updated_at": heartbeat_insert.excluded.updated_at,
+            },
+        )
+    )
+
+
+def _usage_timeseries_range(
+    start: datetime | None,
+    end: datetime | None,
+    resolution: str,
+) -> tuple[datetime, datetime]:
+    if resolution not in USAGE_TIMESERIES_RESOLUTIONS:
+        raise HTTPException(status_code=422, detail="resolution must be hour or day")
+    end_at = end or datetime.now(timezone.utc)
+    if end_at.tzinfo is None:
+        end_at = end_at.replace(tzinfo=timezone.utc)
+    start_at = start or end_at - timedelta(days=7)
+    if start_at.tzinfo is None:
+        start_at = start_at.replace(tzinfo=timezone.utc)
+    start_at = start_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if resolution == "day":
+        start_at = start_at.replace(hour=0)
+    if start_at >= end_at:
+        raise HTTPException(status_code=422, detail="start must be before end")
+    if end_at - start_at > timedelta(days=USAGE_TIMESERIES_RESOLUTIONS[resolution]):
+        raise HTTPException(
+            status_code=422,
+            detail=f"range too large for {resolution} resolution (max {USAGE_TIMESERIES_RESOLUTIONS[resolution]} days)",
+        )
+    return start_at, end_at
+
+
+async def _load_agent_usage_timeseries(
+    session,
+    *,
+    start: datetime,
+    end: datetime,
+    resolution: str,
+    agent: str | None,
+    model: str | None,
+    by_model: bool,
+) -> list[AgentUsageSeriesOut]:
+    bucket = sa.func.date_trunc(
+        sa.literal_column(f"'{resolution}'"),
+        agent_usage_hourly.c.bucket_start,
+        sa.literal_column("'UTC'"),
+    )
+    model_column = agent_usage_hourly.c.model if by_model else sa.literal_column("''")
+    group_columns = [agent_usage_hourly.c.agent, bucket] if not by_model else [agent_usage_hourly.c.agent, model_column, bucket]
+    stmt = (
+        sa.select(
+            agent_usage_hourly.c.agent,
+            model_column.label("model"),
+            bucket.label("bucket_start"),
+            *(sa.func.sum(agent_usage_hourly.c[name]).label(name) for name in USAGE_BUCKET_COUNTERS),
+        )
+        .where(agent_usage_hourly.c.bucket_start >= start, agent_usage_hourly.c.bucket_start < end)
+        .group_by(*group_columns)
+        .order_by(*group_columns)
+    )
+    if agent:
+        stmt = stmt.where(agent_usage_hourly.c.agent == agent)
+    if model is not None:
+        stmt = stmt.where(agent_usage_hourly.c.model == model)
+
+    series: list[AgentUsageSeriesOut] = []
+    for row in (await session.execute(stmt)).all():
+        if not series or series[-1].agent != row.agent or series[-1].model != row.model:
+            series.append(AgentUsageSeriesOut(agent=row.agent, model=row.model))
+        point = AgentUsageSeriesPointOut(
+            bucket_start=row.bucket_start,
+            **{name: getattr(row, name) or 0 for name in USAGE_BUCKET_COUNTERS},
+        )
+        series[-1].points.append(point)
+        series[-1].total_tokens += point.total_tokens
+        series[-1].total_cost += point.total_cost
+    return series
 
 
 def create_app() -> FastAPI:
@@ -2697,6 +3927,105 @@ def create_app() -> FastAPI:
     engine = create_engine(settings.database_url)
     session_factory = create_session_factory(engine)
     redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    event_hub = EventHub(
+        redis,
+        settings.redis_stream_key,
+        client_queue_size=settings.ws_events_client_queue_size,
+        replay_limit=settings.ws_events_replay_limit,
+    )
+    chat_upstream_clients: dict[str, httpx.AsyncClient] = {}
+
+    def new_chat_upstream_client() -> httpx.AsyncClient:
+        max_connections = max(int(settings.chat_upstream_max_connections), 1)
+        return httpx.AsyncClient(
+            timeout=CHAT_PROXY_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=CHAT_PROXY_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    def chat_upstream_client(agent: str) -> httpx.AsyncClient:
+        client = chat_upstream_clients.get(agent)
+        if client is None:
+            client = chat_upstream_clients.get("")
+            if client is None:
+                client = chat_upstream_clients[""] = new_chat_upstream_client()
+        return client
+    embedding_client = EmbeddingClient(
+        max_batch_size=settings.knowledge_embedding_max_batch_size,
+        max_concurrency=settings.knowledge_embedding_max_concurrency,
+        coalesce_window_seconds=settings.knowledge_embedding_coalesce_window_ms / 1000.0,
+        max_connections=settings.knowledge_embedding_max_connections,
+    )
+
+    async def write_resolve_audits(records: list[dict]) -> None:
+        async with session_factory() as session:
+            await session.execute(knowledge_resolve_audits.insert().values(records))
+            await session.commit()
+
+    async def write_resolve_counters(rows: list[dict]) -> None:
+        async with session_factory() as session:
+            await _write_resolve_counters(session, rows)
+            await session.commit()
+
+    resolve_audit_sink = AuditSink(
+        write_resolve_audits,
+        max_queue_size=settings.knowledge_resolve_audit_queue_size,
+        batch_size=settings.knowledge_resolve_audit_batch_size,
+        flush_interval_seconds=settings.knowledge_resolve_audit_flush_interval_seconds,
+        overflow=settings.knowledge_resolve_audit_overflow,
+        block_timeout_seconds=settings.knowledge_resolve_audit_block_timeout_seconds,
+    )
+    async def write_event_rollups(rows: list[dict]) -> None:
+        async with session_factory() as session:
+            await _write_event_rollups(session, rows)
+            await session.commit()
+
+    async def write_agent_heartbeats(rows: list[dict]) -> None:
+        async with session_factory() as session:
+            await _write_agent_heartbeats(session, rows)
+            await session.commit()
+
+    event_rollups = CounterAccumulator(
+        write_event_rollups,
+        key_fields=("bucket_minute", "event_type", "agent", "status_class", "is_error"),
+        sum_fields=("events",),
+        flush_interval_seconds=EVENTS_ROLLUP_FLUSH_INTERVAL_SECONDS,
+    )
+    agent_heartbeat_marks = CounterAccumulator(
+        write_agent_heartbeats,
+        key_fields=("agent",),
+        sum_fields=(),
+        max_fields=("last_seen_at", "updated_at"),
+        flush_interval_seconds=EVENTS_ROLLUP_FLUSH_INTERVAL_SECONDS,
+    )
+
+    def record_event_rollup(*, event_type: str, agent: str | None, payload: dict | None, created_at: datetime) -> None:
+        event_rollups.add(
+            [_event_rollup_row(event_type=event_type, agent=agent, payload=payload, created_at=created_at)]
+        )
+        if event_type == "agent.heartbeat" and agent:
+            agent_heartbeat_marks.add([{"agent": agent, "last_seen_at": created_at, "updated_at": created_at}])
+
+    resolve_counters = CounterAccumulator(
+        write_resolve_counters,
+        key_fields=("day", "risk_level", "agent_slug", "reason"),
+        sum_fields=RESOLVE_COUNTER_COLUMNS,
+        flush_interval_seconds=settings.knowledge_resolve_audit_flush_interval_seconds,
+    )
+    agent_registry = AgentRegistry(settings)
+    skills_catalog = SkillsCatalog(
+        lambda memo: _build_skills_catalog_snapshot(settings, memo, agent_registry),
+        watch_mode=settings.skills_catalog_watch_mode,
+        poll_interval_seconds=settings.skills_catalog_poll_seconds,
+    )
+    extraction_executor = ExtractionExecutor(
+        max_workers=settings.knowledge_extraction_max_workers,
+        timeout_seconds=settings.knowledge_extraction_timeout_seconds,
+        memory_limit_mb=settings.knowledge_extraction_memory_limit_mb,
+    )
 
     app = FastAPI(title="Mission Control API", version="0.1.0")
 
@@ -2729,6 +4058,342 @@ def create_app() -> FastAPI:
             },
         )
 
+    async def probe_redis() -> tuple[bool, int | None, str]:
+        started = time.perf_counter()
+        try:
+            ok = bool(await asyncio.wait_for(redis.ping(), timeout=HEALTH_PROBE_COMPOSE_TIMEOUT_SECONDS))
+        except Exception as exc:
+            return False, None, f"{exc.__class__.__name__}: {exc}"
+        return ok, int((time.perf_counter() - started) * 1000), "PONG" if ok else "No PONG"
+
+    async def probe_database() -> tuple[bool, int | None, str]:
+        started = time.perf_counter()
+
+        async def select_one() -> bool:
+            async with session_factory() as session:
+                return (await session.execute(sa.select(sa.literal(1)))).scalar_one() == 1
+
+        try:
+            ok = bool(await asyncio.wait_for(select_one(), timeout=HEALTH_PROBE_COMPOSE_TIMEOUT_SECONDS))
+        except Exception as exc:
+            return False, None, f"{exc.__class__.__name__}: {exc}"
+        return ok, int((time.perf_counter() - started) * 1000), "SELECT 1"
+
+    def health_probe_targets() -> list[tuple]:
+        redis_host, redis_port = _host_port_from_url(settings.redis_url, 6379)
+        db_host, db_port = _host_port_from_url(settings.database_url, 5432)
+        targets: list[tuple] = [
+            ("redis.ping", "compose", f"{redis_host or 'redis'}:{redis_port}", probe_redis),
+            ("postgres.select_1", "compose", f"{db_host or 'postgres'}:{db_port}", probe_database),
+        ]
+        port_targets = list(HEALTH_PROBE_PORT_TARGETS)
+        for slug in sorted(agent_registry.known_slugs()):
+            port_targets.append((f"openclaw-{slug}", f"openclaw-{slug}", settings.chat_upstream_port))
+        for name, host, port in port_targets:
+            targets.append((name, "port", f"{host}:{port}", lambda host=host, port=port: _probe_tcp(host, port)))
+        for name, url in HEALTH_PROBE_HTTP_TARGETS:
+            targets.append((name, "http", url, lambda url=url: _probe_http(url)))
+        return targets
+
+    async def publish_health_change(change: dict) -> None:
+        name = str(change["name"])
+        await publish_event(
+            redis,
+            stream_key=settings.redis_stream_key,
+            event={
+                "id": str(uuid4()),
+                "type": "health.signal.changed",
+                "agent": name[len("openclaw-"):] if name.startswith("openclaw-") else None,
+                "payload": {
+                    "name": name,
+                    "source": change["source"],
+                    "target": change["target"],
+                    "ok": change["ok"],
+                    "previous_ok": change["previous_ok"],
+                    "latency_ms": change["latency_ms"],
+                    "detail": change["detail"],
+                    "changed_at": change["changed_at"].isoformat(),
+                },
+                "created_at": datetime.utcnow().isoformat() + "Z",
+            },
+        )
+
+    health_prober = HealthProber(
+        health_probe_targets,
+        interval_seconds=settings.health_probe_interval_seconds,
+        history_size=settings.health_probe_history_size,
+        on_change=publish_health_change if settings.health_probe_publish_changes else None,
+    )
+
+    async def request_query_embedding(text: str, *, config: dict) -> tuple[list[float], str, int]:
+        return await _request_query_embedding(
+            text,
+            config=config,
+            embedding_client=embedding_client,
+            redis=redis if settings.knowledge_query_embedding_cache_redis_enabled else None,
+            capacity=int(settings.knowledge_query_embedding_cache_size),
+            ttl_seconds=float(settings.knowledge_query_embedding_cache_ttl_seconds),
+        )
+
+    async def publish_policy_invalidation() -> None:
+        version = _bump_policy_snapshot_version()
+        try:
+            await redis.publish(settings.knowledge_policy_invalidation_channel, str(version))
+        except Exception:
+            pass
+
+    async def listen_policy_invalidations() -> None:
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(settings.knowledge_policy_invalidation_channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        _bump_policy_snapshot_version()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(5.0)
+            finally:
+                await pubsub.aclose()
+
+    async def run_usage_index_sync() -> None:
+        interval = max(float(settings.usage_index_sync_interval_seconds), 1.0)
+        while True:
+            try:
+                agent_dirs = await asyncio.to_thread(_list_agent_dirs, settings)
+            except OSError:
+                agent_dirs = []
+            for agent_dir in agent_dirs:
+                try:
+                    async with session_factory() as session:
+                        await _sync_agent_usage_index(session, agent_dir=agent_dir)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    continue
+            await asyncio.sleep(interval)
+
+    async def run_events_partition_maintenance() -> None:
+        interval = max(float(settings.events_partition_maintenance_interval_seconds), 60.0)
+        retention_mode = settings.events_retention_mode if settings.events_retention_mode in EVENTS_RETENTION_MODES else "detach"
+        while True:
+            try:
+                async with session_factory() as session:
+                    await _maintain_events_partitions(
+                        session,
+                        now=datetime.utcnow(),
+                        premake_months=settings.events_partition_premake_months,
+                        retention_days=settings.events_retention_days,
+                        retention_mode=retention_mode,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            try:
+                async with session_factory() as session:
+                    await _prune_events_minute_rollup(
+                        session,
+                        now=datetime.now(timezone.utc),
+                        retention_minutes=settings.events_rollup_retention_minutes,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            await asyncio.sleep(interval)
+
+    ingestion_wakeup = asyncio.Event()
+
+    async def claim_ingestion_job(worker_id: str):
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=max(float(settings.knowledge_ingestion_stale_after_seconds), 60.0))
+        candidate_id = (
+            sa.select(knowledge_ingestion_jobs.c.id)
+            .where(
+                sa.or_(
+                    knowledge_ingestion_jobs.c.status == "queued",
+                    sa.and_(
+                        knowledge_ingestion_jobs.c.status == "running",
+                        knowledge_ingestion_jobs.c.updated_at < stale_before,
+                        knowledge_ingestion_jobs.c.attempts < KNOWLEDGE_INGESTION_MAX_ATTEMPTS,
+                    ),
+                )
+            )
+            .order_by(knowledge_ingestion_jobs.c.created_at.asc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with session_factory() as session:
+            await session.execute(
+                knowledge_ingestion_jobs.update()
+                .where(
+                    knowledge_ingestion_jobs.c.status == "running",
+                    knowledge_ingestion_jobs.c.updated_at < stale_before,
+                    knowledge_ingestion_jobs.c.attempts >= KNOWLEDGE_INGESTION_MAX_ATTEMPTS,
+                )
+                .values(
+                    status="failed",
+                    error=f"worker stopped responding after {KNOWLEDGE_INGESTION_MAX_ATTEMPTS} attempts",
+                    finished_at=now,
+                    updated_at=now,
+                )
+            )
+            await session.execute(
+                knowledge_ingestion_jobs.update()
+                .where(
+                    knowledge_ingestion_jobs.c.status == "cancelling",
+                    knowledge_ingestion_jobs.c.updated_at < stale_before,
+                )
+                .values(status="cancelled", error="cancelled by request", finished_at=now, updated_at=now)
+            )
+            row = (
+                await session.execute(
+                    knowledge_ingestion_jobs.update()
+                    .where(knowledge_ingestion_jobs.c.id == candidate_id)
+                    .values(
+                        status="running",
+                        worker_id=worker_id,
+                        attempts=knowledge_ingestion_jobs.c.attempts + 1,
+                        error=None,
+                        started_at=now,
+                        finished_at=None,
+                        updated_at=now,
+                    )
+                    .returning(
+                        knowledge_ingestion_jobs.c.id,
+                        knowledge_ingestion_jobs.c.source_id,
+                        knowledge_ingestion_jobs.c.request,
+                        knowledge_ingestion_jobs.c.stages,
+                    )
+                )
+            ).first()
+            await session.commit()
+        return row
+
+    async def update_ingestion_job(job_id: UUID, **values) -> None:
+        values["updated_at"] = datetime.utcnow()
+        async with session_factory() as session:
+            await session.execute(
+                knowledge_ingestion_jobs.update().where(knowledge_ingestion_jobs.c.id == job_id).values(**values)
+            )
+            await session.commit()
+
+    async def process_ingestion_job(job) -> None:
+        stages = {name: {"status": "pending"} for name in KNOWLEDGE_INGESTION_STAGES}
+        stage_started: dict[str, float] = {}
+        current_stage: dict[str, str | None] = {"name": None}
+
+        async def on_stage(stage: str, status: str, detail: dict) -> None:
+            now_iso = datetime.utcnow().isoformat() + "Z"
+            entry = dict(stages.get(stage) or {})
+            entry["status"] = status
+            if status == "running":
+                stage_started[stage] = time.perf_counter()
+                entry["started_at"] = now_iso
+                current_stage["name"] = stage
+            else:
+                entry["finished_at"] = now_iso
+                if stage in stage_started:
+                    entry["duration_ms"] = round((time.perf_counter() - stage_started[stage]) * 1000.0, 2)
+                current_stage["name"] = None
+            entry.update({key: value for key, value in detail.items() if value is not None})
+            stages[stage] = entry
+            await update_ingestion_job(job.id, stages=stages)
+
+        async def run_pipeline() -> KnowledgeSourceChunkOut:
+            embedding_config = _knowledge_embedding_runtime_config(settings)
+            async with session_factory() as session:
+                return await _chunk_knowledge_source(
+                    session,
+                    settings=settings,
+                    embedding_client=embedding_client,
+                    extraction_executor=extraction_executor,
+                    embedding_config=embedding_config,
+                    source_id=job.source_id,
+                    body=KnowledgeSourceChunkIn(**(job.request or {})),
+                    on_stage=on_stage,
+                )
+
+        poll_interval = max(float(settings.knowledge_ingestion_poll_interval_seconds), 0.1)
+        status = "failed"
+        result: dict | None = None
+        error: str | None = None
+        pipeline = asyncio.create_task(run_pipeline())
+        try:
+            while True:
+                done, _ = await asyncio.wait({pipeline}, timeout=poll_interval)
+                if done:
+                    break
+                async with session_factory() as session:
+                    requested_status = (
+                        await session.execute(
+                            knowledge_ingestion_jobs.update()
+                            .where(knowledge_ingestion_jobs.c.id == job.id)
+                            .values(updated_at=datetime.utcnow())
+                            .returning(knowledge_ingestion_jobs.c.status)
+                        )
+                    ).scalar_one_or_none()
+                    await session.commit()
+                if requested_status == "cancelling":
+                    pipeline.cancel()
+                    await asyncio.gather(pipeline, return_exceptions=True)
+                    status = "cancelled"
+                    error = "cancelled by request"
+                    break
+            if status != "cancelled":
+                chunk_out = pipeline.result()
+                status = "succeeded"
+                result = chunk_out.model_dump(mode="json", exclude={"items"})
+                result["unit_ids"] = [str(item.id) for item in chunk_out.items]
+        except asyncio.CancelledError:
+            pipeline.cancel()
+            await asyncio.gather(pipeline, return_exceptions=True)
+            await update_ingestion_job(job.id, status="queued", worker_id=None, stages=stages)
+            raise
+        except HTTPException as exc:
+            error = str(exc.detail)
+        except Exception as exc:
+            error = str(exc)
+
+        if status != "succeeded" and current_stage["name"]:
+            interrupted_stage = dict(stages.get(current_stage["name"]) or {})
+            interrupted_stage.update({"status": status, "finished_at": datetime.utcnow().isoformat() + "Z"})
+            stages[current_stage["name"]] = interrupted_stage
+        await update_ingestion_job(
+            job.id,
+            status=status,
+            stages=stages,
+            result=result,
+            error=error,
+            finished_at=datetime.utcnow(),
+        )
+
+    async def run_ingestion_worker(worker_id: str) -> None:
+        poll_interval = max(float(settings.knowledge_ingestion_poll_interval_seconds), 0.1)
+        while True:
+            try:
+                job = await claim_ingestion_job(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(ingestion_wakeup.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                ingestion_wakeup.clear()
+                continue
+            try:
+                await process_ingestion_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(poll_interval)
+
     async def enqueue_local_event(
         session,
         *,
@@ -2756,6 +4421,7 @@ def create_app() -> FastAPI:
             )
         )
         row = (await session.execute(stmt)).one()
+        record_event_rollup(event_type=row.type, agent=row.agent, payload=row.payload, created_at=row.created_at)
         return {
             "id": str(row.id),
             "type": row.type,
@@ -2777,71 +4443,74 @@ def create_app() -> FastAPI:
         session=Depends(get_session),
     ) -> ObservabilitySummaryOut:
         now = datetime.now(timezone.utc)
-        window = max(1, min(int(window_minutes or 5), 60))
+        window = max(1, min(int(window_minutes or 5), OBSERVABILITY_SUMMARY_MAX_WINDOW_MINUTES))
         stale = max(30, min(int(heartbeat_stale_seconds or 180), 3600))
-        since = now - timedelta(minutes=window)
+        since = now.replace(second=0, microsecond=0) - timedelta(minutes=window - 1)
 
-        status_code_expr = sa.cast(
-            sa.func.nullif(sa.func.jsonb_extract_path_text(events.c.payload, "status_code"), ""),
-            sa.Integer,
-        )
-        error_type_expr = sa.func.jsonb_extract_path_text(events.c.payload, "error_type")
-        accepted_expr = sa.func.jsonb_extract_path_text(events.c.payload, "accepted")
-
-        request_total_stmt = sa.select(sa.func.count()).where(
-            events.c.created_at >= since,
-            events.c.type == "chat.gateway.access",
-        )
-        request_total = int((await session.execute(request_total_stmt)).scalar_one() or 0)
-
-        error_total_stmt = sa.select(sa.func.count()).where(
-            events.c.created_at >= since,
-            sa.or_(
-                sa.and_(events.c.type == "event.validation", accepted_expr == "false"),
-                events.c.type.like("%.error"),
-                status_code_expr >= 400,
-                sa.and_(error_type_expr.is_not(None), error_type_expr != ""),
-            ),
-        )
-        error_total = int((await session.execute(error_total_stmt)).scalar_one() or 0)
-
-        events_total_stmt = sa.select(sa.func.count()).where(events.c.created_at >= since)
-        events_total = int((await session.execute(events_total_stmt)).scalar_one() or 0)
-
-        tasks_done_stmt = sa.select(sa.func.count()).where(
-            tasks.c.updated_at >= since,
-            tasks.c.status == "DONE",
-        )
-        tasks_done_total = int((await session.execute(tasks_done_stmt)).scalar_one() or 0)
+        rollup_row = (
+            await session.execute(
+                sa.select(
+                    sa.func.coalesce(sa.func.sum(events_minute_rollup.c.events), 0).label("events_total"),
+                    sa.func.coalesce(
+                        sa.func.sum(events_minute_rollup.c.events).filter(
+                            events_minute_rollup.c.event_type == "chat.gateway.access"
+                        ),
+                        0,
+                    ).label("request_total"),
+                    sa.func.coalesce(
+                        sa.func.sum(events_minute_rollup.c.events).filter(events_minute_rollup.c.is_error.is_(True)),
+                        0,
+                    ).label("error_total"),
+                    sa.func.max(events_minute_rollup.c.updated_at).label("data_as_of"),
+                ).where(events_minute_rollup.c.bucket_minute >= since)
+            )
+        ).one()
+        request_total = int(rollup_row.request_total or 0)
+        error_total = int(rollup_row.error_total or 0)
+        events_total = int(rollup_row.events_total or 0)
+        data_as_of = rollup_row.data_as_of
+        if data_as_of is None:
+            data_as_of = (
+                await session.execute(
+                    sa.select(events_minute_rollup.c.updated_at)
+                    .order_by(events_minute_rollup.c.bucket_minute.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
 
-        task_backlog_stmt = sa.select(sa.func.count()).where(tasks.c.status != "DONE")
-        task_backlog_total = int((await session.execute(task_backlog_stmt)).scalar_one() or 0)
+        task_row = (
+            await session.execute(
+                sa.select(
+                    sa.func.count().filter(tasks.c.status == "DONE", tasks.c.updated_at >= since).label("done_total"),
+                    sa.func.count().filter(tasks.c.status != "DONE").label("backlog_total"),
+                )
+            )
+        ).one()
+        tasks_done_total = int(task_row.done_total or 0)
+        task_backlog_total = int(task_row.backlog_total or 0)
 
         try:
             event_backlog_total = int(await redis.xlen(settings.redis_stream_key))
         except Exception:
             event_backlog_total = 0
 
-        known_agents = sorted(_known_agent_slugs(settings))
+        known_agents = sorted(agent_registry.known_slugs())
         total_agents = len(known_agents)
         healthy_agents = 0
 
         if known_agents:
-            heartbeats_stmt = (
-                sa.select(events.c.agent, sa.func.max(events.c.created_at).label("last_seen"))
-                .where(
-                    events.c.type == "agent.heartbeat",
-                    events.c.agent.is_not(None),
-                    events.c.agent.in_(known_agents),
-                )
-                .group_by(events.c.agent)
-            )
-            rows = (await session.execute(heartbeats_stmt)).all()
             cutoff = now - timedelta(seconds=stale)
-            for row in rows:
-                last_seen = row.last_seen
-                if isinstance(last_seen, datetime) and last_seen >= cutoff:
-                    healthy_agents += 1
+            healthy_agents = int(
+                (
+                    await session.execute(
+                        sa.select(sa.func.count()).where(
+                            agent_heartbeats.c.agent.in_(known_agents),
+                            agent_heartbeats.c.last_seen_at >= cutoff,
+                        )
+                    )
+                ).scalar_one()
+                or 0
+            )
 
         denominator = request_total if request_total > 0 else max(events_total, 1)
         error_rate = float(error_total) / float(denominator)
@@ -2860,165 +4529,90 @@ def create_app() -> FastAPI:
             total_agents=total_agents,
             agent_health_ratio=(float(healthy_agents) / float(total_agents)) if total_agents > 0 else 0.0,
             heartbeat_stale_seconds=stale,
+            data_as_of=data_as_of,
+            data_age_seconds=max((now - data_as_of).total_seconds(), 0.0) if isinstance(data_as_of, datetime) else None,
         )
 
     @app.get("/v1/observability/container-health", response_model=ContainerHealthSummaryOut)
     async def get_container_health_summary(
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
-        session=Depends(get_session),
     ) -> ContainerHealthSummaryOut:
-        now = datetime.now(timezone.utc)
-        signals: list[HealthSignalOut] = []
-
-        redis_host, redis_port = _host_port_from_url(settings.redis_url, 6379)
-        db_host, db_port = _host_port_from_url(settings.database_url, 5432)
-
-        compose_ok = 0
-        compose_total = 0
-
-        compose_total += 1
-        redis_started = time.perf_counter()
-        try:
-            redis_ok = bool(await redis.ping())
-            redis_latency = int((time.perf_counter() - redis_started) * 1000)
-            if redis_ok:
-                compose_ok += 1
-            signals.append(
-                HealthSignalOut(
-                    name="redis.ping",
-                    source="compose",
-                    target=f"{redis_host or 'redis'}:{redis_port}",
-                    ok=redis_ok,
-                    latency_ms=redis_latency,
-                    detail="PONG" if redis_ok else "No PONG",
-                )
-            )
-        except Exception as exc:
-            signals.append(
-                HealthSignalOut(
-                    name="redis.ping",
-                    source="compose",
-                    target=f"{redis_host or 'redis'}:{redis_port}",
-                    ok=False,
-                    detail=f"{exc.__class__.__name__}: {exc}",
-                )
-            )
-
-        compose_total += 1
-        db_started = time.perf_counter()
-        try:
-            db_ok = bool((await session.execute(sa.select(sa.literal(1)))).scalar_one() == 1)
-            db_latency = int((time.perf_counter() - db_started) * 1000)
-            if db_ok:
-                compose_ok += 1
-            signals.append(
-                HealthSignalOut(
-                    name="postgres.select_1",
-                    source="compose",
-                    target=f"{db_host or 'postgres'}:{db_port}",
-                    ok=db_ok,
-                    latency_ms=db_latency,
-                    detail="SELECT 1",
-                )
-            )
-        except Exception as exc:
-            signals.append(
-                HealthSignalOut(
-                    name="postgres.select_1",
-                    source="compose",
-                    target=f"{db_host or 'postgres'}:{db_port}",
-                    ok=False,
-                    detail=f"{exc.__class__.__name__}: {exc}",
-                )
-            )
-
-        port_targets: list[tuple[str, str, int]] = [
-            ("mission-control-api", "mission-control-api", 9090),
-            ("mission-control-ui", "mission-control-ui", 9090),
-            ("mission-control-gateway", "mission-control-gateway", 80),
+        generated_at, cached_signals = await health_prober.snapshot()
+        signals = [
+            HealthSignalOut(**{**item, "latency_history_ms": list(item["latency_history_ms"])})
+            for item in cached_signals
         ]
-        for slug in sorted(_known_agent_slugs(settings)):
-            port_targets.append((f"openclaw-{slug}", f"openclaw-{slug}", settings.chat_upstream_port))
+        totals = {source: [0, 0] for source in ("compose", "port", "http")}
+        for signal in signals:
+            counts = totals.setdefault(signal.source, [0, 0])
+            counts[1] += 1
+            if signal.ok:
+                counts[0] += 1
 
-        port_ok = 0
-        port_total = len(port_targets)
-        for name, host, port in port_targets:
-            ok, latency_ms, detail = await _probe_tcp(host, port)
-            if ok:
-                port_ok += 1
-            signals.append(
-                HealthSignalOut(
-                    name=name,
-                    source="port",
-                    target=f"{host}:{port}",
-                    ok=ok,
-                    latency_ms=latency_ms,
-                    detail=detail,
-                )
-            )
-
-        http_targets: list[tuple[str, str]] = [
-            ("mission-control-api.health", "http://mission-control-api:9090/health"),
-            ("mission-control-gateway.root", "http://mission-control-gateway/"),
-            ("mission-control-ui.root", "http://mission-control-ui:9090/"),
-        ]
-
-        http_ok = 0
-        http_total = len(http_targets)
-        for name, url in http_targets:
-            ok, latency_ms, detail = await _probe_http(url)
-            if ok:
-                http_ok += 1
-            signals.append(
-                HealthSignalOut(
-                    name=name,
-                    source="http",
-                    target=url,
-                    ok=ok,
-                    latency_ms=latency_ms,
-                    detail=detail,
-                )
-            )
-
-        overall_ok = compose_ok + port_ok + http_ok
-        overall_total = compose_total + port_total + http_total
+        overall_ok = sum(counts[0] for counts in totals.values())
+        overall_total = sum(counts[1] for counts in totals.values())
 
         return ContainerHealthSummaryOut(
-            generated_at=now,
-            compose_ok=compose_ok,
-            compose_total=compose_total,
-            port_ok=port_ok,
-            port_total=port_total,
-            http_ok=http_ok,
-            http_total=http_total,
+            generated_at=generated_at,
+            compose_ok=totals["compose"][0],
+            compose_total=totals["compose"][1],
+            port_ok=totals["port"][0],
+            port_total=totals["port"][1],
+            http_ok=totals["http"][0],
+            http_total=totals["http"][1],
             overall_ok=overall_ok,
             overall_total=overall_total,
             overall_ratio=(float(overall_ok) / float(overall_total)) if overall_total > 0 else 0.0,
+            probe_duration_ms=health_prober.last_duration_ms,
             signals=signals,
         )
 
     @app.get("/v1/skills/global", response_model=list[SkillItem])
     async def get_global_skills(
+        request: Request,
+        response: Response,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
     ) -> list[SkillItem]:
-        return _scan_global_skills(settings)
+        catalog = await skills_catalog.get()
+        not_modified = _not_modified(request, response, _skills_catalog_etag("global", skills_catalog.digest))
+        if not_modified is not None:
+            return not_modified
+        return list(catalog.get("global_skills") or [])
 
     @app.get("/v1/skills/workspace", response_model=list[WorkspaceSkillGroup])
     async def get_workspace_skills(
+        request: Request,
+        response: Response,
         agent_slug: str | None = None,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
     ) -> list[WorkspaceSkillGroup]:
-        return _scan_workspace_skills(settings, agent_slug=agent_slug)
+        catalog = await skills_catalog.get()
+        not_modified = _not_modified(request, response, _skills_catalog_etag(f"workspace-{agent_slug or ''}", skills_catalog.digest))
+        if not_modified is not None:
+            return not_modified
+        return [
+            group
+            for group in catalog.get("workspace_groups") or []
+            if not agent_slug or group.agent_slug == agent_slug
+        ]
 
     @app.get("/v1/skills/inventory", response_model=list[SkillInventoryItem])
     async def get_skill_inventory(
+        request: Request,
+        response: Response,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> list[SkillInventoryItem]:
+        catalog = await skills_catalog.get()
+        catalog_digest = skills_catalog.digest
         _, _, global_skills, workspace_groups, mapping_rows, details_by_agent = await _load_skills_snapshot(
             settings,
             session,
+            catalog,
         )
+        not_modified = _not_modified(request, response, _skills_catalog_etag("inventory", catalog_digest, mapping_rows))
+        if not_modified is not None:
+            return not_modified
         return _build_skill_inventory(
             global_skills=global_skills,
             workspace_groups=workspace_groups,
@@ -3028,13 +4622,21 @@ def create_app() -> FastAPI:
 
     @app.get("/v1/skills/report", response_model=SkillsReportOut)
     async def get_skills_report(
+        request: Request,
+        response: Response,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> SkillsReportOut:
+        catalog = await skills_catalog.get()
+        catalog_digest = skills_catalog.digest
         ordered_agents, _, global_skills, workspace_groups, mapping_rows, details_by_agent = await _load_skills_snapshot(
             settings,
             session,
+            catalog,
         )
+        not_modified = _not_modified(request, response, _skills_catalog_etag("report", catalog_digest, mapping_rows))
+        if not_modified is not None:
+            return not_modified
         return _build_skills_report(
             ordered_agents=ordered_agents,
             global_skills=global_skills,
@@ -3045,10 +4647,17 @@ def create_app() -> FastAPI:
 
     @app.get("/v1/skills/agents", response_model=list[AgentSkillsDetailOut])
     async def get_agent_skills_details(
+        request: Request,
+        response: Response,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> list[AgentSkillsDetailOut]:
-        ordered_agents, _, _, _, _, details_by_agent = await _load_skills_snapshot(settings, session)
+        catalog = await skills_catalog.get()
+        catalog_digest = skills_catalog.digest
+        ordered_agents, _, _, _, mapping_rows, details_by_agent = await _load_skills_snapshot(settings, session, catalog)
+        not_modified = _not_modified(request, response, _skills_catalog_etag("agents", catalog_digest, mapping_rows))
+        if not_modified is not None:
+            return not_modified
         return [details_by_agent[slug] for slug in ordered_agents if slug in details_by_agent]
 
     @app.get("/v1/skills/agents/{agent_slug}", response_model=AgentSkillsDetailOut)
@@ -3061,7 +4670,8 @@ def create_app() -> FastAPI:
         if not slug:
             raise HTTPException(status_code=400, detail="agent_slug is required")
 
-        _, _, _, _, _, details_by_agent = await _load_skills_snapshot(settings, session, agent_slug=slug)
+        catalog = await skills_catalog.get()
+        _, _, _, _, _, details_by_agent = await _load_skills_snapshot(settings, session, catalog, agent_slug=slug)
         detail = details_by_agent.get(slug)
         if detail is None:
             raise HTTPException(status_code=404, detail=f"unknown agent: {slug}")
@@ -3167,7 +4777,10 @@ def create_app() -> FastAPI:
             await session.commit()
             await publish_event(redis, stream_key=settings.redis_stream_key, event=queued_event)
 
-        _, _, _, _, _, details_by_agent = await _load_skills_snapshot(settings, session, agent_slug=agent_slug)
+        if updated:
+            await skills_catalog.refresh()
+        catalog = await skills_catalog.get()
+        _, _, _, _, _, details_by_agent = await _load_skills_snapshot(settings, session, catalog, agent_slug=agent_slug)
         detail = details_by_agent[agent_slug]
         return AgentSkillRuntimeConfigPatchOut(
             updated=updated,
@@ -3185,14 +4798,45 @@ def create_app() -> FastAPI:
     async def get_agent_usage_snapshot(
         days: int = 7,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
     ) -> list[AgentUsageSnapshotOut]:
-        return _get_agent_usage_snapshot(settings, days)
+        return await _load_agent_usage_snapshot(session, settings, days)
+
+    @app.get("/v1/usage/agents/timeseries", response_model=AgentUsageTimeseriesOut)
+    async def get_agent_usage_timeseries(
+        start: datetime | None = None,
+        end: datetime | None = None,
+        resolution: str = "hour",
+        agent: str | None = None,
+        model: str | None = None,
+        by_model: bool = True,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> AgentUsageTimeseriesOut:
+        normalized_resolution = str(resolution or "").strip().lower()
+        start_at, end_at = _usage_timeseries_range(start, end, normalized_resolution)
+        series = await _load_agent_usage_timeseries(
+            session,
+            start=start_at,
+            end=end_at,
+            resolution=normalized_resolution,
+            agent=(agent or "").strip() or None,
+            model=model.strip() if model is not None else None,
+            by_model=by_model,
+        )
+        return AgentUsageTimeseriesOut(
+            resolution=normalized_resolution,
+            start=start_at,
+            end=end_at,
+            by_model=by_model,
+            series=series,
+        )
 
     @app.get("/v1/agents/catalog", response_model=list[AgentCatalogItemOut])
     async def get_agent_catalog(
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
     ) -> list[AgentCatalogItemOut]:
-        return [AgentCatalogItemOut(**item) for item in build_agent_catalog(settings)]
+        return [AgentCatalogItemOut(**item) for item in agent_registry.catalog()]
 
     @app.post("/v1/knowledge/sources/import", response_model=KnowledgeSourceOut)
     async def import_knowledge_source(
@@ -3231,7 +4875,7 @@ def create_app() -> FastAPI:
         if existing:
             return _knowledge_source_row_to_out(existing)
 
-        checksum = _sha256sum(target)
+        checksum = await extraction_executor.sha256sum(target)
         mime_type = _guess_mime_type(target)
         source_id = uuid4()
         now = datetime.utcnow()
@@ -3349,76 +4993,209 @@ def create_app() -> FastAPI:
 
         max_files = min(max(int(body.max_files or 200), 1), 2000)
         extension_filter = {str(ext).lower().lstrip(".") for ext in body.include_extensions if str(ext).strip()}
+        source_type = (body.source_type or "file").strip() or "file"
+        scan_meta = {"scanned_from": str(scan_root.relative_to(root)) if scan_root != root else "."}
+        hash_limiter = asyncio.Semaphore(max(int(settings.knowledge_scan_hash_workers), 1))
+
+        async def hash_file(file_path: Path) -> str:
+            async with hash_limiter:
+                return await extraction_executor.sha256sum(file_path)
 
         scanned = 0
         imported = 0
         skipped_existing = 0
         skipped_invalid = 0
+        updated = 0
+        hashed = 0
+        index_hits = 0
+        last_path: str | None = None
         items: list[KnowledgeSourceOut] = []
 
         now = datetime.utcnow()
-        for file_path in sorted(path for path in scan_root.rglob("*") if path.is_file()):
-            if scanned >= max_files:
+        files = iter_source_files(scan_root, after=body.cursor)
+        while scanned < max_files:
+            batch = await asyncio.to_thread(next_batch, files, min(KNOWLEDGE_SCAN_BATCH_SIZE, max_files - scanned))
+            if not batch:
                 break
-            scanned += 1
+            scanned += len(batch)
+            last_path = batch[-1][0]
 
-            if extension_filter:
-                ext = file_path.suffix.lower().lstrip(".")
-                if ext not in extension_filter:
+            candidates: dict[str, tuple[Path, os.stat_result]] = {}
+            for relative_path, stat in batch:
+                file_path = scan_root / relative_path
+                if extension_filter and file_path.suffix.lower().lstrip(".") not in extension_filter:
                     skipped_invalid += 1
                     continue
-
-            storage_path = _relative_storage_path(root, file_path)
-            exists = (
-                await session.execute(
-                    sa.select(knowledge_sources.c.id).where(knowledge_sources.c.storage_path == storage_path)
-                )
-            ).first()
-            if exists:
-                skipped_existing += 1
+                candidates[str(file_path.relative_to(root))] = (file_path, stat)
+            if not candidates:
                 continue
 
-            checksum = _sha256sum(file_path)
-            mime_type = _guess_mime_type(file_path)
-            out = KnowledgeSourceOut(
-                id=uuid4(),
-                source_type=(body.source_type or "file").strip() or "file",
-                title=file_path.stem,
-                external_uri=None,
-                storage_path=storage_path,
-                checksum_sha256=checksum,
-                mime_type=mime_type,
-                owner=body.owner,
-                version_label=body.version_label,
-                status="active",
-                meta={"scanned_from": str(scan_root.relative_to(root)) if scan_root != root else "."},
-                collected_at=now,
-                updated_at=now,
+            storage_paths = list(candidates)
+            existing_sources = {
+                row.storage_path: row
+                for row in (
+                    await session.execute(
+                        sa.select(
+                            knowledge_sources.c.id,
+                            knowledge_sources.c.storage_path,
+                            knowledge_sources.c.checksum_sha256,
+                        ).where(
+                            knowledge_sources.c.storage_path
+                            == sa.any_(sa.bindparam("storage_paths", storage_paths, type_=sa.ARRAY(sa.Text)))
+                        )
+                    )
+                ).all()
+            }
+            indexed_files = {
+                row.storage_path: row
+                for row in (
+                    await session.execute(
+                        sa.select(
+                            knowledge_source_file_index.c.storage_path,
+                            knowledge_source_file_index.c.size_bytes,
+                            knowledge_source_file_index.c.mtime_ns,
+                            knowledge_source_file_index.c.inode,
+                            knowledge_source_file_index.c.checksum_sha256,
+                        ).where(
+                            knowledge_source_file_index.c.storage_path
+                            == sa.any_(sa.bindparam("storage_paths", storage_paths, type_=sa.ARRAY(sa.Text)))
+                        )
+                    )
+                ).all()
+            }
+
+            checksums: dict[str, str] = {}
+            to_hash: list[str] = []
+            for storage_path, (_, stat) in candidates.items():
+                indexed = indexed_files.get(storage_path)
+                if indexed is not None and (indexed.size_bytes, indexed.mtime_ns, indexed.inode) == stat_signature(stat):
+                    checksums[storage_path] = indexed.checksum_sha256
+                    index_hits += 1
+                else:
+                    to_hash.append(storage_path)
+
+            index_rows: list[dict] = []
+            digests = await asyncio.gather(
+                *(hash_file(candidates[storage_path][0]) for storage_path in to_hash),
+                return_exceptions=True,
             )
-            items.append(out)
+            for storage_path, digest in zip(to_hash, digests):
+                if isinstance(digest, OSError):
+                    skipped_invalid += 1
+                    continue
+                if isinstance(digest, BaseException):
+                    raise digest
+                checksums[storage_path] = digest
+                hashed += 1
+                size_bytes, mtime_ns, inode = stat_signature(candidates[storage_path][1])
+                index_rows.append(
+                    {
+                        "storage_path": storage_path,
+                        "size_bytes": size_bytes,
+                        "mtime_ns": mtime_ns,
+                        "inode": inode,
+                        "checksum_sha256": digest,
+                        "indexed_at": now,
+                    }
+                )
+
+            new_sources: list[KnowledgeSourceOut] = []
+            changed_sources: list[tuple[UUID, str]] = []
+            for storage_path, (file_path, _) in candidates.items():
+                checksum = checksums.get(storage_path)
+                if checksum is None:
+                    continue
+                existing = existing_sources.get(storage_path)
+                if existing is not None:
+                    if existing.checksum_sha256 == checksum:
+                        skipped_existing += 1
+                    else:
+                        changed_sources.append((existing.id, checksum))
+                    continue
+                new_sources.append(
+                    KnowledgeSourceOut(
+                        id=uuid4(),
+                        source_type=source_type,
+                        title=file_path.stem,
+                        external_uri=None,
+                        storage_path=storage_path,
+                        checksum_sha256=checksum,
+                        mime_type=_guess_mime_type(file_path),
+                        owner=body.owner,
+                        version_label=body.version_label,
+                        status="active",
+                        meta=scan_meta,
+                        collected_at=now,
+                        updated_at=now,
+                    )
+                )
 
             if body.dry_run:
-                imported += 1
+                imported += len(new_sources)
+                updated += len(changed_sources)
+                items.extend(new_sources[: max(200 - len(items), 0)])
                 continue
 
-            await session.execute(
-                knowledge_sources.insert().values(
-                    id=out.id,
-                    source_type=out.source_type,
-                    title=out.title,
-                    external_uri=out.external_uri,
-                    storage_path=out.storage_path,
-                    checksum_sha256=out.checksum_sha256,
-                    mime_type=out.mime_type,
-                    owner=out.owner,
-                    version_label=out.version_label,
-                    status=out.status,
-                    meta=out.meta,
-                    collected_at=out.collected_at,
-                    updated_at=out.updated_at,
+            if new_sources:
+                inserted_ids = set(
+                    (
+                        await session.execute(
+                            pg_insert(knowledge_sources)
+                            .values(
+                                [
+                                    {
+                                        "id": out.id,
+                                        "source_type": out.source_type,
+                                        "title": out.title,
+                                        "external_uri": out.external_uri,
+                                        "storage_path": out.storage_path,
+                                        "checksum_sha256": out.checksum_sha256,
+                                        "mime_type": out.mime_type,
+                                        "owner": out.owner,
+                                        "version_label": out.version_label,
+                                        "status": out.status,
+                                        "meta": out.meta,
+                                        "collected_at": out.collected_at,
+                                        "updated_at": out.updated_at,
+                                    }
+                                    for out in new_sources
+                                ]
+                            )
+                            .on_conflict_do_nothing(index_elements=[knowledge_sources.c.storage_path])
+                            .returning(knowledge_sources.c.id)
+                        )
+                    ).scalars()
+                )
+                for out in new_sources:
+                    if out.id not in inserted_ids:
+                        skipped_existing += 1
+                        continue
+                    imported += 1
+                    if len(items) < 200:
+                        items.append(out)
+
+            for source_id, checksum in changed_sources:
+                await session.execute(
+                    knowledge_sources.update()
+                    .where(knowledge_sources.c.id == source_id)
+                    .values(checksum_sha256=checksum, updated_at=now)
+                )
+                updated += 1
+
+            if index_rows:
+                index_insert = pg_insert(knowledge_source_file_index).values(index_rows)
+                await session.execute(
+                    index_insert.on_conflict_do_update(
+                        index_elements=[knowledge_source_file_index.c.storage_path],
+                        set_={
+                            "size_bytes": index_insert.excluded.size_bytes,
+                            "mtime_ns": index_insert.excluded.mtime_ns,
+                            "inode": index_insert.excluded.inode,
+                            "checksum_sha256": index_insert.excluded.checksum_sha256,
+                            "indexed_at": index_insert.excluded.indexed_at,
+                        },
+                    )
                 )
-            )
-            imported += 1
 
         if not body.dry_run:
             await session.commit()
@@ -3428,14 +5205,19 @@ def create_app() -> FastAPI:
             imported=imported,
             skipped_existing=skipped_existing,
             skipped_invalid=skipped_invalid,
+            updated=updated,
+            hashed=hashed,
+            index_hits=index_hits,
+            next_cursor=last_path if scanned >= max_files else None,
             dry_run=body.dry_run,
-            items=items[: min(len(items), 200)],
+            items=items,
         )
 
     @app.post("/v1/knowledge/sources/{source_id}/chunk", response_model=KnowledgeSourceChunkOut)
     async def chunk_knowledge_source(
         source_id: UUID,
         body: KnowledgeSourceChunkIn,
+        request: Request,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> KnowledgeSourceChunkOut:
@@ -3443,232 +5225,125 @@ def create_app() -> FastAPI:
             embedding_config = _knowledge_embedding_runtime_config(settings)
         except ValueError as exc:
             raise HTTPException(status_code=503, detail=str(exc)) from exc
-
-        source_row = (
-            await session.execute(
-                sa.select(
-                    knowledge_sources.c.id,
-                    knowledge_sources.c.storage_path,
-                    knowledge_sources.c.title,
-                    knowledge_sources.c.source_type,
-                    knowledge_sources.c.meta,
-                ).where(knowledge_sources.c.id == source_id)
-            )
-        ).first()
-        if not source_row:
-            raise HTTPException(status_code=404, detail="knowledge source not found")
-
-        root = Path(settings.knowledge_raw_sources_dir).resolve()
-        source_path = _safe_resolve_under(root, source_row.storage_path)
-        if not source_path.exists() or not source_path.is_file():
-            raise HTTPException(status_code=422, detail="knowledge source file not found")
-
-        ocr_languages = _normalize_ocr_languages(body.ocr_languages)
-        max_pdf_pages = _normalize_max_pdf_pages(body.max_pdf_pages)
-
-        try:
-            raw_text, extraction_method, extraction_warnings, extraction_meta = _extract_source_text(
-                source_path,
-                ocr_enabled=body.ocr_enabled,
-                ocr_languages=ocr_languages,
-                max_pdf_pages=max_pdf_pages,
-            )
-        except Exception as exc:
-            now = datetime.utcnow()
-            source_meta = dict(source_row.meta or {})
-            source_meta.update(
-                {
-                    "parse_status": "failed",
-                    "parse_error": str(exc),
-                    "ocr_enabled": bool(body.ocr_enabled),
-                    "ocr_languages": ocr_languages,
-                    "max_pdf_pages": max_pdf_pages,
-                    "ocr_used": source_path.suffix.lower().lstrip(".") in KNOWLEDGE_OCR_CANDIDATE_EXTENSIONS,
-                    "ocr_fallback_used": False,
-                }
-            )
-            await session.execute(
-                knowledge_sources.update()
-                .where(knowledge_sources.c.id == source_id)
-                .values(
-                    meta=source_meta,
-                    updated_at=now,
-                )
-            )
-            await session.commit()
-            raise HTTPException(status_code=422, detail=str(exc)) from exc
-
-        chunk_list = _split_text_chunks(
-            raw_text,
-            chunk_chars=body.chunk_chars,
-            overlap=body.chunk_overlap,
-            max_chunks=min(max(int(body.max_chunks or 200), 1), 1000),
-        )
-        now = datetime.utcnow()
-        created = 0
-        skipped_existing = 0
-        items: list[KnowledgeUnitOut] = []
-        embedding_failed_count = 0
-        embedding_status = "disabled"
-        embedding_error: str | None = None
-        embedding_model_name: str | None = None
-        embedding_dimensions: int | None = None
-
-        for index, chunk in enumerate(chunk_list, start=1):
-            unit_key = f"source:{source_id}:chunk:{index:04d}"
-            exists = (
-                await session.execute(sa.select(knowledge_units.c.id).where(knowledge_units.c.unit_key == unit_key))
-            ).first()
-            if exists:
-                skipped_existing += 1
-                continue
-
-            unit_out = KnowledgeUnitOut(
-                id=uuid4(),
+        return await _cancel_on_disconnect(
+            request,
+            _chunk_knowledge_source(
+                session,
+                settings=settings,
+                embedding_client=embedding_client,
+                extraction_executor=extraction_executor,
+                embedding_config=embedding_config,
                 source_id=source_id,
-                unit_key=unit_key,
-                title=f"{source_row.title} #{index}",
-                content=chunk,
-                content_sha256=hashlib.sha256(chunk.encode("utf-8")).hexdigest(),
-                tags=list({*body.tags, "auto-chunk"}),
-                agent_scope=body.agent_scope,
-                risk_level=(body.risk_level or "normal").strip().lower() or "normal",
-                status="active",
-                lifecycle_stage="active",
-                meta={
-                    "generated_by": "source_chunker",
-                    "chunk_index": index,
-                    "source_storage_path": source_row.storage_path,
-                    "owner": body.owner,
-                },
-                created_at=now,
-                updated_at=now,
-            )
-            items.append(unit_out)
-            created += 1
-
-        embedding_vectors: list[list[float]] = []
-        if body.dry_run:
-            embedding_status = "skipped_dry_run"
-        elif not embedding_config:
-            embedding_status = "disabled"
-        elif not items:
-            embedding_status = "skipped_no_new_units"
-            embedding_model_name = str(embedding_config["model"])
-            if embedding_config.get("dimensions") is not None:
-                embedding_dimensions = int(embedding_config["dimensions"])
-        else:
-            try:
-                embedding_vectors, embedding_model_name, embedding_dimensions = await _request_knowledge_embeddings(
-                    [item.content for item in items],
-                    config=embedding_config,
-                )
-                embedding_status = "success"
-            except Exception as exc:
-                embedding_status = "failed"
-                embedding_error = str(exc)
-                embedding_failed_count = len(items)
-                embedding_model_name = str(embedding_config["model"])
-
-        for index, unit_out in enumerate(items):
-            unit_meta = dict(unit_out.meta or {})
-            unit_meta.update(
-                {
-                    "embedding_enabled": bool(embedding_config),
-                    "embedding_status": embedding_status,
-                }
-            )
-            if embedding_model_name:
-                unit_meta["embedding_model"] = embedding_model_name
-            if embedding_dimensions is not None:
-                unit_meta["embedding_dimensions"] = embedding_dimensions
-            if embedding_error:
-                unit_meta["embedding_error"] = embedding_error
-            if embedding_vectors:
-                unit_meta["embedding_updated_at"] = now.isoformat() + "Z"
-            unit_out.meta = unit_meta
-
-            if not body.dry_run:
-                await session.execute(
-                    knowledge_units.insert().values(
-                        id=unit_out.id,
-                        source_id=unit_out.source_id,
-                        unit_key=unit_out.unit_key,
-                        title=unit_out.title,
-                        content=unit_out.content,
-                        content_sha256=unit_out.content_sha256,
-                        tags=unit_out.tags,
-                        agent_scope=unit_out.agent_scope,
-                        risk_level=unit_out.risk_level,
-                        status=unit_out.status,
-                        lifecycle_stage=unit_out.lifecycle_stage,
-                        superseded_by_unit_id=unit_out.superseded_by_unit_id,
-                        retired_at=unit_out.retired_at,
-                        meta=unit_out.meta,
-                        created_at=unit_out.created_at,
-                        updated_at=unit_out.updated_at,
-                    )
-                )
-
-                if embedding_vectors:
-                    await _upsert_knowledge_unit_embedding(
-                        session,
-                        unit_id=unit_out.id,
-                        embedding_model=str(embedding_model_name or embedding_config["model"]),
-                        embedding_dimensions=int(embedding_dimensions or len(embedding_vectors[index])),
-                        content_sha256=unit_out.content_sha256 or "",
-                        embedding_values=embedding_vectors[index],
-                        meta={
-                            "source_id": str(source_id),
-                            "unit_key": unit_out.unit_key,
-                            "generated_by": "knowledge_chunk_embedding",
-                        },
-                        now=now,
-                    )
-
-        source_meta_update = dict(source_row.meta or {})
-        source_meta_update.update(
-            {
-                "parse_status": "success",
-                "parse_error": None,
-                "parser": extraction_method,
-                "text_chars": len(raw_text),
-                "extraction_warnings": extraction_warnings,
-                "ocr_enabled": bool(body.ocr_enabled),
-                "ocr_languages": ocr_languages,
-                "max_pdf_pages": max_pdf_pages,
-                "embedding_enabled": bool(embedding_config),
-                "embedding_status": embedding_status,
-                "embedding_model": embedding_model_name,
-                "embedding_dimensions": embedding_dimensions,
-                "embedding_created_count": len(embedding_vectors),
-                "embedding_failed_count": embedding_failed_count,
-                "embedding_updated_at": now.isoformat() + "Z" if embedding_vectors else None,
-                "embedding_error": embedding_error,
-                **extraction_meta,
-            }
+                body=body,
+            ),
         )
-        await session.execute(
-            knowledge_sources.update()
-            .where(knowledge_sources.c.id == source_id)
-            .values(
-                meta=source_meta_update,
-                updated_at=now,
+
+    @app.post("/v1/knowledge/sources/{source_id}/chunk-jobs", response_model=KnowledgeIngestionJobOut, status_code=202)
+    async def enqueue_knowledge_source_chunk_job(
+        source_id: UUID,
+        body: KnowledgeSourceChunkIn,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> KnowledgeIngestionJobOut:
+        try:
+            _knowledge_embedding_runtime_config(settings)
+        except ValueError as exc:
+            raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+        source_exists = (
+            await session.execute(sa.select(knowledge_sources.c.id).where(knowledge_sources.c.id == source_id))
+        ).first()
+        if not source_exists:
+            raise HTTPException(status_code=404, detail="knowledge source not found")
+
+        now = datetime.utcnow()
+        row = (
+            await session.execute(
+                knowledge_ingestion_jobs.insert()
+                .values(
+                    id=uuid4(),
+                    job_type="source_chunk",
+                    source_id=source_id,
+                    status="queued",
+                    request=body.model_dump(mode="json"),
+                    stages={name: {"status": "pending"} for name in KNOWLEDGE_INGESTION_STAGES},
+                    attempts=0,
+                    created_at=now,
+                    updated_at=now,
+                )
+                .returning(*knowledge_ingestion_jobs.c)
             )
-        )
+        ).first()
+        await session.commit()
+        ingestion_wakeup.set()
+        return _knowledge_ingestion_job_row_to_out(row)
 
-        if not body.dry_run:
-            await session.commit()
+    @app.get("/v1/knowledge/jobs", response_model=list[KnowledgeIngestionJobOut])
+    async def list_knowledge_ingestion_jobs(
+        status: str | None = None,
+        source_id: UUID | None = None,
+        limit: int = 50,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> list[KnowledgeIngestionJobOut]:
+        stmt = sa.select(*knowledge_ingestion_jobs.c)
+        if status:
+            normalized_status = status.strip().lower()
+            if normalized_status not in KNOWLEDGE_INGESTION_JOB_STATUSES:
+                raise HTTPException(status_code=422, detail="invalid ingestion job status")
+            stmt = stmt.where(knowledge_ingestion_jobs.c.status == normalized_status)
+        if source_id:
+            stmt = stmt.where(knowledge_ingestion_jobs.c.source_id == source_id)
+        stmt = stmt.order_by(knowledge_ingestion_jobs.c.created_at.desc()).limit(min(max(limit, 1), 500))
+        rows = (await session.execute(stmt)).all()
+        return [_knowledge_ingestion_job_row_to_out(row) for row in rows]
 
-        return KnowledgeSourceChunkOut(
-            source_id=source_id,
-            scanned_chars=len(raw_text),
-            chunks_total=len(chunk_list),
-            created=created,
-            skipped_existing=skipped_existing,
-            dry_run=body.dry_run,
-            items=items[: min(len(items), 200)],
-        )
+    @app.get("/v1/knowledge/jobs/{job_id}", response_model=KnowledgeIngestionJobOut)
+    async def get_knowledge_ingestion_job(
+        job_id: UUID,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> KnowledgeIngestionJobOut:
+        row = (
+            await session.execute(sa.select(*knowledge_ingestion_jobs.c).where(knowledge_ingestion_jobs.c.id == job_id))
+        ).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="knowledge ingestion job not found")
+        return _knowledge_ingestion_job_row_to_out(row)
+
+    @app.post("/v1/knowledge/jobs/{job_id}/cancel", response_model=KnowledgeIngestionJobOut)
+    async def cancel_knowledge_ingestion_job(
+        job_id: UUID,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> KnowledgeIngestionJobOut:
+        row = (
+            await session.execute(
+                sa.select(knowledge_ingestion_jobs.c.status)
+                .where(knowledge_ingestion_jobs.c.id == job_id)
+                .with_for_update()
+            )
+        ).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="knowledge ingestion job not found")
+        now = datetime.utcnow()
+        if row.status == "queued":
+            values = {"status": "cancelled", "error": "cancelled by request", "finished_at": now, "updated_at": now}
+        elif row.status == "running":
+            values = {"status": "cancelling", "updated_at": now}
+        elif row.status in {"cancelling", "cancelled"}:
+            values = {}
+        else:
+            raise HTTPException(status_code=409, detail=f"ingestion job already {row.status}")
+        if values:
+            await session.execute(
+                knowledge_ingestion_jobs.update().where(knowledge_ingestion_jobs.c.id == job_id).values(**values)
+            )
+        updated = (
+            await session.execute(sa.select(*knowledge_ingestion_jobs.c).where(knowledge_ingestion_jobs.c.id == job_id))
+        ).first()
+        await session.commit()
+        return _knowledge_ingestion_job_row_to_out(updated)
 
     @app.post("/v1/knowledge/units", response_model=KnowledgeUnitOut)
     async def create_knowledge_unit(
@@ -3845,12 +5520,14 @@ def create_app() -> FastAPI:
             )
         )
         row = (await session.execute(stmt)).one()
+        await _upsert_current_validation(session, validation_row=row, now=now)
         await session.commit()
         return _knowledge_validation_row_to_out(row)
 
     @app.get("/v1/knowledge/validations", response_model=list[KnowledgeValidationOut])
     async def list_knowledge_validations(
         unit_id: UUID | None = None,
+        current_only: bool = False,
         limit: int = 100,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
@@ -3867,6 +5544,13 @@ def create_app() -> FastAPI:
             knowledge_validations.c.meta,
             knowledge_validations.c.created_at,
         )
+        if current_only:
+            stmt = stmt.select_from(
+                knowledge_validations.join(
+                    knowledge_unit_current_validation,
+                    knowledge_unit_current_validation.c.validation_id == knowledge_validations.c.id,
+                )
+            )
         if unit_id is not None:
             stmt = stmt.where(knowledge_validations.c.unit_id == unit_id)
         stmt = stmt.order_by(knowledge_validations.c.validated_at.desc()).limit(min(max(limit, 1), 500))
@@ -4031,6 +5715,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_bundle_row_to_out(row)
 
     @app.put("/v1/knowledge/validation-policy/bundles/{bundle_id}", response_model=KnowledgeValidationPolicyBundleOut)
@@ -4098,6 +5783,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_bundle_row_to_out(row)
 
     @app.get("/v1/knowledge/validation-policy/rules", response_model=list[KnowledgeValidationPolicyRuleOut])
@@ -4250,6 +5936,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_rule_row_to_out(row)
 
     @app.put("/v1/knowledge/validation-policy/rules/{rule_id}", response_model=KnowledgeValidationPolicyRuleOut)
@@ -4347,6 +6034,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_rule_row_to_out(row)
 
     @app.get("/v1/knowledge/validation-policy/rollouts", response_model=list[KnowledgeValidationPolicyRolloutOut])
@@ -4467,6 +6155,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_rollout_row_to_out(row)
 
     @app.put("/v1/knowledge/validation-policy/rollouts/{rollout_id}", response_model=KnowledgeValidationPolicyRolloutOut)
@@ -4550,6 +6239,7 @@ def create_app() -> FastAPI:
             now=now,
         )
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_rollout_row_to_out(row)
 
     @app.get("/v1/knowledge/resolve/ranking-profiles", response_model=list[KnowledgeResolveRankingProfileOut])
@@ -4839,6 +6529,7 @@ def create_app() -> FastAPI:
     ) -> KnowledgeValidationPolicyRollbackOut:
         result = await _rollback_policy_entity(session, entity_type="bundle", entity_id=bundle_id, actor=body.actor)
         await session.commit()
+        await publish_policy_invalidation()
         return result
 
     @app.post("/v1/knowledge/validation-policy/rollouts/{rollout_id}/rollback", response_model=KnowledgeValidationPolicyRollbackOut)
@@ -4850,6 +6541,7 @@ def create_app() -> FastAPI:
     ) -> KnowledgeValidationPolicyRollbackOut:
         result = await _rollback_policy_entity(session, entity_type="rollout", entity_id=rollout_id, actor=body.actor)
         await session.commit()
+        await publish_policy_invalidation()
         return result
 
     @app.put("/v1/knowledge/validation-policy/{risk_level}", response_model=KnowledgeValidationPolicyOut)
@@ -4904,6 +6596,7 @@ def create_app() -> FastAPI:
         )
         row = (await session.execute(stmt)).one()
         await session.commit()
+        await publish_policy_invalidation()
         return _knowledge_validation_policy_row_to_out(row)
 
     @app.post("/v1/knowledge/resolve", response_model=KnowledgeResolveOut)
@@ -4955,14 +6648,38 @@ def create_app() -> FastAPI:
                 )
             )
 
-        stmt = stmt.order_by(knowledge_units.c.updated_at.desc()).limit(500)
-        lexical_rows = (await session.execute(stmt)).all() if retrieval_mode in {"lexical", "hybrid"} else []
+        lexical_query_text = _lexical_tsquery_text(body.task)
+        lexical_limit = min(
+            max(int(body.lexical_limit or max(limit * 10, 100)), limit),
+            KNOWLEDGE_LEXICAL_MAX_CANDIDATES,
+        )
+        lexical_rows: list = []
+        if retrieval_mode in {"lexical", "hybrid"}:
+            if lexical_query_text:
+                lexical_rank = _lexical_rank_expression(lexical_query_text).label("lexical_rank")
+                lexical_stmt = (
+                    stmt.add_columns(lexical_rank)
+                    .where(knowledge_units.c.search_tsv.op("@@")(_lexical_tsquery(lexical_query_text)))
+                    .order_by(lexical_rank.desc(), knowledge_units.c.updated_at.desc())
+                    .limit(lexical_limit)
+                )
+                lexical_rows = list((await session.execute(lexical_stmt)).all())
+            if len(lexical_rows) < limit:
+                fallback_stmt = stmt.add_columns(sa.literal(0.0).label("lexical_rank"))
+                matched_ids = [row.id for row in lexical_rows]
+                if matched_ids:
+                    fallback_stmt = fallback_stmt.where(knowledge_units.c.id.not_in(matched_ids))
+                fallback_stmt = fallback_stmt.order_by(knowledge_units.c.updated_at.desc()).limit(
+                    lexical_limit - len(lexical_rows)
+                )
+                lexical_rows.extend((await session.execute(fallback_stmt)).all())
         policy, policy_metadata = await _resolve_validation_policy(
             session,
             task=body.task,
             agent_slug=body.agent_slug,
             source_type=body.source_type,
             risk_level=body.risk_level,
+            cache_ttl_seconds=settings.knowledge_policy_cache_ttl_seconds,
         )
 
         semantic_rows: list[dict] = []
@@ -4987,8 +6704,8 @@ def create_app() -> FastAPI:
                 )
 
             try:
-                vectors, model_name, actual_dimensions = await _request_knowledge_embeddings(
-                    [semantic_query],
+                query_vector, model_name, actual_dimensions = await request_query_embedding(
+                    semantic_query,
                     config=embedding_config,
                 )
             except Exception as exc:
@@ -5018,7 +6735,7 @@ def create_app() -> FastAPI:
             semantic_limit = min(max(int(body.semantic_limit or max(limit * 2, 20)), limit), 100)
             semantic_rows = await _search_knowledge_units_by_embedding(
                 session,
-                query_embedding=vectors[0],
+                query_embedding=query_vector,
                 embedding_model=selected_model,
                 embedding_dimensions=int(actual_dimensions),
                 limit=semantic_limit,
@@ -5036,19 +6753,44 @@ def create_app() -> FastAPI:
 
         candidate_rows_by_unit_id: dict[str, dict] = {}
         retrieval_channels_by_unit_id: dict[str, set[str]] = {}
+        lexical_rank_by_unit_id: dict[str, float] = {}
         for row in lexical_rows:
             mapping = _coerce_row_mapping(row)
             unit_id = str(mapping["id"])
             candidate_rows_by_unit_id[unit_id] = mapping
             retrieval_channels_by_unit_id.setdefault(unit_id, set()).add("lexical")
+            lexical_rank_by_unit_id[unit_id] = float(mapping.get("lexical_rank") or 0.0)
         for row in semantic_rows:
             mapping = _coerce_row_mapping(row)
             unit_id = str(mapping["id"])
             candidate_rows_by_unit_id[unit_id] = mapping
             retrieval_channels_by_unit_id.setdefault(unit_id, set()).add("semantic")
+        lexical_rank_by_unit_id.update(
+            await _load_lexical_ranks(
+                session,
+                [row["id"] for row in semantic_rows if str(row["id"]) not in lexical_rank_by_unit_id],
+                lexical_query_text,
+            )
+        )
 
         rows = list(candidate_rows_by_unit_id.values())
 
+        latest_validation_by_unit_id: dict[str, dict] = {}
+        for row in semantic_rows:
+            if "latest_validation_status" in row:
+                latest_validation_by_unit_id[str(row["id"])] = {
+                    "validation_status": row["latest_validation_status"],
+                    "expires_at": row["latest_validation_expires_at"],
+                    "confidence": row["latest_validation_confidence"],
+                    "validated_at": row["latest_validation_validated_at"],
+                }
+        latest_validation_by_unit_id.update(
+            await _load_latest_validations(
+                session,
+                [row["id"] for row in rows if str(row["id"]) not in latest_validation_by_unit_id],
+            )
+        )
+
         now = datetime.now(timezone.utc)
         selected_items: list[KnowledgeResolveItemOut] = []
         selected_payload: list[dict] = []
@@ -5062,25 +6804,13 @@ def create_app() -> FastAPI:
             if _risk_rank(row["risk_level"]) > requested_rank:
                 reject_reason = "unit_risk_exceeds_requested"
 
-            latest_validation = (
-                await session.execute(
-                    sa.select(
-                        knowledge_validations.c.validation_status,
-                        knowledge_validations.c.expires_at,
-                        knowledge_validations.c.confidence,
-                        knowledge_validations.c.validated_at,
-                    )
-                    .where(knowledge_validations.c.unit_id == row["id"])
-                    .order_by(knowledge_validations.c.validated_at.desc())
-                    .limit(1)
-                )
-            ).first()
+            latest_validation = latest_validation_by_unit_id.get(unit_id)
 
-            validation_status = latest_validation.validation_status if latest_validation else None
-            validation_expires_at = latest_validation.expires_at if latest_validation else None
-            validation_confidence_raw = latest_validation.confidence if latest_validation else None
+            validation_status = latest_validation["validation_status"] if latest_validation else None
+            validation_expires_at = latest_validation["expires_at"] if latest_validation else None
+            validation_confidence_raw = latest_validation["confidence"] if latest_validation else None
             validation_confidence = float(validation_confidence_raw) if validation_confidence_raw is not None else 0.0
-            validation_validated_at = latest_validation.validated_at if latest_validation else None
+            validation_validated_at = latest_validation["validated_at"] if latest_validation else None
 
             compare_expires_at = validation_expires_at
             if isinstance(compare_expires_at, datetime) and compare_expires_at.tzinfo is None:
@@ -5143,7 +6873,7 @@ def create_app() -> FastAPI:
                 continue
 
             matched_tags = len(set(body.tags).intersection(set(row["tags"] or []))) if body.tags else 0
-            lexical_overlap = _compute_lexical_overlap(body.task, row["title"], row["content"], list(row["tags"] or []))
+            lexical_overlap = lexical_rank_by_unit_id.get(unit_id, 0.0)
             lifecycle_adjustment = 0.0
             if str(row.get("lifecycle_stage") or "active").strip().lower() == "preferred":
                 lifecycle_adjustment = float(ranking_profile_row["preferred_bonus"])
@@ -5227,41 +6957,54 @@ def create_app() -> FastAPI:
         selected_ids = {str(item.unit.id) for item in selected}
         selected_payload = [item for item in selected_payload if item["unit_id"] in selected_ids]
 
-        await session.execute(
-            knowledge_resolve_audits.insert().values(
-                id=uuid4(),
-                task=body.task,
+        audit_payload = {
+            "retrieval_mode": retrieval_mode,
+            "ranking_profile": ranking_profile,
+            "ranking_profile_weights": {
+                "base_score": float(ranking_profile_row["base_score"]),
+                "lexical_weight": float(ranking_profile_row["lexical_weight"]),
+                "semantic_weight": float(ranking_profile_row["semantic_weight"]),
+                "tag_weight": float(ranking_profile_row["tag_weight"]),
+                "validation_confidence_weight": float(ranking_profile_row["validation_confidence_weight"]),
+                "approved_bonus": float(ranking_profile_row["approved_bonus"]),
+                "preferred_bonus": float(ranking_profile_row["preferred_bonus"]),
+                "deprecated_penalty": float(ranking_profile_row["deprecated_penalty"]),
+            },
+            "semantic_query": semantic_query if retrieval_mode in {"semantic", "hybrid"} else None,
+            "lexical_candidate_count": len(lexical_rows),
+            "semantic_candidate_count": len(semantic_rows),
+            "min_semantic_similarity": min_semantic_similarity,
+            "min_score": min_score,
+            "policy": policy,
+            "policy_metadata": policy_metadata,
+            "selected": selected_payload,
+            "rejected": rejected_payload,
+        }
+        resolve_counters.add(
+            _resolve_counter_rows(
+                risk_level=(body.risk_level or "normal").strip().lower() or "normal",
                 agent_slug=body.agent_slug,
-                requested_risk_level=(body.risk_level or "normal").strip().lower() or "normal",
-                tags=body.tags,
                 selected_count=len(selected_payload),
-                rejected_count=len(rejected_payload),
-                payload={
-                    "retrieval_mode": retrieval_mode,
-                    "ranking_profile": ranking_profile,
-                    "ranking_profile_weights": {
-                        "base_score": float(ranking_profile_row["base_score"]),
-                        "lexical_weight": float(ranking_profile_row["lexical_weight"]),
-                        "semantic_weight": float(ranking_profile_row["semantic_weight"]),
-                        "tag_weight": float(ranking_profile_row["tag_weight"]),
-                        "validation_confidence_weight": float(ranking_profile_row["validation_confidence_weight"]),
-                        "approved_bonus": float(ranking_profile_row["approved_bonus"]),
-                        "preferred_bonus": float(ranking_profile_row["preferred_bonus"]),
-                        "deprecated_penalty": float(ranking_profile_row["deprecated_penalty"]),
-                    },
-                    "semantic_query": semantic_query if retrieval_mode in {"semantic", "hybrid"} else None,
-                    "semantic_candidate_count": len(semantic_rows),
-                    "min_semantic_similarity": min_semantic_similarity,
-                    "min_score": min_score,
-                    "policy": policy,
-                    "policy_metadata": policy_metadata,
-                    "selected": selected_payload,
-                    "rejected": rejected_payload,
-                },
+                rejected_payload=rejected_payload,
                 created_at=now,
             )
         )
-        await session.commit()
+        await resolve_audit_sink.submit(
+            {
+                "id": uuid4(),
+                "task": body.task,
+                "agent_slug": body.agent_slug,
+                "requested_risk_level": (body.risk_level or "normal").strip().lower() or "normal",
+                "tags": body.tags,
+                "selected_count": len(selected_payload),
+                "rejected_count": len(rejected_payload),
+                "payload": _compact_resolve_audit_payload(
+                    audit_payload,
+                    full_detail=random.random() < float(settings.knowledge_resolve_audit_detail_sample_rate),
+                ),
+                "created_at": now,
+            }
+        )
 
         return KnowledgeResolveOut(
             task=body.task,
@@ -5273,6 +7016,42 @@ def create_app() -> FastAPI:
             rejected=[KnowledgeResolveRejectedOut(**item) for item in rejected_payload] if body.include_rejected else [],
         )
 
+    @app.get("/v1/knowledge/observability/query-embedding-cache", response_model=KnowledgeQueryEmbeddingCacheStatsOut)
+    async def get_knowledge_query_embedding_cache_stats(
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+    ) -> KnowledgeQueryEmbeddingCacheStatsOut:
+        hits = _QUERY_EMBEDDING_CACHE_STATS["memory_hits"] + _QUERY_EMBEDDING_CACHE_STATS["redis_hits"]
+        lookups = hits + _QUERY_EMBEDDING_CACHE_STATS["misses"]
+        return KnowledgeQueryEmbeddingCacheStatsOut(
+            capacity=int(settings.knowledge_query_embedding_cache_size),
+            size=len(_QUERY_EMBEDDING_CACHE),
+            ttl_seconds=float(settings.knowledge_query_embedding_cache_ttl_seconds),
+            redis_enabled=bool(settings.knowledge_query_embedding_cache_redis_enabled),
+            memory_hits=_QUERY_EMBEDDING_CACHE_STATS["memory_hits"],
+            redis_hits=_QUERY_EMBEDDING_CACHE_STATS["redis_hits"],
+            misses=_QUERY_EMBEDDING_CACHE_STATS["misses"],
+            evictions=_QUERY_EMBEDDING_CACHE_STATS["evictions"],
+            hit_rate=float(hits) / float(max(lookups, 1)),
+        )
+
+    @app.get("/v1/knowledge/observability/resolve-audit-sink", response_model=KnowledgeResolveAuditSinkStatsOut)
+    async def get_knowledge_resolve_audit_sink_stats(
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+    ) -> KnowledgeResolveAuditSinkStatsOut:
+        return KnowledgeResolveAuditSinkStatsOut(
+            queue_capacity=resolve_audit_sink.max_queue_size,
+            pending=resolve_audit_sink.pending,
+            batch_size=resolve_audit_sink.batch_size,
+            flush_interval_seconds=resolve_audit_sink.flush_interval_seconds,
+            overflow=resolve_audit_sink.overflow,
+            detail_sample_rate=float(settings.knowledge_resolve_audit_detail_sample_rate),
+            **resolve_audit_sink.stats,
+            counter_pending=resolve_counters.pending,
+            counter_written=resolve_counters.stats["written"],
+            counter_write_failures=resolve_counters.stats["write_failures"],
+            counter_lost=resolve_counters.stats["lost"],
+        )
+
     @app.post("/v1/knowledge/search", response_model=KnowledgeSearchOut)
     async def search_knowledge_units(
         body: KnowledgeSearchIn,
@@ -5301,8 +7080,8 @@ def create_app() -> FastAPI:
         limit = min(max(int(body.limit or 10), 1), 50)
 
         try:
-            vectors, model_name, actual_dimensions = await _request_knowledge_embeddings(
-                [query_text],
+            query_vector, model_name, actual_dimensions = await request_query_embedding(
+                query_text,
                 config=embedding_config,
             )
         except Exception as exc:
@@ -5327,7 +7106,7 @@ def create_app() -> FastAPI:
 
         rows = await _search_knowledge_units_by_embedding(
             session,
-            query_embedding=vectors[0],
+            query_embedding=query_vector,
             embedding_model=selected_model,
             embedding_dimensions=int(actual_dimensions),
             limit=limit,
@@ -5425,6 +7204,7 @@ def create_app() -> FastAPI:
                 .where(knowledge_units.c.id == body.unit_id)
                 .values(status="inactive", lifecycle_stage="inactive", retired_at=now, updated_at=now)
             )
+            await _sync_current_validation_lifecycle(session, unit_id=body.unit_id, lifecycle_stage="inactive", now=now)
             await _record_lifecycle_event(
                 session,
                 unit_id=body.unit_id,
@@ -5439,6 +7219,7 @@ def create_app() -> FastAPI:
                 .where(knowledge_units.c.id == body.unit_id)
                 .values(status="active", lifecycle_stage="preferred", retired_at=None, updated_at=now)
             )
+            await _sync_current_validation_lifecycle(session, unit_id=body.unit_id, lifecycle_stage="preferred", now=now)
             await _record_lifecycle_event(
                 session,
                 unit_id=body.unit_id,
@@ -5515,6 +7296,12 @@ def create_app() -> FastAPI:
         await session.execute(
             knowledge_units.update().where(knowledge_units.c.id == unit_id).values(**values)
         )
+        await _sync_current_validation_lifecycle(
+            session,
+            unit_id=unit_id,
+            lifecycle_stage=str(values.get("lifecycle_stage") or existing.lifecycle_stage),
+            now=now,
+        )
         await _record_lifecycle_event(
             session,
             unit_id=unit_id,
@@ -5600,6 +7387,7 @@ def create_app() -> FastAPI:
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> list[KnowledgeResolveAuditOut]:
+        await resolve_audit_sink.flush()
         stmt = sa.select(
             knowledge_resolve_audits.c.id,
             knowledge_resolve_audits.c.task,
@@ -5621,110 +7409,80 @@ def create_app() -> FastAPI:
     async def get_knowledge_resolve_rejection_summary(
         days: int = 7,
         risk_level: str | None = None,
+        agent_slug: str | None = None,
         limit: int = 20,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> list[KnowledgeResolveRejectSummaryOut]:
+        await resolve_counters.flush()
         window_days = min(max(int(days or 7), 1), 90)
         max_items = min(max(int(limit or 20), 1), 200)
-        cutoff = datetime.utcnow() - timedelta(days=window_days)
-
-        stmt = sa.select(knowledge_resolve_audits.c.payload).where(knowledge_resolve_audits.c.created_at >= cutoff)
-        if risk_level:
-            stmt = stmt.where(knowledge_resolve_audits.c.requested_risk_level == risk_level.strip().lower())
-        stmt = stmt.order_by(knowledge_resolve_audits.c.created_at.desc()).limit(2000)
 
+        counters = knowledge_resolve_daily_counters
+        rejections = sa.func.sum(counters.c.rejections)
+        stmt = (
+            sa.select(counters.c.reason, rejections.label("count"))
+            .where(*_resolve_counter_filters(window_days, risk_level, agent_slug), counters.c.reason != "")
+            .group_by(counters.c.reason)
+            .order_by(rejections.desc(), counters.c.reason)
+            .limit(max_items)
+        )
         rows = (await session.execute(stmt)).all()
-        counts: dict[str, int] = {}
-        for row in rows:
-            payload = row.payload or {}
-            rejected = payload.get("rejected") or []
-            if not isinstance(rejected, list):
-                continue
-            for item in rejected:
-                if not isinstance(item, dict):
-                    continue
-                reason = str(item.get("reason") or "unknown").strip() or "unknown"
-                counts[reason] = counts.get(reason, 0) + 1
-
-        ordered = sorted(counts.items(), key=lambda pair: pair[1], reverse=True)
-        return [
-            KnowledgeResolveRejectSummaryOut(reason=reason, count=count)
-            for reason, count in ordered[:max_items]
-        ]
+        return [KnowledgeResolveRejectSummaryOut(reason=row.reason, count=int(row.count or 0)) for row in rows]
 
     @app.get("/v1/knowledge/resolve/metrics", response_model=KnowledgeResolveMetricsOut)
     async def get_knowledge_resolve_metrics(
         days: int = 7,
         risk_level: str | None = None,
+        agent_slug: str | None = None,
         top_reasons: int = 5,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> KnowledgeResolveMetricsOut:
+        await resolve_counters.flush()
         window_days = min(max(int(days or 7), 1), 90)
         top_n = min(max(int(top_reasons or 5), 1), 20)
         cutoff = datetime.utcnow() - timedelta(days=window_days)
 
-        stmt = sa.select(
-            knowledge_resolve_audits.c.requested_risk_level,
-            knowledge_resolve_audits.c.selected_count,
-            knowledge_resolve_audits.c.rejected_count,
-            knowledge_resolve_audits.c.payload,
-        ).where(knowledge_resolve_audits.c.created_at >= cutoff)
-        if risk_level:
-            stmt = stmt.where(knowledge_resolve_audits.c.requested_risk_level == risk_level.strip().lower())
-
-        rows = (await session.execute(stmt)).all()
-
-        total_resolve_requests = len(rows)
-        requests_with_hits = 0
-        requests_with_rejections = 0
-        total_selected_units = 0
-        total_rejected_units = 0
-        expired_rejection_count = 0
-        reason_counts: dict[str, int] = {}
-        risk_counts: dict[str, dict[str, int]] = {}
-
-        for row in rows:
-            requested_risk_level = str(row.requested_risk_level or "normal").strip().lower() or "normal"
-            selected_count = int(row.selected_count or 0)
-            rejected_count = int(row.rejected_count or 0)
-
-            total_selected_units += selected_count
-            total_rejected_units += rejected_count
-
-            risk_bucket = risk_counts.setdefault(
-                requested_risk_level,
-                {
-                    "total_resolve_requests": 0,
-                    "requests_with_hits": 0,
-                    "requests_with_rejections": 0,
-                    "total_selected_units": 0,
-                    "total_rejected_units": 0,
-                },
+        counters = knowledge_resolve_daily_counters
+        filters = _resolve_counter_filters(window_days, risk_level, agent_slug)
+        risk_stmt = (
+            sa.select(
+                counters.c.risk_level,
+                sa.func.sum(counters.c.resolve_requests).label("total_resolve_requests"),
+                sa.func.sum(counters.c.requests_with_hits).label("requests_with_hits"),
+                sa.func.sum(counters.c.requests_with_rejections).label("requests_with_rejections"),
+                sa.func.sum(counters.c.selected_units).label("total_selected_units"),
+                sa.func.sum(counters.c.rejected_units).label("total_rejected_units"),
             )
-            risk_bucket["total_resolve_requests"] += 1
-            risk_bucket["total_selected_units"] += selected_count
-            risk_bucket["total_rejected_units"] += rejected_count
+            .where(*filters, counters.c.reason == "")
+            .group_by(counters.c.risk_level)
+        )
+        rejections = sa.func.sum(counters.c.rejections)
+        reason_stmt = (
+            sa.select(counters.c.reason, rejections.label("count"))
+            .where(*filters, counters.c.reason != "")
+            .group_by(counters.c.reason)
+            .order_by(rejections.desc(), counters.c.reason)
+        )
 
-            if selected_count > 0:
-                requests_with_hits += 1
-                risk_bucket["requests_with_hits"] += 1
-            if rejected_count > 0:
-                requests_with_rejections += 1
-                risk_bucket["requests_with_rejections"] += 1
+        risk_counts: dict[str, dict[str, int]] = {}
+        for row in (await session.execute(risk_stmt)).all():
+            risk_counts[str(row.risk_level or "normal")] = {
+                "total_resolve_requests": int(row.total_resolve_requests or 0),
+                "requests_with_hits": int(row.requests_with_hits or 0),
+                "requests_with_rejections": int(row.requests_with_rejections or 0),
+                "total_selected_units": int(row.total_selected_units or 0),
+                "total_rejected_units": int(row.total_rejected_units or 0),
+            }
+        reason_counts = {str(row.reason): int(row.count or 0) for row in (await session.execute(reason_stmt)).all()}
 
-            payload = row.payload or {}
-            rejected = payload.get("rejected") or []
-            if not isinstance(rejected, list):
-                continue
-            for item in rejected:
-                if not isinstance(item, dict):
-                    continue
-                reason = str(item.get("reason") or "unknown").strip() or "unknown"
-                reason_counts[reason] = reason_counts.get(reason, 0) + 1
-                if reason in {"validation_expired", "validation_too_old"}:
-                    expired_rejection_count += 1
+        total_resolve_requests = sum(bucket["total_resolve_requests"] for bucket in risk_counts.values())
+        requests_with_hits = sum(bucket["requests_with_hits"] for bucket in risk_counts.values())
+        requests_with_rejections = sum(bucket["requests_with_rejections"] for bucket in risk_counts.values())
+        total_selected_units = sum(bucket["total_selected_units"] for bucket in risk_counts.values())
+        total_rejected_units = sum(bucket["total_rejected_units"] for bucket in risk_counts.values())
+        expired_rejection_count = sum(reason_counts.get(reason, 0) for reason in RESOLVE_EXPIRED_REJECTION_REASONS)
 
         hit_denominator = max(total_resolve_requests, 1)
         rejection_denominator = max(total_selected_units + total_rejected_units, 1)
@@ -5820,7 +7578,7 @@ def create_app() -> FastAPI:
         if not slug:
             raise HTTPException(status_code=400, detail="agent is required")
 
-        known_agents = _known_agent_slugs(settings)
+        known_agents = agent_registry.known_slugs()
         if known_agents and slug not in known_agents:
             raise HTTPException(status_code=404, detail=f"unknown agent: {slug}")
 
@@ -5854,7 +7612,7 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=400, detail="nothing to update")
 
         failed: list[SkillsMappingFailureItem] = []
-        known_agents = set(_scan_agent_slugs(settings))
+        known_agents = agent_registry.known_slugs()
         valid_agents = agent_slugs
         if known_agents:
             unknown_agents = [slug for slug in agent_slugs if slug not in known_agents]
@@ -6047,31 +7805,137 @@ def create_app() -> FastAPI:
 
     @app.get("/v1/boards/default", response_model=BoardOut)
     async def get_board(
+        limit: int = BOARD_COLUMN_DEFAULT_LIMIT,
         _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
         session=Depends(get_session),
     ) -> BoardOut:
-        statuses = ["INBOX", "ASSIGNED", "IN PROGRESS", "REVIEW", "DONE"]
-        columns: list[BoardColumn] = []
-        for status in statuses:
-            stmt = (
-                sa.select(
-                    tasks.c.id,
-                    tasks.c.title,
-                    tasks.c.status,
-                    tasks.c.assignee,
-                    tasks.c.tags,
-                    tasks.c.created_at,
-                    tasks.c.updated_at,
-                )
-                .where(tasks.c.status == status)
-                .order_by(tasks.c.updated_at.desc())
-                .limit(100)
+        limit = min(max(int(limit), 1), BOARD_COLUMN_MAX_LIMIT)
+        ranked = (
+            sa.select(
+                *_board_task_columns(),
+                sa.func.row_number()
+                .over(partition_by=tasks.c.status, order_by=(tasks.c.updated_at.desc(), tasks.c.id.desc()))
+                .label("column_rank"),
+                sa.func.count().over(partition_by=tasks.c.status).label("column_total"),
             )
-            rows = (await session.execute(stmt)).all()
-            cards = [TaskOut(**r._asdict()) for r in rows]
-            columns.append(BoardColumn(title=status, count=len(cards), cards=cards))
+            .where(tasks.c.status.in_(BOARD_STATUSES))
+            .subquery()
+        )
+        stmt = (
+            sa.select(ranked)
+            .where(ranked.c.column_rank <= limit)
+            .order_by(ranked.c.status, ranked.c.column_rank)
+        )
+        rows = (await session.execute(stmt)).all()
+
+        cards_by_status: dict[str, list[TaskOut]] = {status: [] for status in BOARD_STATUSES}
+        totals: dict[str, int] = {}
+        for row in rows:
+            values = row._asdict()
+            totals[row.status] = int(values.pop("column_total"))
+            values.pop("column_rank")
+            cards_by_status[row.status].append(TaskOut(**values))
+
+        columns: list[BoardColumn] = []
+        for status in BOARD_STATUSES:
+            cards = cards_by_status[status]
+            total = totals.get(status, 0)
+            next_cursor = _encode_board_cursor(cards[-1].updated_at, cards[-1].id) if cards and total > len(cards) else None
+            columns.append(BoardColumn(title=status, count=total, cards=cards, next_cursor=next_cursor))
         return BoardOut(columns=columns)
 
+    @app.get("/v1/boards/default/delta", response_model=BoardDeltaOut)
+    async def get_board_delta(
+        request: Request,
+        response: Response,
+        since_ts: datetime | None = None,
+        since_id: UUID | None = None,
+        limit: int = BOARD_COLUMN_DEFAULT_LIMIT,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> BoardDeltaOut:
+        if since_ts is None and since_id is None:
+            raise HTTPException(status_code=400, detail="since_ts or since_id is required")
+        limit = min(max(int(limit), 1), BOARD_DELTA_MAX_LIMIT)
+        if since_ts is not None and since_ts.tzinfo is None:
+            since_ts = since_ts.replace(tzinfo=timezone.utc)
+        if since_ts is None:
+            since_ts = (
+                await session.execute(sa.select(tasks.c.updated_at).where(tasks.c.id == since_id))
+            ).scalar_one_or_none()
+            if since_ts is None:
+                out = BoardDeltaOut(cards=[], reset=True)
+                not_modified = _not_modified(request, response, _content_etag("board", out))
+                return not_modified if not_modified is not None else out
+
+        stmt = (
+            sa.select(*_board_task_columns())
+            .where(
+                tasks.c.status.in_(BOARD_STATUSES),
+                tasks.c.updated_at >= since_ts - timedelta(seconds=DELTA_OVERLAP_SECONDS),
+            )
+            .order_by(tasks.c.updated_at.desc(), tasks.c.id.desc())
+            .limit(limit + 1)
+        )
+        rows = (await session.execute(stmt)).all()
+        reset = len(rows) > limit
+        cards = [] if reset else [TaskOut(**row._asdict()) for row in rows]
+
+        totals = None
+        if any(card.updated_at > since_ts for card in cards):
+            total_rows = (
+                await session.execute(
+                    sa.select(tasks.c.status, sa.func.count().label("total"))
+                    .where(tasks.c.status.in_(BOARD_STATUSES))
+                    .group_by(tasks.c.status)
+                )
+            ).all()
+            totals = {status: 0 for status in BOARD_STATUSES}
+            totals.update({row.status: int(row.total) for row in total_rows})
+
+        high_water_ts, high_water_id = _delta_high_water(
+            [(card.updated_at, card.id) for card in cards],
+            since_ts,
+            since_id,
+        )
+        out = BoardDeltaOut(
+            cards=cards,
+            totals=totals,
+            high_water_ts=None if reset else high_water_ts,
+            high_water_id=None if reset else high_water_id,
+            reset=reset,
+        )
+        not_modified = _not_modified(request, response, _content_etag("board", out))
+        if not_modified is not None:
+            return not_modified
+        return out
+
+    @app.get("/v1/boards/default/columns/{status}", response_model=BoardColumn)
+    async def get_board_column(
+        status: str,
+        cursor: str | None = None,
+        limit: int = BOARD_COLUMN_DEFAULT_LIMIT,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> BoardColumn:
+        if status not in BOARD_STATUSES:
+            raise HTTPException(status_code=404, detail=f"unknown board column: {status}")
+        limit = min(max(int(limit), 1), BOARD_COLUMN_MAX_LIMIT)
+
+        stmt = sa.select(*_board_task_columns()).where(tasks.c.status == status)
+        if cursor:
+            cursor_updated_at, cursor_id = _decode_board_cursor(cursor)
+            stmt = stmt.where(sa.tuple_(tasks.c.updated_at, tasks.c.id) < sa.tuple_(cursor_updated_at, cursor_id))
+        stmt = stmt.order_by(tasks.c.updated_at.desc(), tasks.c.id.desc()).limit(limit + 1)
+        rows = (await session.execute(stmt)).all()
+        total = int(
+            (await session.execute(sa.select(sa.func.count()).select_from(tasks).where(tasks.c.status == status))).scalar_one()
+        )
+
+        cards = [TaskOut(**row._asdict()) for row in rows[:limit]]
+        next_cursor = _encode_board_cursor(cards[-1].updated_at, cards[-1].id) if len(rows) > limit else None
+        return BoardColumn(title=status, count=total, cards=cards, next_cursor=next_cursor)
+
     @app.post("/v1/tasks/{task_id}/comments", response_model=CommentOut)
     async def add_comment(
         task_id: UUID,
@@ -6121,7 +7985,7 @@ def create_app() -> FastAPI:
         if body.type == "task.handoff":
             if not body.task_id:
                 validation_errors.append("task.handoff requires task_id")
-            known_agents = _known_agent_slugs(settings)
+            known_agents = agent_registry.known_slugs()
             validation_errors.extend(_validate_handoff_payload(body.payload, known_agents))
             validation_details["known_agents_count"] = len(known_agents)
 
@@ -6195,6 +8059,7 @@ def create_app() -> FastAPI:
         )
         row = (await session.execute(stmt)).one()
         await session.commit()
+        record_event_rollup(event_type=row.type, agent=row.agent, payload=row.payload, created_at=row.created_at)
 
         await publish_event(
             redis,
@@ -6246,27 +8111,57 @@ def create_app() -> FastAPI:
         session=Depends(get_session),
     ) -> list[EventLiteOut]:
         stmt = (
-            sa.select(
-                events.c.id,
-                events.c.type,
-                events.c.agent,
-                events.c.task_id,
-                events.c.created_at,
-                sa.func.jsonb_extract_path_text(events.c.payload, "method").label("method"),
-                sa.func.jsonb_extract_path_text(events.c.payload, "path").label("path"),
-                sa.cast(sa.func.nullif(sa.func.jsonb_extract_path_text(events.c.payload, "status_code"), ""), sa.Integer).label("status_code"),
-                sa.func.jsonb_extract_path_text(events.c.payload, "error_type").label("error_type"),
-                sa.func.jsonb_extract_path_text(events.c.payload, "test_id").label("test_id"),
-                sa.cast(sa.func.nullif(sa.func.jsonb_extract_path_text(events.c.payload, "round"), ""), sa.Integer).label("round"),
-            )
+            sa.select(*_feed_lite_columns())
             .order_by(events.c.created_at.desc())
-            .limit(min(limit, 500))
+            .limit(min(limit, FEED_LITE_MAX_LIMIT))
         )
         rows = (await session.execute(stmt)).all()
         return [EventLiteOut(**r._asdict()) for r in rows]
 
+    @app.get("/v1/feed-lite/delta", response_model=FeedDeltaOut)
+    async def get_feed_lite_delta(
+        request: Request,
+        response: Response,
+        since_ts: datetime | None = None,
+        since_id: UUID | None = None,
+        limit: int = 50,
+        _auth: None = Depends(lambda authorization=Header(default=None): require_auth(settings, authorization)),
+        session=Depends(get_session),
+    ) -> FeedDeltaOut:
+        limit = min(max(int(limit), 1), FEED_LITE_MAX_LIMIT)
+        if since_ts is not None and since_ts.tzinfo is None:
+            since_ts = since_ts.replace(tzinfo=timezone.utc)
+        if since_ts is None and since_id is not None:
+            since_ts = (
+                await session.execute(sa.select(events.c.created_at).where(events.c.id == since_id).limit(1))
+            ).scalar_one_or_none()
+
+        stmt = sa.select(*_feed_lite_columns())
+        if since_ts is not None:
+            stmt = stmt.where(events.c.created_at >= since_ts - timedelta(seconds=DELTA_OVERLAP_SECONDS))
+        stmt = stmt.order_by(events.c.created_at.desc(), events.c.id.desc()).limit(limit + 1)
+        rows = (await session.execute(stmt)).all()
+
+        reset = since_ts is None or len(rows) > limit
+        feed = [EventLiteOut(**r._asdict()) for r in rows[:limit]]
+        high_water_ts, high_water_id = _delta_high_water(
+            [(item.created_at, item.id) for item in feed],
+            None if reset else since_ts,
+            None if reset else since_id,
+        )
+        out = FeedDeltaOut(events=feed, high_water_ts=high_water_ts, high_water_id=high_water_id, reset=reset)
+        not_modified = _not_modified(request, response, _content_etag("feed", out))
+        if not_modified is not None:
+            return not_modified
+        return out
+
     @app.websocket("/ws/events")
-    async def ws_events(websocket: WebSocket):
+    async def ws_events(
+        websocket: WebSocket,
+        types: str | None = None,
+        agents: str | None = None,
+        resume_from: str | None = None,
+    ):
         await websocket.accept()
 
         # 可選 Bearer token（如果設定了 MC_AUTH_TOKEN）
@@ -6280,33 +8175,41 @@ def create_app() -> FastAPI:
                 await websocket.close(code=4403)
                 return
 
-        # Start from the latest stream ID to avoid replaying long history on each
-        # new websocket connection, which can significantly increase perceived
-        # real-time latency on the dashboard.
-        last_id = "$"
-        try:
-            latest = await redis.xrevrange(settings.redis_stream_key, count=1)
-            if latest:
-                last_id = str(latest[0][0])
-        except Exception:
-            # Fall back to '$' (new entries only).
-            last_id = "$"
+        subscription = event_hub.subscribe(types=parse_filter_values(types), agents=parse_filter_values(agents))
         try:
+            replayed_until = None
+            if parse_stream_id(resume_from) is not None:
+                subscription.last_stream_id = resume_from
+                try:
+                    backlog = await event_hub.replay(subscription, resume_from)
+                except Exception:
+                    backlog = []
+                    subscription.missed += 1
+                gap = subscription.take_gap()
+                if gap:
+                    await websocket.send_text(json.dumps(gap))
+                for stream_id, message in backlog:
+                    await websocket.send_text(message)
+                    subscription.last_stream_id = stream_id
+                replayed_until = parse_stream_id(subscription.last_stream_id)
+
             while True:
-                result = await redis.xread({settings.redis_stream_key: last_id}, block=25_000, count=50)
-                if not result:
+                gap = subscription.take_gap()
+                if gap:
+                    await websocket.send_text(json.dumps(gap))
+                item = await subscription.next(timeout=WS_EVENTS_PING_SECONDS)
+                if item is None:
                     await websocket.send_text(json.dumps({"type": "ping"}))
                     continue
-
-                _, entries = result[0]
-                for entry_id, fields in entries:
-                    last_id = entry_id
-                    # fields["event"] 會是一個 JSON 字串
-                    event_json = fields.get("event")
-                    if event_json:
-                        await websocket.send_text(event_json)
-        except WebSocketDisconnect:
+                stream_id, message = item
+                if replayed_until is not None and (parse_stream_id(stream_id) or (0, 0)) <= replayed_until:
+                    continue
+                await websocket.send_text(message)
+                subscription.last_stream_id = stream_id
+        except (WebSocketDisconnect, RuntimeError):
             return
+        finally:
+            event_hub.unsubscribe(subscription)
 
     
     @app.api_route("/chat/{agent}/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"])
@@ -6319,56 +8222,82 @@ def create_app() -> FastAPI:
         if query:
             target_url += f"?{query}"
             
-        async with httpx.AsyncClient(timeout=3600.0) as client:
-            headers = dict(request.headers.items())
-            headers.pop("host", None)
-            if settings.chat_force_loopback_headers:
-                headers["x-real-ip"] = "127.0.0.1"
-                headers["x-forwarded-for"] = "127.0.0.1"
-            
-            token = settings.agent_token_map.get(agent)
-            if token:
-                headers["authorization"] = f"Bearer {token}"
-                
-            req = client.build_request(
-                request.method,
-                target_url,
-                headers=headers,
-                content=request.stream(),
-            )
+        client = chat_upstream_client(agent)
+        headers = dict(request.headers.items())
+        headers.pop("host", None)
+        if settings.chat_force_loopback_headers:
+            headers["x-real-ip"] = "127.0.0.1"
+            headers["x-forwarded-for"] = "127.0.0.1"
+        
+        token = settings.agent_token_map.get(agent)
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+
+        html_flags = (
+            token,
+            settings.chat_inject_script_enabled,
+            settings.chat_clear_device_auth_storage,
+            settings.chat_inject_gateway_settings,
+            settings.chat_dom_avatar_rewrite,
+        )
+        client_etags = _parse_etag_values(request.headers.get("if-none-match"))
+        revalidating = None
+        if client_etags and request.method.upper() == "GET":
+            revalidating = _chat_html_revalidation_etag(agent, html_flags, client_etags)
+            if revalidating is not None:
+                headers["if-none-match"] = revalidating[1]
             
-            try:
-                resp = await client.send(req, stream=True)
-            except Exception as e:
-                if not upgrade:
-                    elapsed = max(0.0, time.perf_counter() - started)
-                    await publish_event(
-                        redis,
-                        stream_key=settings.redis_stream_key,
-                        event={
-                            "type": "chat.gateway.access",
-                            "agent": agent,
-                            "payload": {
-                                "path": f"/{path}",
-                                "query": str(request.url.query)[:256],
-                                "method": request.method,
-                                "status_code": 502,
-                                "request_time": f"{elapsed:.4f}",
-                                "upstream_status": "error",
-                                "error_type": e.__class__.__name__,
-                                "is_ws_upgrade": False,
-                                "source": "api_gateway_proxy",
-                                "ts": datetime.utcnow().isoformat() + "Z",
-                            },
+        req = client.build_request(
+            request.method,
+            target_url,
+            headers=headers,
+            content=request.stream(),
+        )
+        
+        try:
+            resp = await client.send(req, stream=True)
+        except Exception as e:
+            if not upgrade:
+                elapsed = max(0.0, time.perf_counter() - started)
+                await publish_event(
+                    redis,
+                    stream_key=settings.redis_stream_key,
+                    event={
+                        "type": "chat.gateway.access",
+                        "agent": agent,
+                        "payload": {
+                            "path": f"/{path}",
+                            "query": str(request.url.query)[:256],
+                            "method": request.method,
+                            "status_code": 502,
+                            "request_time": f"{elapsed:.4f}",
+                            "upstream_status": "error",
+                            "error_type": e.__class__.__name__,
+                            "is_ws_upgrade": False,
+                            "source": "api_gateway_proxy",
+                            "ts": datetime.utcnow().isoformat() + "Z",
                         },
-                    )
-                raise HTTPException(status_code=502, detail=f"Proxy error: {e}")
-            
-            is_html = "text/html" in resp.headers.get("content-type", "")
-            if is_html:
+                    },
+                )
+            raise HTTPException(status_code=502, detail=f"Proxy error: {e}")
+        
+        if revalidating is not None and resp.status_code == 304:
+            await resp.aclose()
+            return Response(status_code=304, headers={"ETag": revalidating[0], "Cache-Control": "no-cache"})
+
+        is_html = "text/html" in resp.headers.get("content-type", "")
+        if is_html:
+            cacheable = request.method.upper() == "GET" and resp.status_code == 200
+            upstream_etag = resp.headers.get("etag") if cacheable else None
+            cached = _chat_html_cache_get((agent, f"etag:{upstream_etag}", *html_flags)) if upstream_etag else None
+            if cached is None:
                 content = await resp.aread()
+            await resp.aclose()
+            if cached is None:
+                cache_key = (agent, f"etag:{upstream_etag}" if upstream_etag else f"sha256:{hashlib.sha256(content).hexdigest()}", *html_flags)
+                cached = _chat_html_cache_get(cache_key) if cacheable else None
+            if cached is None:
                 text = content.decode("utf-8", errors="replace")
-                
                 if settings.chat_inject_script_enabled:
                     inject_script = _build_chat_inject_script(
                         agent,
@@ -6377,82 +8306,78 @@ def create_app() -> FastAPI:
                         inject_gateway_settings=settings.chat_inject_gateway_settings,
                         dom_avatar_rewrite=settings.chat_dom_avatar_rewrite,
                     )
+                    text = _inject_chat_html(text, inject_script, dom_avatar_rewrite=settings.chat_dom_avatar_rewrite)
+                if not cacheable:
+                    return HTMLResponse(content=text, status_code=resp.status_code)
+                cached = _chat_html_cache_put(cache_key, upstream_etag, text.encode("utf-8"))
+
+            etag, _, body = cached
+            cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if etag in client_etags:
+                return Response(status_code=304, headers=cache_headers)
+            return HTMLResponse(content=body, status_code=resp.status_code, headers=cache_headers)
+
+        rewrite_control_ui_config = (
+            settings.chat_rewrite_control_ui_config
+            and request.method.upper() == "GET"
+            and path.endswith("control-ui-config.json")
+            and resp.status_code == 200
+        )
+        rewrite_avatar_meta = False
+        if request.method.upper() == "GET" and path.startswith("avatar/"):
+            is_meta = request.query_params.get("meta") == "1"
 
-                    if 'window.__OPENCLAW_CONTROL_UI_BASE_PATH__="";' in text:
-                        text = text.replace('window.__OPENCLAW_CONTROL_UI_BASE_PATH__="";', inject_script)
-                    else:
-                        injected = f"<script>{inject_script}</script>"
-                        if '<script type="module"' in text:
-                            text = text.replace('<script type="module"', f"{injected}<script type=\"module\"", 1)
-                        elif "</head>" in text:
-                            text = text.replace("</head>", f"{injected}</head>", 1)
-                        elif "<body>" in text:
-                            text = text.replace("<body>", f"<body>{injected}", 1)
-                        else:
-                            text = f"{injected}{text}"
-                    if settings.chat_dom_avatar_rewrite:
-                        text = re.sub(
-                            r'window\.__OPENCLAW_ASSISTANT_AVATAR__=("|\')/avatar/[^"\']*("|\')',
-                            'window.__OPENCLAW_ASSISTANT_AVATAR__=""',
-                            text,
-                        )
+            if is_meta and resp.status_code == 200 and "application/json" in resp.headers.get("content-type", ""):
+                rewrite_avatar_meta = settings.chat_rewrite_avatar_payloads
+
+            if not is_meta and resp.status_code == 404:
                 await resp.aclose()
-                
-                return HTMLResponse(content=text, status_code=resp.status_code)
+                svg = _avatar_fallback_svg(agent)
+                return Response(content=svg, status_code=200, media_type="image/svg+xml")
 
+        if rewrite_control_ui_config or rewrite_avatar_meta:
             content = await resp.aread()
             await resp.aclose()
-
-            if (
-                settings.chat_rewrite_control_ui_config
-                and request.method.upper() == "GET"
-                and path.endswith("control-ui-config.json")
-                and resp.status_code == 200
-            ):
+            if rewrite_control_ui_config:
                 content = _rewrite_control_ui_config(content, agent, rewrite_avatar=settings.chat_rewrite_avatar_payloads)
-
-            if request.method.upper() == "GET" and path.startswith("avatar/"):
-                is_meta = request.query_params.get("meta") == "1"
-
-                if is_meta and resp.status_code == 200 and "application/json" in resp.headers.get("content-type", ""):
-                    if settings.chat_rewrite_avatar_payloads:
-                        content = _rewrite_avatar_meta(content, agent, query)
-
-                if not is_meta and resp.status_code == 404:
-                    svg = _avatar_fallback_svg(agent)
-                    return Response(content=svg, status_code=200, media_type="image/svg+xml")
-
+            if rewrite_avatar_meta:
+                content = _rewrite_avatar_meta(content, agent, query)
             r = Response(content=content, status_code=resp.status_code)
             for k, v in resp.headers.items():
-                if k.lower() not in ("content-length", "transfer-encoding", "connection"):
+                if k.lower() not in CHAT_PROXY_HOP_BY_HOP_HEADERS | {"content-length", "content-encoding"}:
+                    r.headers[k] = v
+        else:
+            r = StreamingResponse(_iter_upstream_body(resp), status_code=resp.status_code)
+            for k, v in resp.headers.items():
+                if k.lower() not in CHAT_PROXY_HOP_BY_HOP_HEADERS:
                     r.headers[k] = v
 
-            if not upgrade:
-                elapsed = max(0.0, time.perf_counter() - started)
-                error_type = None
-                if resp.status_code >= 400:
-                    error_type = f"http_{resp.status_code}"
-                await publish_event(
-                    redis,
-                    stream_key=settings.redis_stream_key,
-                    event={
-                        "type": "chat.gateway.access",
-                        "agent": agent,
-                        "payload": {
-                            "path": f"/{path}",
-                            "query": str(request.url.query)[:256],
-                            "method": request.method,
-                            "status_code": int(resp.status_code),
-                            "request_time": f"{elapsed:.4f}",
-                            "upstream_status": "ok" if resp.status_code < 500 else "error",
-                            "error_type": error_type,
-                            "is_ws_upgrade": False,
-                            "source": "api_gateway_proxy",
-                            "ts": datetime.utcnow().isoformat() + "Z",
-                        },
+        if not upgrade:
+            elapsed = max(0.0, time.perf_counter() - started)
+            error_type = None
+            if resp.status_code >= 400:
+                error_type = f"http_{resp.status_code}"
+            await publish_event(
+                redis,
+                stream_key=settings.redis_stream_key,
+                event={
+                    "type": "chat.gateway.access",
+                    "agent": agent,
+                    "payload": {
+                        "path": f"/{path}",
+                        "query": str(request.url.query)[:256],
+                        "method": request.method,
+                        "status_code": int(resp.status_code),
+                        "request_time": f"{elapsed:.4f}",
+                        "upstream_status": "ok" if resp.status_code < 500 else "error",
+                        "error_type": error_type,
+                        "is_ws_upgrade": False,
+                        "source": "api_gateway_proxy",
+                        "ts": datetime.utcnow().isoformat() + "Z",
                     },
-                )
-            return r
+                },
+            )
+        return r
 
     async def _chat_ws_proxy_impl(agent: str, path: str, websocket: WebSocket):
         await websocket.accept()
@@ -6549,8 +8474,49 @@ def create_app() -> FastAPI:
     async def chat_ws_proxy(agent: str, path: str, websocket: WebSocket):
         await _chat_ws_proxy_impl(agent, path, websocket)
 
+    @app.on_event("startup")
+    async def _startup():
+        app.state.policy_invalidation_task = asyncio.create_task(listen_policy_invalidations())
+        app.state.usage_index_task = asyncio.create_task(run_usage_index_sync())
+        app.state.events_partition_task = asyncio.create_task(run_events_partition_maintenance())
+        for agent in sorted(set(settings.agent_token_map) | agent_registry.known_slugs()):
+            chat_upstream_clients.setdefault(agent, new_chat_upstream_client())
+        resolve_audit_sink.start()
+        resolve_counters.start()
+        event_rollups.start()
+        agent_heartbeat_marks.start()
+        event_hub.start()
+        skills_catalog.start()
+        health_prober.start()
+        app.state.ingestion_worker_tasks = [
+            asyncio.create_task(run_ingestion_worker(f"{os.getpid()}:{index}"))
+            for index in range(max(int(settings.knowledge_ingestion_workers), 0))
+        ]
+
     @app.on_event("shutdown")
     async def _shutdown():
+        app.state.policy_invalidation_task.cancel()
+        app.state.usage_index_task.cancel()
+        app.state.events_partition_task.cancel()
+        for task in app.state.ingestion_worker_tasks:
+            task.cancel()
+        await asyncio.gather(
+            app.state.policy_invalidation_task,
+            app.state.usage_index_task,
+            app.state.events_partition_task,
+            *app.state.ingestion_worker_tasks,
+            return_exceptions=True,
+        )
+        await event_hub.aclose()
+        await skills_catalog.aclose()
+        await health_prober.aclose()
+        await asyncio.gather(*(client.aclose() for client in chat_upstream_clients.values()), return_exceptions=True)
+        await resolve_audit_sink.aclose()
+        await resolve_counters.aclose()
+        await event_rollups.aclose()
+        await agent_heartbeat_marks.aclose()
+        await embedding_client.aclose()
+        extraction_executor.shutdown()
         await redis.aclose()
         await engine.dispose()
 
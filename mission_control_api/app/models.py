@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 
 metadata = sa.MetaData()
 
 
+KNOWLEDGE_UNIT_SEARCH_TSV_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', knowledge_tags_to_text(tags)), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'B')"
+)
+
+
 class VectorType(sa.types.UserDefinedType):
     cache_ok = True
 
@@ -50,7 +58,8 @@ events = sa.Table(
     sa.Column("agent", sa.Text, nullable=True),
     sa.Column("task_id", sa.Uuid, nullable=True),
     sa.Column("payload", sa.JSON, nullable=False, server_default=sa.text("'{}'::jsonb")),
-    sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    sa.Column("created_at", sa.DateTime(timezone=True), primary_key=True, server_default=sa.text("now()")),
+    postgresql_partition_by="RANGE (created_at)",
 )
 
 
@@ -85,6 +94,18 @@ knowledge_sources = sa.Table(
 )
 
 
+knowledge_source_file_index = sa.Table(
+    "knowledge_source_file_index",
+    metadata,
+    sa.Column("storage_path", sa.Text, primary_key=True),
+    sa.Column("size_bytes", sa.BigInteger, nullable=False),
+    sa.Column("mtime_ns", sa.BigInteger, nullable=False),
+    sa.Column("inode", sa.BigInteger, nullable=False),
+    sa.Column("checksum_sha256", sa.Text, nullable=False),
+    sa.Column("indexed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
 knowledge_units = sa.Table(
     "knowledge_units",
     metadata,
@@ -104,6 +125,7 @@ knowledge_units = sa.Table(
     sa.Column("meta", sa.JSON, nullable=False, server_default=sa.text("'{}'::jsonb")),
     sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
     sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    sa.Column("search_tsv", TSVECTOR, sa.Computed(KNOWLEDGE_UNIT_SEARCH_TSV_EXPRESSION, persisted=True), nullable=True),
     sa.UniqueConstraint("unit_key", name="uq_knowledge_units_unit_key"),
 )
 
@@ -124,6 +146,21 @@ knowledge_validations = sa.Table(
 )
 
 
+knowledge_unit_current_validation = sa.Table(
+    "knowledge_unit_current_validation",
+    metadata,
+    sa.Column("unit_id", sa.Uuid, sa.ForeignKey("knowledge_units.id", ondelete="CASCADE"), primary_key=True),
+    sa.Column("validation_id", sa.Uuid, sa.ForeignKey("knowledge_validations.id", ondelete="CASCADE"), nullable=False),
+    sa.Column("validator", sa.Text, nullable=False),
+    sa.Column("validation_status", sa.Text, nullable=False),
+    sa.Column("validated_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("confidence", sa.Float, nullable=True),
+    sa.Column("lifecycle_stage", sa.Text, nullable=False, server_default="active"),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
 knowledge_feedback_events = sa.Table(
     "knowledge_feedback_events",
     metadata,
@@ -275,6 +312,23 @@ knowledge_resolve_audits = sa.Table(
 )
 
 
+knowledge_resolve_daily_counters = sa.Table(
+    "knowledge_resolve_daily_counters",
+    metadata,
+    sa.Column("day", sa.Date, primary_key=True),
+    sa.Column("risk_level", sa.Text, primary_key=True),
+    sa.Column("agent_slug", sa.Text, primary_key=True, server_default=""),
+    sa.Column("reason", sa.Text, primary_key=True, server_default=""),
+    sa.Column("resolve_requests", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("requests_with_hits", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("requests_with_rejections", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("selected_units", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("rejected_units", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("rejections", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
 knowledge_unit_embeddings = sa.Table(
     "knowledge_unit_embeddings",
     metadata,
@@ -289,3 +343,80 @@ knowledge_unit_embeddings = sa.Table(
     sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
     sa.UniqueConstraint("unit_id", "embedding_model", name="uq_knowledge_unit_embeddings_unit_model"),
 )
+
+
+knowledge_ingestion_jobs = sa.Table(
+    "knowledge_ingestion_jobs",
+    metadata,
+    sa.Column("id", sa.Uuid, primary_key=True),
+    sa.Column("job_type", sa.Text, nullable=False, server_default="source_chunk"),
+    sa.Column("source_id", sa.Uuid, sa.ForeignKey("knowledge_sources.id", ondelete="CASCADE"), nullable=False, index=True),
+    sa.Column("status", sa.Text, nullable=False, server_default="queued"),
+    sa.Column("request", sa.JSON, nullable=False, server_default=sa.text("'{}'::jsonb")),
+    sa.Column("stages", sa.JSON, nullable=False, server_default=sa.text("'{}'::jsonb")),
+    sa.Column("result", sa.JSON, nullable=True),
+    sa.Column("error", sa.Text, nullable=True),
+    sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("worker_id", sa.Text, nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
+agent_usage_file_offsets = sa.Table(
+    "agent_usage_file_offsets",
+    metadata,
+    sa.Column("agent", sa.Text, primary_key=True),
+    sa.Column("device", sa.BigInteger, primary_key=True),
+    sa.Column("inode", sa.BigInteger, primary_key=True),
+    sa.Column("file_path", sa.Text, nullable=False),
+    sa.Column("source_type", sa.Text, nullable=False),
+    sa.Column("size_bytes", sa.BigInteger, nullable=False),
+    sa.Column("mtime_ns", sa.BigInteger, nullable=False),
+    sa.Column("offset_bytes", sa.BigInteger, nullable=False),
+    sa.Column("head_length", sa.Integer, nullable=False),
+    sa.Column("head_sha256", sa.Text, nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
+agent_usage_hourly = sa.Table(
+    "agent_usage_hourly",
+    metadata,
+    sa.Column("agent", sa.Text, primary_key=True),
+    sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True),
+    sa.Column("model", sa.Text, primary_key=True, server_default=""),
+    sa.Column("input_tokens", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("output_tokens", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("cache_read_tokens", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("cache_write_tokens", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("total_tokens", sa.BigInteger, nullable=False, server_default="0"),
+    sa.Column("total_cost", sa.Float, nullable=False, server_default="0"),
+    sa.Column("missing_cost_entries", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("events", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
+events_minute_rollup = sa.Table(
+    "events_minute_rollup",
+    metadata,
+    sa.Column("bucket_minute", sa.DateTime(timezone=True), primary_key=True),
+    sa.Column("event_type", sa.Text, primary_key=True),
+    sa.Column("agent", sa.Text, primary_key=True, server_default=""),
+    sa.Column("status_class", sa.Text, primary_key=True, server_default=""),
+    sa.Column("is_error", sa.Boolean, primary_key=True, server_default=sa.false()),
+    sa.Column("events", sa.Integer, nullable=False, server_default="0"),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
+
+
+agent_heartbeats = sa.Table(
+    "agent_heartbeats",
+    metadata,
+    sa.Column("agent", sa.Text, primary_key=True),
+    sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+)
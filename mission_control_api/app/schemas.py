@@ -24,6 +24,8 @@ class ObservabilitySummaryOut(BaseModel):
     total_agents: int
     agent_health_ratio: float
     heartbeat_stale_seconds: int
+    data_as_of: datetime | None = None
+    data_age_seconds: float | None = None
 
 
 class HealthSignalOut(BaseModel):
@@ -33,6 +35,9 @@ class HealthSignalOut(BaseModel):
     ok: bool
     latency_ms: int | None = None
     detail: str | None = None
+    checked_at: datetime | None = None
+    changed_at: datetime | None = None
+    latency_history_ms: list[int | None] = Field(default_factory=list)
 
 
 class ContainerHealthSummaryOut(BaseModel):
@@ -46,6 +51,7 @@ class ContainerHealthSummaryOut(BaseModel):
     overall_ok: int
     overall_total: int
     overall_ratio: float
+    probe_duration_ms: int | None = None
     signals: list[HealthSignalOut]
 
 
@@ -109,6 +115,13 @@ class EventLiteOut(BaseModel):
     round: int | None = None
 
 
+class FeedDeltaOut(BaseModel):
+    events: list[EventLiteOut]
+    high_water_ts: datetime | None = None
+    high_water_id: UUID | None = None
+    reset: bool = False
+
+
 class AgentUsageSnapshotOut(BaseModel):
     agent: str
     input_tokens_24h: int = 0
@@ -127,6 +140,34 @@ class AgentUsageSnapshotOut(BaseModel):
     days: int = 7
 
 
+class AgentUsageSeriesPointOut(BaseModel):
+    bucket_start: datetime
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    missing_cost_entries: int = 0
+    events: int = 0
+
+
+class AgentUsageSeriesOut(BaseModel):
+    agent: str
+    model: str = ""
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    points: list[AgentUsageSeriesPointOut] = Field(default_factory=list)
+
+
+class AgentUsageTimeseriesOut(BaseModel):
+    resolution: str
+    start: datetime
+    end: datetime
+    by_model: bool = True
+    series: list[AgentUsageSeriesOut] = Field(default_factory=list)
+
+
 class AgentControlActionIn(BaseModel):
     action: str
 
@@ -157,12 +198,21 @@ class BoardColumn(BaseModel):
     title: str
     count: int
     cards: list[TaskOut]
+    next_cursor: str | None = None
 
 
 class BoardOut(BaseModel):
     columns: list[BoardColumn]
 
 
+class BoardDeltaOut(BaseModel):
+    cards: list[TaskOut]
+    totals: dict[str, int] | None = None
+    high_water_ts: datetime | None = None
+    high_water_id: UUID | None = None
+    reset: bool = False
+
+
 class SkillItem(BaseModel):
     slug: str
     name: str
@@ -318,6 +368,7 @@ class KnowledgeSourceScanIn(BaseModel):
     version_label: str | None = None
     max_files: int = 200
     include_extensions: list[str] = Field(default_factory=list)
+    cursor: str | None = None
     dry_run: bool = False
 
 
@@ -326,6 +377,10 @@ class KnowledgeSourceScanOut(BaseModel):
     imported: int
     skipped_existing: int
     skipped_invalid: int
+    updated: int = 0
+    hashed: int = 0
+    index_hits: int = 0
+    next_cursor: str | None = None
     dry_run: bool
     items: list[KnowledgeSourceOut] = Field(default_factory=list)
 
@@ -341,6 +396,8 @@ class KnowledgeSourceChunkIn(BaseModel):
     ocr_enabled: bool = True
     ocr_languages: str | None = None
     max_pdf_pages: int | None = None
+    incremental: bool = False
+    force: bool = False
     dry_run: bool = False
 
 
@@ -350,6 +407,10 @@ class KnowledgeSourceChunkOut(BaseModel):
     chunks_total: int
     created: int
     skipped_existing: int
+    unchanged: int = 0
+    retired: int = 0
+    incremental: bool = False
+    source_changed: bool | None = None
     dry_run: bool
     items: list[KnowledgeUnitOut] = Field(default_factory=list)
 
@@ -595,6 +656,7 @@ class KnowledgeResolveIn(BaseModel):
     limit: int = 10
     retrieval_mode: str = "lexical"
     ranking_profile: str = "balanced"
+    lexical_limit: int | None = None
     semantic_query: str | None = None
     semantic_limit: int = 20
     embedding_model: str | None = None
@@ -698,6 +760,24 @@ class KnowledgeResolveAuditOut(BaseModel):
     created_at: datetime
 
 
+class KnowledgeResolveAuditSinkStatsOut(BaseModel):
+    queue_capacity: int
+    pending: int
+    batch_size: int
+    flush_interval_seconds: float
+    overflow: str
+    detail_sample_rate: float
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    write_failures: int = 0
+    batches: int = 0
+    counter_pending: int = 0
+    counter_written: int = 0
+    counter_write_failures: int = 0
+    counter_lost: int = 0
+
+
 class KnowledgeLifecycleActionIn(BaseModel):
     action: str
     actor: str | None = None
@@ -753,3 +833,32 @@ class KnowledgeResolveMetricsOut(BaseModel):
     ocr_page_truncation_count: int = 0
     top_reject_reasons: list[KnowledgeResolveRejectSummaryOut] = Field(default_factory=list)
     risk_breakdown: list[KnowledgeResolveRiskMetricsOut] = Field(default_factory=list)
+
+
+class KnowledgeQueryEmbeddingCacheStatsOut(BaseModel):
+    capacity: int
+    size: int
+    ttl_seconds: float
+    redis_enabled: bool
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    hit_rate: float = 0.0
+
+
+class KnowledgeIngestionJobOut(BaseModel):
+    id: UUID
+    job_type: str
+    source_id: UUID
+    status: str
+    request: dict = Field(default_factory=dict)
+    stages: dict = Field(default_factory=dict)
+    result: dict | None = None
+    error: str | None = None
+    attempts: int = 0
+    worker_id: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    updated_at: datetime
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+from typing import Callable
+
+from .source_scan import stat_signature
+
+
+SKILLS_CATALOG_WATCH_MODES = {"auto", "poll"}
+SKILLS_CATALOG_WATCHED_NAMES = {"SKILL.md", "openclaw.json"}
+
+
+def file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        return stat_signature(path.stat())
+    except OSError:
+        return None
+
+
+class FileMemo:
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[tuple[int, int, int], object]] = {}
+        self._touched: set[str] = set()
+        self.stats = {"hits": 0, "loads": 0}
+
+    def load(self, path: Path, loader: Callable[[Path], object]):
+        key = str(path)
+        self._touched.add(key)
+        signature = file_signature(path)
+        if signature is None:
+            self._entries.pop(key, None)
+            return loader(path)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == signature:
+            self.stats["hits"] += 1
+            return cached[1]
+        value = loader(path)
+        self._entries[key] = (signature, value)
+        self.stats["loads"] += 1
+        return value
+
+    def begin(self) -> None:
+        self._touched = set()
+
+    def prune(self) -> None:
+        for key in set(self._entries) - self._touched:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SkillsCatalog:
+    def __init__(
+        self,
+        build: Callable[[FileMemo], dict],
+        *,
+        watch_mode: str = "auto",
+        poll_interval_seconds: float = 5.0,
+    ) -> None:
+        self._build = build
+        normalized_mode = str(watch_mode or "auto").strip().lower()
+        self.watch_mode = normalized_mode if normalized_mode in SKILLS_CATALOG_WATCH_MODES else "auto"
+        self.poll_interval_seconds = max(float(poll_interval_seconds), 0.5)
+        self.memo = FileMemo()
+        self.snapshot: dict | None = None
+        self.revision = 0
+        self.digest = ""
+        self.refreshed_at: float | None = None
+        self.mode = "idle"
+        self._lock = asyncio.Lock()
+        self._watcher: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    async def get(self) -> dict:
+        if self.snapshot is None:
+            await self.refresh()
+        return self.snapshot or {}
+
+    async def refresh(self) -> bool:
+        async with self._lock:
+            snapshot = await asyncio.to_thread(self._rebuild)
+            changed = snapshot != self.snapshot
+            if changed:
+                self.snapshot = snapshot
+                self.revision += 1
+                self.digest = hashlib.sha256(repr(snapshot).encode("utf-8")).hexdigest()[:16]
+            self.refreshed_at = time.time()
+            return changed
+
+    def _rebuild(self) -> dict:
+        self.memo.begin()
+        snapshot = self._build(self.memo)
+        self.memo.prune()
+        return snapshot
+
+    def _watch_targets(self) -> tuple[tuple[Path, ...], tuple[Path, ...]]:
+        snapshot = self.snapshot or {}
+        roots = tuple(sorted({Path(path) for path in snapshot.get("watch_roots") or [] if Path(path).is_dir()}))
+        files = tuple(Path(path) for path in snapshot.get("watch_files") or [])
+        return roots, files
+
+    def _files_changed(self, files: tuple[Path, ...], signatures: dict[Path, tuple | None]) -> bool:
+        changed = False
+        for path in files:
+            signature = file_signature(path)
+            if signatures.get(path) != signature:
+                signatures[path] = signature
+                changed = True
+        return changed
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        await self._refresh_quietly()
+        watchfiles = None
+        if self.watch_mode == "auto":
+            try:
+                import watchfiles
+            except ImportError:
+                watchfiles = None
+
+        while True:
+            roots, files = self._watch_targets()
+            file_signatures = {path: file_signature(path) for path in files}
+            if watchfiles is not None and roots:
+                self.mode = "inotify"
+                relevant = self._relevant_filter(roots)
+                try:
+                    async for changes in watchfiles.awatch(
+                        *roots,
+                        watch_filter=relevant,
+                        debounce=300,
+                        rust_timeout=int(self.poll_interval_seconds * 1000),
+                        yield_on_timeout=True,
+                    ):
+                        if changes or self._files_changed(files, file_signatures):
+                            await self._refresh_quietly()
+                        if self._watch_targets() != (roots, files):
+                            break
+                    continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    watchfiles = None
+
+            self.mode = "poll"
+            await asyncio.sleep(self.poll_interval_seconds)
+            await self._refresh_quietly()
+
+    @staticmethod
+    def _relevant_filter(roots: tuple[Path, ...]) -> Callable[[object, str], bool]:
+        root_set = {str(root) for root in roots}
+
+        def relevant(_change, raw_path: str) -> bool:
+            path = Path(raw_path)
+            if path.name in SKILLS_CATALOG_WATCHED_NAMES:
+                return True
+            parent = path.parent
+            return str(parent) in root_set or parent.name == "skills" or str(parent.parent) in root_set
+
+        return relevant
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import itertools
+import os
+from pathlib import PurePosixPath
+from typing import Iterator
+
+
+def _cursor_parts(cursor: str | None) -> tuple[str, ...]:
+    raw = str(cursor or "").strip().replace("\\", "/")
+    if not raw:
+        return ()
+    return tuple(part for part in PurePosixPath(raw).parts if part not in {"/", ".", ""})
+
+
+def _walk(directory: str, prefix: tuple[str, ...], cursor: tuple[str, ...]) -> Iterator[tuple[str, os.stat_result]]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        parts = (*prefix, entry.name)
+        if cursor and parts < cursor[: len(parts)]:
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path, parts, cursor)
+                continue
+            if not entry.is_file():
+                continue
+            if cursor and parts <= cursor:
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        yield "/".join(parts), stat
+
+
+def iter_source_files(scan_root: str | os.PathLike[str], *, after: str | None = None) -> Iterator[tuple[str, os.stat_result]]:
+    yield from _walk(os.fspath(scan_root), (), _cursor_parts(after))
+
+
+def next_batch(files: Iterator[tuple[str, os.stat_result]], size: int) -> list[tuple[str, os.stat_result]]:
+    return list(itertools.islice(files, max(int(size), 0)))
+
+
+def stat_signature(stat: os.stat_result) -> tuple[int, int, int]:
+    return int(stat.st_size), int(stat.st_mtime_ns), int(stat.st_ino)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import httpx
+
+
+def read_rss_mb(pid: int) -> float:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    except OSError:
+        return 0.0
+    return 0.0
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round((len(ordered) - 1) * p)), len(ordered) - 1)]
+
+
+async def sample_rss(pid: int, samples: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(read_rss_mb(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def fetch(client: httpx.AsyncClient, path: str, latencies: list[float]) -> int:
+    started = time.perf_counter()
+    received = 0
+    async with client.stream("GET", path) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            received += len(chunk)
+    latencies.append((time.perf_counter() - started) * 1000.0)
+    return received
+
+
+async def run(args: argparse.Namespace) -> int:
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    paths = [f"/chat/{args.agent}/{path.lstrip('/')}" for path in args.paths]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    rss_samples: list[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(args.api_pid, rss_samples, stop)) if args.api_pid else None
+    baseline_rss = read_rss_mb(args.api_pid) if args.api_pid else 0.0
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def worker(index: int) -> int:
+        async with semaphore:
+            return await fetch(client, paths[index % len(paths)], latencies)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=args.api_url.rstrip("/"), headers=headers, limits=limits, timeout=120.0) as client:
+        sizes = await asyncio.gather(*(worker(index) for index in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampler is not None:
+        await sampler
+
+    total_mb = sum(sizes) / (1024.0 * 1024.0)
+    print(
+        f"[assets] requests={args.requests} concurrency={args.concurrency} total={total_mb:.1f}MB "
+        f"elapsed={elapsed:.2f}s throughput={total_mb / max(elapsed, 1e-9):.1f}MB/s "
+        f"p50={percentile(latencies, 0.50):.1f}ms p95={percentile(latencies, 0.95):.1f}ms"
+    )
+    if rss_samples:
+        print(f"[memory] api_pid={args.api_pid} baseline_rss={baseline_rss:.1f}MB peak_rss={max(rss_samples):.1f}MB growth={max(rss_samples) - baseline_rss:.1f}MB")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load Control UI assets through /chat/{agent}/ concurrently and report throughput, latency and API RSS growth")
+    parser.add_argument("--api-url", default=os.getenv("MISSION_CONTROL_API_URL", "http://127.0.0.1:18910"))
+    parser.add_argument("--token", default=(os.getenv("MISSION_CONTROL_AUTH_TOKEN") or os.getenv("MC_AUTH_TOKEN") or "").strip())
+    parser.add_argument("--agent", default="nox")
+    parser.add_argument("--paths", nargs="+", required=True, help="asset paths under /chat/{agent}/, e.g. assets/index-abc123.js")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--api-pid", type=int, default=0, help="pid of the API process to sample VmRSS from (same host only)")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
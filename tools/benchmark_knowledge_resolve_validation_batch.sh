@@ -0,0 +1,135 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+BASE_URL="${BASE_URL:-http://127.0.0.1:18910}"
+AUTH_TOKEN="${MC_API_TOKEN:-${AUTH_TOKEN:-}}"
+ITERATIONS="${ITERATIONS:-30}"
+CANDIDATES="${CANDIDATES:-500}"
+SEED="${SEED:-1}"
+LABEL="${LABEL:-current}"
+BENCH_TAG="${BENCH_TAG:-bench-validation-batch}"
+QUERY_TASK="${QUERY_TASK:-validation batch benchmark runbook}"
+RISK_LEVEL="${RISK_LEVEL:-normal}"
+
+curl_json() {
+  local method="$1"
+  local url="$2"
+  local data="${3:-}"
+  local -a args
+  args=(-sS -X "$method" "$url" -H "Content-Type: application/json")
+  if [[ -n "$AUTH_TOKEN" ]]; then
+    args+=(-H "Authorization: Bearer $AUTH_TOKEN")
+  fi
+  if [[ -n "$data" ]]; then
+    args+=(-d "$data")
+  fi
+  curl "${args[@]}"
+}
+
+curl_timed() {
+  local method="$1"
+  local url="$2"
+  local data="$3"
+  local -a args
+  args=(-sS -o /dev/null -w '%{time_total}\n' -X "$method" "$url" -H "Content-Type: application/json" -d "$data")
+  if [[ -n "$AUTH_TOKEN" ]]; then
+    args+=(-H "Authorization: Bearer $AUTH_TOKEN")
+  fi
+  curl "${args[@]}"
+}
+
+json_get() {
+  local expr="$1"
+  python3 -c "import json,sys; data=json.load(sys.stdin); print(${expr})"
+}
+
+seed_candidates() {
+  local run_id unit_payload unit_resp unit_id validation_payload
+  run_id="$(date +%s)"
+  for ((i=1; i<=CANDIDATES; i++)); do
+    unit_payload="$(cat <<JSON
+{
+  "unit_key": "${BENCH_TAG}-${run_id}-${i}",
+  "title": "Validation batch benchmark unit ${i}",
+  "content": "${QUERY_TASK} sample ${i}",
+  "tags": ["${BENCH_TAG}"],
+  "risk_level": "normal",
+  "status": "active"
+}
+JSON
+)"
+    unit_resp="$(curl_json POST "$BASE_URL/v1/knowledge/units" "$unit_payload")"
+    unit_id="$(printf '%s' "$unit_resp" | json_get "data['id']")"
+    validation_payload="$(cat <<JSON
+{
+  "unit_id": "${unit_id}",
+  "validator": "benchmark",
+  "validation_status": "approved",
+  "confidence": 0.9
+}
+JSON
+)"
+    curl_json POST "$BASE_URL/v1/knowledge/validations" "$validation_payload" >/dev/null
+  done
+  echo "seeded_candidates=${CANDIDATES}"
+}
+
+main() {
+  local payload
+  local results_file=""
+  results_file="$(mktemp)"
+  trap 'if [[ -n "${results_file:-}" ]]; then rm -f "$results_file"; fi' EXIT
+
+  if [[ "$SEED" == "1" ]]; then
+    seed_candidates
+  fi
+
+  payload="$(cat <<JSON
+{
+  "task": "${QUERY_TASK}",
+  "risk_level": "${RISK_LEVEL}",
+  "tags": ["${BENCH_TAG}"],
+  "limit": 10,
+  "retrieval_mode": "lexical"
+}
+JSON
+)"
+
+  for ((i=1; i<=ITERATIONS; i++)); do
+    curl_timed POST "$BASE_URL/v1/knowledge/resolve" "$payload" >> "$results_file"
+  done
+
+  python3 - <<'PY' "$results_file" "$LABEL" "$ITERATIONS" "$CANDIDATES"
+from pathlib import Path
+import statistics
+import sys
+
+path = Path(sys.argv[1])
+label = sys.argv[2]
+iterations = int(sys.argv[3])
+candidates = int(sys.argv[4])
+values = [float(line.strip()) * 1000.0 for line in path.read_text().splitlines() if line.strip()]
+if not values:
+    raise SystemExit('no benchmark samples collected')
+values_sorted = sorted(values)
+def percentile(data, pct):
+    if len(data) == 1:
+        return data[0]
+    index = (len(data) - 1) * pct
+    lower = int(index)
+    upper = min(lower + 1, len(data) - 1)
+    fraction = index - lower
+    return data[lower] + (data[upper] - data[lower]) * fraction
+
+print(f"benchmark_label={label}")
+print(f"benchmark_candidates={candidates}")
+print(f"benchmark_iterations={iterations}")
+print(f"latency_ms_min={min(values_sorted):.2f}")
+print(f"latency_ms_p50={percentile(values_sorted, 0.50):.2f}")
+print(f"latency_ms_p95={percentile(values_sorted, 0.95):.2f}")
+print(f"latency_ms_max={max(values_sorted):.2f}")
+print(f"latency_ms_mean={statistics.mean(values_sorted):.2f}")
+PY
+}
+
+main "$@"
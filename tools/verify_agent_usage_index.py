@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mission_control_api"))
+
+from app.main import USAGE_BUCKET_COUNTERS, _scan_agent_usage_files  # noqa: E402
+
+
+def usage_line(epoch: float, tokens: int) -> str:
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(epoch))
+    return json.dumps({"timestamp": timestamp, "message": {"usage": {"input": tokens, "output": 1, "cost": {"total": 0.001}}}}) + "\n"
+
+
+class UsageIndex:
+    def __init__(self) -> None:
+        self.known: dict[tuple[int, int], dict] = {}
+        self.totals = {name: 0 for name in USAGE_BUCKET_COUNTERS}
+
+    def sync(self, agent_dir: Path) -> tuple[int, float]:
+        started = time.perf_counter()
+        buckets, offset_rows, _ = _scan_agent_usage_files(agent_dir, self.known)
+        for counters in buckets.values():
+            for name, value in counters.items():
+                self.totals[name] += value
+        for row in offset_rows:
+            self.known[(row["device"], row["inode"])] = row
+        return len(offset_rows), time.perf_counter() - started
+
+
+def run_checks(args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+    rng = random.Random(args.seed)
+    expected_tokens = 0
+    expected_events = 0
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent_dir = Path(tmp) / "agent"
+        sessions = agent_dir / "sessions"
+        sessions.mkdir(parents=True)
+        for index in range(args.files):
+            lines = []
+            for _ in range(args.lines):
+                tokens = rng.randint(1, 500)
+                expected_tokens += tokens
+                expected_events += 1
+                lines.append(usage_line(now - rng.randint(0, 7 * 24 * 3600), tokens))
+            (sessions / f"session-{index:04d}.jsonl").write_text("".join(lines), encoding="utf-8")
+
+        index = UsageIndex()
+        files, elapsed = index.sync(agent_dir)
+        print(f"[initial] files={files} events={index.totals['events']} elapsed={elapsed:.3f}s")
+
+        files, elapsed = index.sync(agent_dir)
+        print(f"[idle] files_read={files} elapsed={elapsed:.3f}s")
+        if files:
+            failures.append("unchanged files were re-read")
+
+        target = sessions / "session-0000.jsonl"
+        with target.open("a", encoding="utf-8") as handle:
+            handle.write(usage_line(now, 11))
+            handle.write('{"timestamp": "partial')
+        expected_tokens += 11
+        expected_events += 1
+        files, elapsed = index.sync(agent_dir)
+        print(f"[append] files_read={files} elapsed={elapsed:.3f}s")
+        if files != 1:
+            failures.append("append did not re-read exactly one file")
+
+        with target.open("a", encoding="utf-8") as handle:
+            handle.write('", "usage": {"input": 13}}\n')
+        expected_tokens += 13
+        expected_events += 1
+        index.sync(agent_dir)
+
+        os.rename(target, sessions / "session-0000.jsonl.reset.1")
+        target.write_text(usage_line(now, 17), encoding="utf-8")
+        expected_tokens += 17
+        expected_events += 1
+        index.sync(agent_dir)
+
+        replaced = sessions / "session-0001.jsonl"
+        replaced_tokens = sum(json.loads(line)["message"]["usage"]["input"] for line in replaced.read_text().splitlines())
+        replaced.unlink()
+        replaced.write_text(usage_line(now, 19), encoding="utf-8")
+        expected_tokens += 19
+        expected_events += 1
+        index.sync(agent_dir)
+
+        print(
+            f"[totals] input_tokens={index.totals['input_tokens']} expected={expected_tokens} "
+            f"events={index.totals['events']} expected={expected_events} (replaced file kept {replaced_tokens} historical tokens)"
+        )
+        if index.totals["input_tokens"] != expected_tokens or index.totals["events"] != expected_events:
+            failures.append("incremental totals diverge from appended usage")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify the offset-tracking agent usage index: appends, partial lines, rotation and replacement")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    failures = run_checks(args)
+    for failure in failures:
+        print(f"[fail] {failure}")
+    if failures:
+        return 1
+    print("[ok] agent usage index verified")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
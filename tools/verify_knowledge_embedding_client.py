@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mission_control_api"))
+
+from app.embedding_client import EmbeddingClient  # noqa: E402
+
+
+STUB_MODEL = "stub-embedding"
+STUB_DIMENSIONS = 8
+REQUEST_LOG: list[int] = []
+
+
+def stub_vector(text: str) -> list[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [round(byte / 255.0, 6) for byte in digest[:STUB_DIMENSIONS]]
+
+
+class StubEmbeddingHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        texts = payload.get("input") or []
+        REQUEST_LOG.append(len(texts))
+        body = json.dumps(
+            {
+                "model": STUB_MODEL,
+                "data": [{"index": index, "embedding": stub_vector(text)} for index, text in enumerate(texts)],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+def start_stub_server(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubEmbeddingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_checks(base_url: str, args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+    config = {
+        "model": STUB_MODEL,
+        "base_url": base_url,
+        "api_key": "",
+        "dimensions": STUB_DIMENSIONS,
+        "timeout_seconds": 5.0,
+    }
+    client = EmbeddingClient(
+        max_batch_size=args.batch_size,
+        max_concurrency=args.concurrency,
+        coalesce_window_seconds=args.window_ms / 1000.0,
+    )
+    try:
+        texts = [f"chunk text {index}" for index in range(args.texts)]
+        REQUEST_LOG.clear()
+        vectors, model_name, dimensions = await client.embed_many(texts, config=config)
+        expected_requests = (len(texts) + args.batch_size - 1) // args.batch_size
+        print(f"[embed_many] texts={len(texts)} upstream_requests={len(REQUEST_LOG)} batch_sizes={sorted(REQUEST_LOG, reverse=True)}")
+        if vectors != [stub_vector(text) for text in texts]:
+            failures.append("embed_many returned vectors out of order")
+        if len(REQUEST_LOG) != expected_requests or max(REQUEST_LOG) > args.batch_size:
+            failures.append(f"embed_many expected {expected_requests} sub-batches of <= {args.batch_size}")
+        if model_name != STUB_MODEL or dimensions != STUB_DIMENSIONS:
+            failures.append("embed_many returned unexpected model or dimensions")
+
+        queries = [f"query {index % 5}" for index in range(args.queries)]
+        REQUEST_LOG.clear()
+        results = await asyncio.gather(*(client.embed_query(query, config=config) for query in queries))
+        print(f"[embed_query] concurrent_calls={len(queries)} upstream_requests={len(REQUEST_LOG)} batch_sizes={REQUEST_LOG}")
+        if [item[0] for item in results] != [stub_vector(query) for query in queries]:
+            failures.append("embed_query returned a vector for the wrong query")
+        if len(REQUEST_LOG) != 1:
+            failures.append("embed_query did not coalesce concurrent calls into one upstream batch")
+    finally:
+        await client.aclose()
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify pooled embedding client batching and coalescing against a local stub server")
+    parser.add_argument("--port", type=int, default=18931)
+    parser.add_argument("--serve-only", action="store_true", help="only run the stub embedding server")
+    parser.add_argument("--texts", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--window-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"[info] stub embedding server at {base_url}/embeddings model={STUB_MODEL} dims={STUB_DIMENSIONS}")
+    if args.serve_only:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            return 0
+
+    try:
+        failures = asyncio.run(run_checks(base_url, args))
+    finally:
+        server.shutdown()
+    for failure in failures:
+        print(f"[fail] {failure}")
+    if failures:
+        return 1
+    print("[ok] embedding client batching and coalescing verified")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
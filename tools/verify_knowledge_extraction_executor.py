@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mission_control_api"))
+
+from app.extraction import ExtractionExecutor, sha256sum  # noqa: E402
+
+
+def sleep_job(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def allocate_job(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+async def run_checks(args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+    executor = ExtractionExecutor(
+        max_workers=args.workers,
+        timeout_seconds=args.timeout,
+        memory_limit_mb=args.memory_limit_mb,
+    )
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            sample = Path(tmp) / "sample.md"
+            sample.write_text("# executor\n\n" + "extraction runs outside the event loop\n" * 50, encoding="utf-8")
+
+            text, parser, _, _ = await executor.extract_source_text(
+                sample,
+                ocr_enabled=False,
+                ocr_languages="eng",
+                max_pdf_pages=1,
+            )
+            print(f"[extract] parser={parser} chars={len(text)}")
+            if parser != "plain_text" or "outside the event loop" not in text:
+                failures.append("plain text extraction returned unexpected content")
+            if await executor.sha256sum(sample) != sha256sum(sample):
+                failures.append("sha256sum through the executor does not match the inline digest")
+
+        started = time.perf_counter()
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(executor.run(sleep_job, args.job_seconds) for _ in range(args.workers * 2)))
+        tick_task.cancel()
+        elapsed = time.perf_counter() - started
+        print(f"[pool] jobs={args.workers * 2} workers={args.workers} elapsed={elapsed:.2f}s loop_ticks={ticks}")
+        if elapsed > args.job_seconds * 2 + 1.5:
+            failures.append("jobs did not run in parallel across the worker pool")
+        if ticks < int(elapsed / 0.05 * 0.5):
+            failures.append("event loop was blocked while extraction jobs ran")
+
+        try:
+            await executor.run(sleep_job, args.timeout + 5)
+            failures.append("job exceeding the timeout was not stopped")
+        except ValueError as exc:
+            print(f"[timeout] {exc}")
+
+        task = asyncio.create_task(executor.run(sleep_job, args.timeout + 5))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        print(f"[cancel] cancelled={task.cancelled()} live_workers={len(executor._processes)}")
+        if not task.cancelled() or executor._processes:
+            failures.append("cancelled job left a worker process running")
+
+        if args.memory_limit_mb > 0:
+            try:
+                await executor.run(allocate_job, args.memory_limit_mb * 2)
+                failures.append("job exceeding the memory limit was not stopped")
+            except ValueError as exc:
+                print(f"[memory] {exc}")
+    finally:
+        executor.shutdown()
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify the knowledge extraction process pool: parallelism, timeout, cancellation and memory cap")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--memory-limit-mb", type=int, default=256)
+    parser.add_argument("--job-seconds", type=float, default=0.5)
+    args = parser.parse_args()
+
+    failures = asyncio.run(run_checks(args))
+    for failure in failures:
+        print(f"[fail] {failure}")
+    if failures:
+        return 1
+    print("[ok] extraction executor verified")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
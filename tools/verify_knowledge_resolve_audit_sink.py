@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mission_control_api"))
+
+from app.audit_sink import AuditSink  # noqa: E402
+from app.main import _compact_resolve_audit_payload  # noqa: E402
+
+
+class SlowWriter:
+    def __init__(self, delay_seconds: float) -> None:
+        self.delay_seconds = delay_seconds
+        self.batches: list[int] = []
+
+    async def __call__(self, rows: list[dict]) -> None:
+        await asyncio.sleep(self.delay_seconds)
+        self.batches.append(len(rows))
+
+
+def synthetic_payload(rejected: int, selected: int) -> dict:
+    reasons = ["validation_expired", "score_below_threshold", "missing_validation_status", "semantic_similarity_below_threshold"]
+    return {
+        "retrieval_mode": "hybrid",
+        "policy": {"require_validation": True, "max_age_days": 30, "allowed_statuses": ["approved"] * 20},
+        "policy_metadata": {"policy_source": "risk_default", "bundle_key": None},
+        "selected": [
+            {
+                "unit_id": f"sel-{index}",
+                "unit_key": f"key-{index}",
+                "score": 0.9,
+                "score_breakdown": {name: 0.1 for name in ("base", "lexical", "semantic", "tag", "confidence", "lifecycle")},
+                "retrieval_channels": ["lexical", "semantic"],
+            }
+            for index in range(selected)
+        ],
+        "rejected": [
+            {"unit_id": f"rej-{index}", "unit_key": f"key-{index}", "source_id": None, "reason": reasons[index % len(reasons)]}
+            for index in range(rejected)
+        ],
+    }
+
+
+async def check_sink(args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+
+    writer = SlowWriter(args.write_delay_ms / 1000.0)
+    sink = AuditSink(writer, max_queue_size=args.queue_size, batch_size=args.batch_size, flush_interval_seconds=0.05)
+    sink.start()
+    started = time.perf_counter()
+    for index in range(args.records):
+        await sink.submit({"id": index})
+    submit_elapsed = time.perf_counter() - started
+    await sink.aclose()
+    print(
+        f"[drop] submitted={args.records} enqueued={sink.stats['enqueued']} written={sink.stats['written']} "
+        f"dropped={sink.stats['dropped']} batches={len(writer.batches)} max_batch={max(writer.batches or [0])} "
+        f"submit_elapsed={submit_elapsed * 1000:.1f}ms"
+    )
+    if sink.stats["written"] + sink.stats["dropped"] != args.records:
+        failures.append("drop policy lost records without counting them")
+    if max(writer.batches or [0]) > args.batch_size:
+        failures.append("batch exceeded configured size")
+    if sink.pending:
+        failures.append("records left pending after close")
+
+    writer = SlowWriter(args.write_delay_ms / 1000.0)
+    sink = AuditSink(
+        writer,
+        max_queue_size=args.queue_size,
+        batch_size=args.batch_size,
+        flush_interval_seconds=0.05,
+        overflow="block",
+        block_timeout_seconds=5.0,
+    )
+    sink.start()
+    started = time.perf_counter()
+    for index in range(args.records):
+        await sink.submit({"id": index})
+    submit_elapsed = time.perf_counter() - started
+    await sink.aclose()
+    print(
+        f"[block] submitted={args.records} written={sink.stats['written']} dropped={sink.stats['dropped']} "
+        f"batches={len(writer.batches)} submit_elapsed={submit_elapsed * 1000:.1f}ms"
+    )
+    if sink.stats["written"] != args.records:
+        failures.append("block policy dropped records within the timeout")
+
+    async def failing_writer(rows: list[dict]) -> None:
+        raise RuntimeError("database unavailable")
+
+    sink = AuditSink(failing_writer, batch_size=10)
+    for index in range(25):
+        await sink.submit({"id": index})
+    await sink.flush()
+    print(f"[failure] write_failures={sink.stats['write_failures']} dropped={sink.stats['dropped']}")
+    if sink.stats["write_failures"] != 3 or sink.stats["dropped"] != 25:
+        failures.append("writer failures were not isolated per batch")
+    return failures
+
+
+def check_compaction(args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+    payload = synthetic_payload(args.rejected, 10)
+    full = _compact_resolve_audit_payload(payload, full_detail=True)
+    compact = _compact_resolve_audit_payload(payload, full_detail=False)
+    full_bytes = len(json.dumps(full))
+    compact_bytes = len(json.dumps(compact))
+    print(
+        f"[payload] rejected={args.rejected} full_bytes={full_bytes} compact_bytes={compact_bytes} "
+        f"ratio={compact_bytes / max(full_bytes, 1):.3f} reasons={compact['rejected_reasons']}"
+    )
+    if sum(compact["rejected_reasons"].values()) != args.rejected:
+        failures.append("compact payload lost reject counts")
+    if len(compact["rejected"]) != len(compact["rejected_reasons"]):
+        failures.append("compact payload should keep one rejected exemplar per reason")
+    if compact.get("policy_metadata") != payload["policy_metadata"]:
+        failures.append("compact payload dropped policy metadata")
+    if len(full["rejected"]) != args.rejected:
+        failures.append("sampled full payload lost rejected detail")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify the batched resolve audit sink and compact audit payloads")
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--queue-size", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--write-delay-ms", type=float, default=5.0)
+    parser.add_argument("--rejected", type=int, default=500)
+    args = parser.parse_args()
+
+    failures = asyncio.run(check_sink(args)) + check_compaction(args)
+    for failure in failures:
+        print(f"[fail] {failure}")
+    if failures:
+        return 1
+    print("[ok] resolve audit sink verified")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
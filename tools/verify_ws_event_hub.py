@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mission_control_api"))
+
+from app.event_hub import EventHub, parse_filter_values  # noqa: E402
+
+
+class MemoryStream:
+    def __init__(self) -> None:
+        self.entries: list[tuple[str, dict]] = []
+        self.sequence = 0
+        self.xread_calls = 0
+        self.active_reads = 0
+        self.max_active_reads = 0
+        self._appended = asyncio.Condition()
+
+    async def xadd(self, _key: str, fields: dict) -> str:
+        self.sequence += 1
+        entry_id = f"1700000000000-{self.sequence}"
+        async with self._appended:
+            self.entries.append((entry_id, fields))
+            self._appended.notify_all()
+        return entry_id
+
+    def _after(self, last_id: str) -> list[tuple[str, dict]]:
+        position = int(last_id.split("-")[1]) if "-" in last_id else 0
+        return [entry for entry in self.entries if int(entry[0].split("-")[1]) > position]
+
+    async def xread(self, streams: dict, block: int, count: int):
+        (key, last_id), = streams.items()
+        self.xread_calls += 1
+        self.active_reads += 1
+        self.max_active_reads = max(self.max_active_reads, self.active_reads)
+        try:
+            async with self._appended:
+                try:
+                    await asyncio.wait_for(self._appended.wait_for(lambda: bool(self._after(last_id))), timeout=block / 1000.0)
+                except asyncio.TimeoutError:
+                    return []
+                return [(key, self._after(last_id)[:count])]
+        finally:
+            self.active_reads -= 1
+
+    async def xrange(self, _key: str, min: str, max: str, count: int):
+        return self._after(min.lstrip("("))[:count]
+
+    async def xrevrange(self, _key: str, count: int, max: str = "+", min: str = "-"):
+        entries = self._after(min.lstrip("(")) if min != "-" else self.entries
+        return list(reversed(entries))[:count]
+
+
+async def publish(stream: MemoryStream, index: int, event_type: str, agent: str) -> str:
+    event = {"id": str(index), "type": event_type, "agent": agent, "payload": {"index": index}}
+    return await stream.xadd("mc:events", {"event": json.dumps(event)})
+
+
+async def caught_up(hub: EventHub, stream_id: str) -> None:
+    while hub.last_stream_id != stream_id:
+        await asyncio.sleep(0.01)
+
+
+async def drain(subscription, expected: int, timeout: float = 2.0) -> list[dict]:
+    received: list[dict] = []
+    while len(received) < expected:
+        item = await subscription.next(timeout=timeout)
+        if item is None:
+            break
+        received.append(json.loads(item[1]))
+    return received
+
+
+async def run_checks(args: argparse.Namespace) -> list[str]:
+    failures: list[str] = []
+    stream = MemoryStream()
+    hub = EventHub(stream, "mc:events", client_queue_size=args.queue_size, block_ms=200, replay_limit=args.replay_limit)
+    hub.start()
+
+    subscribers = [hub.subscribe() for _ in range(args.clients)]
+    filtered = hub.subscribe(types=parse_filter_values("chat.*"), agents=parse_filter_values("nox"))
+    await asyncio.sleep(0.05)
+
+    stream_ids = []
+    for index in range(args.events):
+        event_type = "chat.message.sent" if index % 2 else "agent.heartbeat"
+        agent = "nox" if index % 3 else "lumen"
+        stream_ids.append(await publish(stream, index, event_type, agent))
+        if index % 50 == 0:
+            await asyncio.sleep(0)
+    await caught_up(hub, stream_ids[-1])
+
+    results = await asyncio.gather(*(drain(subscription, args.events) for subscription in subscribers))
+    complete = sum(1 for received in results if len(received) == args.events)
+    print(f"[fanout] clients={args.clients} events={args.events} complete_clients={complete} xread_calls={stream.xread_calls} max_concurrent_reads={stream.max_active_reads}")
+    if complete != args.clients:
+        failures.append("not every fast client received every event")
+    if stream.max_active_reads != 1:
+        failures.append("more than one concurrent stream read")
+    if any("stream_id" not in event for event in results[0]):
+        failures.append("fanned-out events are missing stream_id")
+
+    expected_filtered = sum(1 for index in range(args.events) if index % 2 and index % 3)
+    filtered_events = await drain(filtered, expected_filtered)
+    print(f"[filter] expected={expected_filtered} received={len(filtered_events)}")
+    if len(filtered_events) != expected_filtered or any(event["agent"] != "nox" or not event["type"].startswith("chat.") for event in filtered_events):
+        failures.append("server-side type/agent filter mismatch")
+
+    small_hub = EventHub(stream, "mc:events", client_queue_size=args.slow_queue_size, block_ms=200)
+    small_hub.start()
+    slow = small_hub.subscribe()
+    fast = small_hub.subscribe()
+    await asyncio.sleep(0.05)
+    fast_received: list[dict] = []
+
+    async def consume_fast() -> None:
+        while len(fast_received) < args.events:
+            item = await fast.next(timeout=2.0)
+            if item is None:
+                return
+            fast_received.append(json.loads(item[1]))
+
+    consumer = asyncio.create_task(consume_fast())
+    for index in range(args.events):
+        last_id = await publish(stream, args.events + index, "agent.heartbeat", "nox")
+        await asyncio.sleep(0)
+    await caught_up(small_hub, last_id)
+    await consumer
+    gap = slow.take_gap()
+    backlog = await drain(slow, args.slow_queue_size, timeout=0.1)
+    print(
+        f"[slow] queue_size={args.slow_queue_size} fast_received={len(fast_received)} "
+        f"slow_delivered={len(backlog)} slow_coalesced={gap['missed'] if gap else 0}"
+    )
+    if len(fast_received) != args.events:
+        failures.append("a slow consumer stalled a fast one")
+    if not gap or gap["missed"] + len(backlog) != args.events or len(backlog) > args.slow_queue_size:
+        failures.append("slow consumer was not coalesced to its queue bound")
+    await small_hub.aclose()
+    stream_ids = [entry_id for entry_id, _ in stream.entries]
+    total = len(stream_ids)
+
+    resume_point = stream_ids[total - 10]
+    resumed = hub.subscribe()
+    replayed = await hub.replay(resumed, resume_point)
+    print(f"[resume] resume_from={resume_point} replayed={len(replayed)}")
+    if [stream_id for stream_id, _ in replayed] != stream_ids[total - 9:]:
+        failures.append("resume replay did not return the entries after the resume id")
+
+    overflow = hub.subscribe()
+    replayed = await hub.replay(overflow, stream_ids[0])
+    print(f"[resume-overflow] replay_limit={args.replay_limit} replayed={len(replayed)} gap_reported={bool(overflow.missed)}")
+    if [stream_id for stream_id, _ in replayed] != stream_ids[-args.replay_limit:] or not overflow.missed:
+        failures.append("replay beyond the limit did not keep the newest entries and report a gap")
+
+    await hub.aclose()
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify the /ws/events fan-out hub on an in-memory stream: single reader, filters, slow-consumer coalescing and resume")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--slow-queue-size", type=int, default=64)
+    parser.add_argument("--replay-limit", type=int, default=500)
+    args = parser.parse_args()
+    if args.queue_size < args.events:
+        parser.error("--queue-size must be >= --events so fast clients never coalesce")
+
+    failures = asyncio.run(run_checks(args))
+    for failure in failures:
+        print(f"[fail] {failure}")
+    if failures:
+        return 1
+    print("[ok] ws event hub verified")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())